@@ -8,10 +8,44 @@ ROLE_DATA_URL = "https://github.com/robjhyndman/cricketdata/raw/refs/heads/maste
 NAME_DATA_FILE_PATH = "./data/setup/other/name_data"
 PLAYER_DATA_FILE_PATH = "./data/setup/other/id_data"
 MATCH_DATA_FILE_PATH = "./data/setup/matches"
+MATCH_ARCHIVE_FILE_PATH = "./data/setup/all_json"
 PLAYER_INFO_FILE_PATH = "./data/setup/other/player_data"
 PLAYER_ROLE_FILE_PATH = "./data/setup/other/player_roles"
 SCRAP_PLAYER_DATA_FILE_PATH = "./data/setup/other/scrap_player_data"
 BALL_BY_BALL_FILE_PATH = "./data/setup/created/ball_by_ball"
+BALL_BY_BALL_MANIFEST_FILE_PATH = "./data/setup/created/ball_by_ball_manifest"
+# Row range of every match in each ball-by-ball file, see MatchIndex
+BALL_BY_BALL_INDEX_FILE_PATH = "./data/setup/created/ball_by_ball_index"
+PLAYER_KEYS_FILE_PATH = "./data/setup/created/player_keys"
+BALL_BY_BALL_DATASET_PATH = "./data/setup/created/ball_by_ball_dataset"
+RESULT_CACHE_PATH = "./data/cache/results"
+WIN_PROBABILITY_FILE_PATH = "./data/setup/created/win_probability"
+PLAYER_SUMMARIES_PATH = "./data/setup/created/player_summaries"
+LADDERS_FILE_PATH = "./data/setup/created/ladders"
+
+# Where match files are read from: "folder" extracts the downloaded zip to MATCH_DATA_FILE_PATH,
+# "archive" keeps it zipped at MATCH_ARCHIVE_FILE_PATH and streams matches straight out of it
+MATCH_SOURCE = "folder"
+# MatchDecoder backend used to read match files (json, orjson or msgspec), falls back to json if not installed
+MATCH_DECODER_BACKEND = "msgspec"
+# Number of match files handed to an ingest worker at a time
+INGEST_CHUNK_SIZE = 16
+# Number of balls buffered before a batch is written to the ball-by-ball files
+BALL_BY_BALL_FLUSH_SIZE = 250_000
+# Compression of the ball-by-ball feather files (lz4 or zstd). None keeps them as uncompressed Arrow IPC,
+# which is larger on disk but can be memory-mapped and read zero-copy
+BALL_BY_BALL_COMPRESSION = None
+# If True, the ball-by-ball files hold the per-ball events alone (LEAN_BALL_SCHEMA), and the running totals
+# are calculated from them when they are read (see CumulativeColumns), which makes the files much smaller and quicker to build
+BALL_BY_BALL_LEAN = False
+# Ball-by-ball output files, appended to BALL_BY_BALL_FILE_PATH
+MATCH_FORMATS = ["t20", "od", "mdm"]
+# Columns the ball-by-ball Parquet dataset is partitioned by, from the outermost folder inwards
+BALL_BY_BALL_PARTITIONS = ["match_type", "gender", "team_type", "season"]
+# Number of innings an InningsSimulator plays out together, each batch is one task when spread over a process pool
+SIMULATION_BATCH_SIZE = 250_000
+# Most bytes of analytics results kept in RESULT_CACHE_PATH, the least recently used results are removed beyond this
+RESULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
 
 DIRECTORIES_TO_CREATE = ["./data", "./data/setup", "./data/setup/other", "./data/setup/matches", "./data/setup/created"]
 
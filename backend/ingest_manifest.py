@@ -0,0 +1,104 @@
+from .interactors.json_interactor import JSONInteractor
+
+
+class IngestManifest:
+    """
+    This class is responsible for tracking which match files have been ingested into the ball-by-ball data.\n
+    Each file is recorded by name with its modification time, size and CRC-32 content hash,
+    along with the format file its balls were written to, so later ingests only need to process
+    new or changed files and drop the balls of files that have been removed.\n
+    Author: Jonathan Farrand\n
+    Date: 2026-10-18
+    """
+    def __init__(self, entries: dict = None) -> None:
+        """
+        Initializes the IngestManifest.\n
+
+        :param entries: A dictionary mapping file names to their recorded details. If None, the manifest starts empty.
+        """
+        self.entries = entries if entries is not None else dict()
+        self._pending = dict()
+
+    @staticmethod
+    def load(location: str) -> "IngestManifest":
+        """
+        Loads a manifest from a JSON file.\n
+
+        :param location: The location of the manifest file (without extension).\n
+
+        :return: The loaded manifest, which is empty if the file does not exist or cannot be read.
+        """
+        data = JSONInteractor.load_json_file_as_dict(location)
+        return IngestManifest(data.get("files", dict()))
+
+    def save(self, location: str) -> bool:
+        """
+        Saves the manifest to a JSON file.\n
+
+        :param location: The location of the manifest file (without extension).\n
+
+        :return: True if successful, False otherwise.
+        """
+        return JSONInteractor.save_dict_to_json({"files": self.entries}, location)
+
+    def scan(self, source) -> tuple[list, list]:
+        """
+        Compares the members of a match source with the manifest.\n
+        Members whose modification time and size are unchanged are trusted without being read.
+        Otherwise the member is hashed, and if only its modification time changed (as happens when the
+        archive is downloaded or extracted again) the manifest is updated and the member is not reprocessed.\n
+
+        :param source: The MatchSource holding the current match files.\n
+
+        :return: A tuple of the new or changed members, and the names of files that have been removed.
+        """
+        changed = []
+        names = set()
+
+        for member in source.members():
+            name = source.get_name(member)
+            names.add(name)
+            mtime, size = source.stat(member)
+            entry = self.entries.get(name)
+
+            if entry is not None and entry["mtime"] == mtime and entry["size"] == size:
+                continue
+
+            file_hash = source.content_hash(member)
+            if entry is not None and entry["hash"] == file_hash:
+                entry["mtime"] = mtime
+                entry["size"] = size
+                continue
+
+            self._pending[name] = {"mtime": mtime, "size": size, "hash": file_hash}
+            changed.append(member)
+
+        removed = [name for name in self.entries.keys() if name not in names]
+        return changed, removed
+
+    def record(self, source, member, match_format: str | None, match_id: int | None) -> None:
+        """
+        Records that a member has been processed.\n
+
+        :param source: The MatchSource the member belongs to.\n
+        :param member: The processed member.\n
+        :param match_format: The format file its balls were written to, or None if it could not be processed.\n
+        :param match_id: The match ID of its balls, or None if it could not be processed.
+        """
+        name = source.get_name(member)
+        entry = self._pending.pop(name, None)
+        if entry is None:
+            mtime, size = source.stat(member)
+            entry = {"mtime": mtime, "size": size, "hash": source.content_hash(member)}
+
+        entry["format"] = match_format
+        entry["match_id"] = match_id
+        self.entries[name] = entry
+
+    def remove(self, name: str) -> None:
+        """
+        Removes a file from the manifest.\n
+
+        :param name: The file name to remove.
+        """
+        self.entries.pop(name, None)
@@ -0,0 +1,287 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+import pandas as pd
+import numpy as np
+import os
+
+
+class FeatherBatchWriter:
+    """
+    This class is responsible for streaming rows into a feather file in fixed size batches.\n
+    Rows are buffered as record batches and written as a single batch whenever the flush size is reached,
+    so memory use is bounded by the flush size rather than the size of the file.\n
+    Dictionary-encoded columns are re-encoded against one dictionary per column that only ever grows,
+    so each batch written only adds the new values to the file as a dictionary delta.\n
+    Author: Jonathan Farrand\n
+    Date: 2026-10-18
+    """
+    def __init__(self, location: str, schema: pa.Schema, flush_size: int, compression: str = None) -> None:
+        """
+        Opens the feather file for writing.\n
+
+        :param location: The location of the feather file (without extension).\n
+        :param schema: The schema every row written to the file must follow.\n
+        :param flush_size: The number of rows buffered before a batch is written.\n
+        :param compression: The compression of the file's buffers (lz4 or zstd). If None, the file is left uncompressed
+            so it can be read zero-copy through a memory map.
+        """
+        if location.endswith('.feather'):
+            location = location[:-8]
+
+        self.location = f"{location}.feather"
+        self.schema = schema
+        self.flush_size = flush_size
+        self.rows_written = 0
+
+        self._buffer = []
+        self._buffered_rows = 0
+        self._dictionaries = {field.name: dict() for field in schema if pa.types.is_dictionary(field.type)}
+        self._sink = pa.OSFile(self.location, 'wb')
+        options = pa.ipc.IpcWriteOptions(compression=compression, emit_dictionary_deltas=True)
+        self._writer = pa.ipc.new_file(self._sink, schema, options=options)
+
+    def add(self, batch: pa.RecordBatch) -> None:
+        """
+        Adds a batch of rows to the buffer, writing a batch if the flush size has been reached.\n
+
+        :param batch: A record batch following the writer's schema.
+        """
+        self._buffer.append(batch)
+        self._buffered_rows += batch.num_rows
+
+        if self._buffered_rows >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered rows to the file as a single record batch.
+        """
+        if self._buffered_rows == 0:
+            return
+
+        table = pa.Table.from_batches(self._buffer, schema=self.schema)
+        for name in self._dictionaries.keys():
+            index = table.schema.get_field_index(name)
+            table = table.set_column(index, table.field(index), self._encode(name, table.column(index)))
+        self._writer.write_table(table.combine_chunks())
+        self.rows_written += self._buffered_rows
+
+        self._buffer = []
+        self._buffered_rows = 0
+
+    def _encode(self, name: str, column: pa.ChunkedArray) -> pa.ChunkedArray:
+        """
+        Re-encodes a dictionary column against the writer's dictionary for it, adding any values not seen before.\n
+
+        :param name: The name of the column.\n
+        :param column: The column, whose chunks may each have their own dictionary.\n
+
+        :return: The column with every chunk sharing the writer's dictionary.
+        """
+        codes = self._dictionaries[name]
+        chunk_indices = []
+        for chunk in column.chunks:
+            mapping = np.empty(len(chunk.dictionary), dtype=np.int32)
+            for i, value in enumerate(chunk.dictionary.to_pylist()):
+                if value is None:
+                    mapping[i] = -1
+                    continue
+                if value not in codes:
+                    codes[value] = len(codes)
+                mapping[i] = codes[value]
+
+            indices = chunk.indices.fill_null(0).to_numpy()
+            indices = mapping[indices] if len(mapping) > 0 else np.full(len(chunk), -1, dtype=np.int32)
+            chunk_indices.append(pa.array(indices, mask=chunk.is_null().to_numpy(zero_copy_only=False) | (indices < 0)))
+
+        dictionary = pa.array(list(codes.keys()), type=column.type.value_type)
+        return pa.chunked_array([pa.DictionaryArray.from_arrays(indices, dictionary) for indices in chunk_indices], type=column.type)
+
+    def close(self) -> None:
+        """
+        Flushes any remaining rows and closes the file.
+        """
+        self.flush()
+        self._writer.close()
+        self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class FeatherInteractor:
+    """
+    This class is responsible for interacting with feather files.\n
+    Author: Jonathan Farrand\n
+    Date: 2026-10-18
+    """
+
+    @staticmethod
+    def open_batch_writer(location: str, schema: pa.Schema, flush_size: int, compression: str = None) -> FeatherBatchWriter:
+        """
+        Opens a feather file that rows can be streamed into.\n
+
+        :param location: The location of the feather file (without extension).\n
+        :param schema: The schema every row written to the file must follow.\n
+        :param flush_size: The number of rows buffered before a batch is written.\n
+        :param compression: The compression of the file's buffers (lz4 or zstd), or None to leave it uncompressed.\n
+
+        :return: A FeatherBatchWriter, which should be closed once all rows have been added.
+        """
+        return FeatherBatchWriter(location, schema, flush_size, compression)
+
+    @staticmethod
+    def get_schema(location: str) -> pa.Schema | None:
+        """
+        Reads the schema of a feather file without reading its data.\n
+
+        :param location: The location of the feather file (without extension).\n
+
+        :return: The schema of the file, or None if the file does not exist or is not a feather file.
+        """
+        if not location.endswith('.feather'):
+            location = f"{location}.feather"
+        try:
+            with pa.memory_map(location) as source:
+                return pa.ipc.open_file(source).schema
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+
+    @staticmethod
+    def iter_batches(location: str):
+        """
+        Lazily reads a feather file one record batch at a time through a memory map.\n
+
+        :param location: The location of the feather file (without extension).\n
+
+        :return: A generator of record batches.\n
+
+        :raises FileNotFoundError: If the file is not found.
+        """
+        if not location.endswith('.feather'):
+            location = f"{location}.feather"
+        with pa.memory_map(location) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+
+    @staticmethod
+    def sort_groups(
+        location: str,
+        key: str,
+        sort_keys: list,
+        flush_size: int,
+        compression: str = None,
+        drop_values: set = None,
+        new_location: str = None
+    ) -> None:
+        """
+        Rewrites a feather file with its groups of rows ordered by the values of their first row.\n
+        A group is a run of consecutive rows sharing the same key (such as the balls of a match), and the rows of
+        each group stay together and in order. Groups can also be dropped and the groups of another feather file
+        added in the same rewrite.
+        The files are read whole through memory maps, which is zero-copy for uncompressed files but decompresses
+        every column of compressed ones, so the full table is held in memory. The rows are then written out
+        in blocks of flush_size rows.
+        The file is left untouched if it is already in order and nothing is dropped or added.\n
+
+        :param location: The location of the feather file to rewrite (without extension).\n
+        :param key: The column whose runs of equal values make up the groups.\n
+        :param sort_keys: The columns to order the groups by, each ascending with missing values last.
+            Groups with equal values keep their order, with the groups of the new file after those of the file.\n
+        :param flush_size: The number of rows copied at once.\n
+        :param compression: The compression of the rewritten file (lz4 or zstd), or None to leave it uncompressed.\n
+        :param drop_values: The values of key whose groups should be dropped. If None, no groups are dropped.\n
+        :param new_location: The location of a feather file whose groups are added (without extension). If None, none are added.\n
+
+        :raises FileNotFoundError: If a file is not found.
+        """
+        if not location.endswith('.feather'):
+            location = f"{location}.feather"
+        locations = [location]
+        if new_location is not None:
+            locations.append(new_location if new_location.endswith('.feather') else f"{new_location}.feather")
+        temp_location = f"{location[:-8]}.tmp.feather"
+
+        sources = [pa.memory_map(source_location) for source_location in locations]
+        try:
+            tables = [pa.ipc.open_file(source).read_all() for source in sources]
+            table = pa.concat_tables(tables).unify_dictionaries()
+            keys = table.column(key).to_numpy()
+            # Groups also break where one file ends and the next begins
+            breaks = np.r_[True, keys[1:] != keys[:-1]] if len(keys) > 0 else np.zeros(0, dtype=bool)
+            file_starts = np.cumsum([part.num_rows for part in tables])[:-1]
+            breaks[file_starts[file_starts < len(keys)]] = True
+            starts = np.flatnonzero(breaks)
+            lengths = np.diff(np.r_[starts, len(keys)])
+            if drop_values:
+                # Only the groups of the file are dropped, as changed groups are replaced by those of the new file
+                kept = ~np.isin(keys[starts], np.array(sorted(drop_values), dtype=keys.dtype)) | (starts >= tables[0].num_rows)
+                starts, lengths = starts[kept], lengths[kept]
+
+            # Arrow's sort is stable and puts missing values last, so groups with equal sort values keep their order
+            first_rows = table.select(sort_keys).take(pa.array(starts, type=pa.int64()))
+            order = pc.sort_indices(first_rows, sort_keys=[(name, "ascending") for name in sort_keys]).to_numpy()
+            group_starts, group_lengths = starts[order], lengths[order]
+            offsets = np.cumsum(group_lengths) - group_lengths
+            rows = np.repeat(group_starts - offsets, group_lengths) + np.arange(group_lengths.sum(), dtype=np.int64)
+
+            if new_location is None and not drop_values and np.array_equal(rows, np.arange(len(keys))):
+                return
+
+            with FeatherBatchWriter(temp_location, table.schema, flush_size, compression) as writer:
+                for block_start in range(0, len(rows), flush_size):
+                    block = table.take(pa.array(rows[block_start:block_start + flush_size], type=pa.int64()))
+                    for batch in block.to_batches():
+                        writer.add(batch)
+            del tables, table, first_rows
+        finally:
+            for source in sources:
+                source.close()
+
+        os.replace(temp_location, location)
+
+    @staticmethod
+    def open_table(location: str, columns: list = None) -> pa.Table:
+        """
+        Opens a feather file through a memory map without reading it.\n
+        The columns of the returned table are zero-copy views of the file, so opening is near-instant,
+        pages are only read from disk when a column is used, and the page cache is shared by every process
+        that opens the same file. Compressed files still work, but their columns are decompressed into memory.\n
+
+        :param location: The location of the feather file (without extension).\n
+        :param columns: The columns to keep. If None, every column is kept.\n
+
+        :return: A pyarrow Table backed by the memory map.\n
+
+        :raises FileNotFoundError: If the file is not found.
+        """
+        if not location.endswith('.feather'):
+            location = f"{location}.feather"
+        table = pa.ipc.open_file(pa.memory_map(location)).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        return table
+
+    @staticmethod
+    def get_feather(location: str, columns: list = None, memory_map: bool = False) -> pd.DataFrame:
+        """
+        Reads a feather file from the specified location and returns it as a pandas DataFrame.\n
+
+        :param location: The location of the feather file (without extension).\n
+        :param columns: The columns to read. If None, every column is read.\n
+        :param memory_map: If True, the file is opened with open_table and every column is a zero-copy
+            pandas ArrowDtype column over the memory map, rather than being copied into NumPy arrays.\n
+
+        :return: A pandas DataFrame containing the data from the feather file.\n
+
+        :raises FileNotFoundError: If the file is not found.
+        """
+        if not location.endswith('.feather'):
+            location = f"{location}.feather"
+        if memory_map:
+            return FeatherInteractor.open_table(location, columns).to_pandas(types_mapper=pd.ArrowDtype)
+        return pd.read_feather(location, columns=columns)
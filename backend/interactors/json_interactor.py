@@ -78,6 +78,41 @@ class JSONInteractor:
             print(f"An unexpected error occurred while reading '{file_path}': {e}")
             return pd.DataFrame()
 
+    @staticmethod
+    def get_json_file_paths(folder_path: str) -> list[str]:
+        """
+        Gather the paths of all JSON files in a folder, sorted by file name.\n
+
+        :param folder_path: Path to the folder containing JSON files.\n
+
+        :return: A sorted list of JSON file paths, or an empty list if the folder does not exist.\n
+        """
+        folder = Path(folder_path)
+        if not folder.is_dir():
+            logging.error(f"Not a directory: {folder_path}")
+            return []
+
+        return sorted([
+            str(p) for p in folder.iterdir()
+            if p.suffix.lower() == '.json' and p.is_file()
+        ])
+
+    @staticmethod
+    def iter_json_files(json_files: list[str]):
+        """
+        Lazily load JSON files one at a time, showing progress.\n
+        Only the file currently being yielded is held in memory.\n
+
+        :param json_files: Paths of the JSON files to load.\n
+
+        :return: A generator of dicts, each with a "file_name" key holding the path it was loaded from.\n
+        """
+        for file_path in tqdm(json_files, desc="Loading JSON", unit="file"):
+            data = JSONInteractor.load_json_file_as_dict(file_path)
+            if data is not None:
+                data["file_name"] = file_path
+                yield data
+
     @staticmethod
     def get_multiple_json_files(
         folder_path: str,
@@ -99,19 +134,9 @@ class JSONInteractor:
             logging.error(f"Not a directory: {folder_path}")
             return 0.0, pd.DataFrame() if to_pandas else []
 
-        # Gather all JSON file paths
-        json_files = sorted([
-            str(p) for p in folder.iterdir()
-            if p.suffix.lower() == '.json' and p.is_file()
-        ])
-
-        results: list = []
+        json_files = JSONInteractor.get_json_file_paths(folder_path)
 
-        for file_path in tqdm(json_files, desc="Loading JSON", unit="file"):
-            data = JSONInteractor.load_json_file_as_dict(file_path)
-            if data is not None:
-                data["file_name"] = file_path
-                results.append(data)
+        results: list = list(JSONInteractor.iter_json_files(json_files))
 
         elapsed = time.perf_counter() - start_time
 
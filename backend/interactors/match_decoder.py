@@ -0,0 +1,221 @@
+import json
+import time
+from typing import TypedDict, Union
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Typed views of a cricsheet match holding only the fields read by MatchMeta, PlayerRegistry,
+# InningsProcessor and BallProcessor. The msgspec backend decodes straight into these and skips
+# everything else (officials, toss, the rest of the registry, reviews, replacements...) without
+# building it. They decode to plain dicts, so the match processors do not need to change.
+class Event(TypedDict, total=False):
+    name: str
+
+
+class Outcome(TypedDict, total=False):
+    winner: str
+
+
+class Registry(TypedDict, total=False):
+    people: dict[str, str]
+
+
+class Info(TypedDict, total=False):
+    gender: str
+    season: Union[str, int]
+    venue: str
+    dates: list[str]
+    team_type: str
+    match_type: str
+    overs: int
+    event: Event
+    teams: list[str]
+    outcome: Outcome
+    registry: Registry
+
+
+class Runs(TypedDict):
+    batter: int
+    extras: int
+    total: int
+
+
+class Extras(TypedDict, total=False):
+    wides: int
+    noballs: int
+    byes: int
+    legbyes: int
+    penalties: int
+
+
+class Wicket(TypedDict, total=False):
+    player_out: str
+    kind: str
+
+
+class Delivery(TypedDict, total=False):
+    batter: str
+    bowler: str
+    non_striker: str
+    runs: Runs
+    extras: Extras
+    wickets: list[Wicket]
+
+
+class Over(TypedDict, total=False):
+    over: int
+    deliveries: list[Delivery]
+
+
+Powerplay = TypedDict("Powerplay", {"from": float, "to": float}, total=False)
+
+
+class Innings(TypedDict, total=False):
+    team: str
+    overs: list[Over]
+    powerplays: list[Powerplay]
+
+
+class Match(TypedDict, total=False):
+    info: Info
+    innings: list[Innings]
+
+
+class MatchDecoder:
+    """
+    This class is responsible for decoding cricsheet match JSON files with a pluggable backend.\n
+    - json: the standard library decoder, builds the full dict tree.\n
+    - orjson: a faster decoder, still builds the full dict tree.\n
+    - msgspec: decodes into the typed Match schema and skips every field the match processors do not read.\n
+    Backends whose package is not installed fall back to json.\n
+    Author: Jonathan Farrand\n
+    Date: 2026-10-18
+    """
+    BACKENDS = ["json", "orjson", "msgspec"]
+    _decoders = dict()
+
+    def __init__(self, backend: str = "json") -> None:
+        """
+        Initializes the MatchDecoder.\n
+
+        :param backend: The decoder backend to use, one of MatchDecoder.BACKENDS.\n
+
+        :raises ValueError: If the backend is not one of MatchDecoder.BACKENDS.
+        """
+        if backend not in MatchDecoder.BACKENDS:
+            raise ValueError(f"Unknown match decoder backend '{backend}'. Expected one of {MatchDecoder.BACKENDS}.")
+
+        if backend not in MatchDecoder.available_backends():
+            print(f"Warning: The {backend} package is not installed. Decoding matches with json instead.")
+            backend = "json"
+
+        self.backend = backend
+        if backend == "msgspec":
+            self._decode = msgspec.json.Decoder(Match).decode
+        elif backend == "orjson":
+            self._decode = orjson.loads
+        else:
+            self._decode = json.loads
+
+    @staticmethod
+    def get(backend: str = "json") -> "MatchDecoder":
+        """
+        Returns a shared MatchDecoder for a backend, so each process only builds its decoder once.\n
+
+        :param backend: The decoder backend to use, one of MatchDecoder.BACKENDS.\n
+
+        :return: The MatchDecoder for the backend.
+        """
+        if backend not in MatchDecoder._decoders:
+            MatchDecoder._decoders[backend] = MatchDecoder(backend)
+        return MatchDecoder._decoders[backend]
+
+    @staticmethod
+    def available_backends() -> list[str]:
+        """
+        Returns the decoder backends whose packages are installed.\n
+
+        :return: A list of backend names.
+        """
+        available = ["json"]
+        if orjson is not None:
+            available.append("orjson")
+        if msgspec is not None:
+            available.append("msgspec")
+        return available
+
+    def decode(self, data: bytes) -> dict:
+        """
+        Decodes the contents of a match JSON file.\n
+
+        :param data: The raw bytes of the file.\n
+
+        :return: A dictionary of the match data.\n
+
+        :raises ValueError: If the data is not a valid match.
+        """
+        try:
+            return self._decode(data)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(str(e)) from e
+
+    def load(self, file_path: str) -> dict:
+        """
+        Reads and decodes a match JSON file.\n
+
+        :param file_path: Path to the JSON file (without extension).\n
+
+        :return: A dictionary of the match data.\n
+
+        :raises FileNotFoundError: If the file is not found.\n
+        :raises ValueError: If the file is not a valid match.
+        """
+        if ".json" not in file_path:
+            file_path = f"{file_path}.json"
+        with open(file_path, 'rb') as file:
+            return self.decode(file.read())
+
+
+if __name__ == "__main__":
+    # Benchmark each installed backend on the downloaded matches, both decoding alone and decoding plus processing
+    import sys
+    from src.config import MATCH_DATA_FILE_PATH
+    from src.interactors.json_interactor import JSONInteractor
+    from src.specialised.cricket_data_transformer.match.match_data import MatchData
+
+    file_paths = JSONInteractor.get_json_file_paths(sys.argv[1] if len(sys.argv) > 1 else MATCH_DATA_FILE_PATH)
+    contents = []
+    for file_path in file_paths:
+        with open(file_path, 'rb') as file:
+            contents.append(file.read())
+
+    print(f"Benchmarking {len(contents)} matches")
+    for backend in MatchDecoder.available_backends():
+        decoder = MatchDecoder(backend)
+
+        start_time = time.perf_counter()
+        matches = [decoder.decode(data) for data in contents]
+        decode_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for file_path, game in zip(file_paths, matches):
+            game["file_name"] = file_path
+            try:
+                MatchData(game)
+            except Exception:
+                pass
+        process_time = time.perf_counter() - start_time
+
+        print(f"{backend:>8}: decode {decode_time:.3f}s ({len(contents) / decode_time:.0f} files/s), "
+              f"decode + process {decode_time + process_time:.3f}s")
@@ -0,0 +1,142 @@
+import os
+import time
+import zlib
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import PurePosixPath
+from .json_interactor import JSONInteractor
+
+
+class MatchSource(ABC):
+    """
+    A source of cricsheet match JSON files.\n
+    Members are opaque references to a single match file. They are picklable, so they can be handed
+    to ingest worker processes along with the source, which reads them independently in each worker.\n
+    Author: Jonathan Farrand\n
+    Date: 2026-10-18
+    """
+    @abstractmethod
+    def members(self) -> list:
+        """Return the members of the source, sorted by name."""
+        pass
+
+    @abstractmethod
+    def get_name(self, member) -> str:
+        """Return the file name of a member, such as 1443098.json."""
+        pass
+
+    @abstractmethod
+    def read(self, member) -> bytes:
+        """Return the raw contents of a member."""
+        pass
+
+    @abstractmethod
+    def stat(self, member) -> tuple[float, int]:
+        """Return the modification time and size of a member."""
+        pass
+
+    def content_hash(self, member) -> str:
+        """
+        Returns the CRC-32 of a member's contents, used by the IngestManifest to detect changed files.\n
+
+        :param member: The member to hash.\n
+
+        :return: The CRC-32 as 8 hex digits.
+        """
+        return f"{zlib.crc32(self.read(member)):08x}"
+
+    def iter_matches(self, decoder):
+        """
+        Lazily decodes the members one at a time.\n
+
+        :param decoder: The MatchDecoder used to decode each member.\n
+
+        :return: A generator of match dictionaries, each with a "file_name" key holding the member's name.
+        """
+        for member in self.members():
+            try:
+                data = decoder.decode(self.read(member))
+            except Exception as e:
+                print(f"Error decoding JSON from the file '{self.get_name(member)}': {e}")
+                continue
+            data["file_name"] = self.get_name(member)
+            yield data
+
+
+class FolderMatchSource(MatchSource):
+    """
+    Match files extracted into a folder. Members are file paths.\n
+    Author: Jonathan Farrand\n
+    Date: 2026-10-18
+    """
+    def __init__(self, folder_path: str) -> None:
+        """
+        :param folder_path: Path to the folder containing the match JSON files.
+        """
+        self.folder_path = folder_path
+
+    def members(self) -> list[str]:
+        return JSONInteractor.get_json_file_paths(self.folder_path)
+
+    def get_name(self, member: str) -> str:
+        return os.path.basename(member)
+
+    def read(self, member: str) -> bytes:
+        with open(member, 'rb') as file:
+            return file.read()
+
+    def stat(self, member: str) -> tuple[float, int]:
+        stat = os.stat(member)
+        return stat.st_mtime, stat.st_size
+
+
+class ArchiveMatchSource(MatchSource):
+    """
+    Match files read straight out of the downloaded zip archive, without extracting it.\n
+    Members are the archive's ZipInfo entries, which carry the offset of each file in the archive,
+    so a worker can seek directly to a member without searching the archive.
+    Each process opens the archive once and keeps it open for every member it reads.\n
+    Author: Jonathan Farrand\n
+    Date: 2026-10-18
+    """
+    def __init__(self, archive_path: str) -> None:
+        """
+        :param archive_path: Path to the zip archive (without extension).
+        """
+        if not archive_path.endswith('.zip'):
+            archive_path = f"{archive_path}.zip"
+        self.archive_path = archive_path
+        self._archive = None
+
+    def __getstate__(self) -> dict:
+        # Open archives cannot be pickled, each worker process opens its own
+        return {"archive_path": self.archive_path, "_archive": None}
+
+    def _open(self) -> zipfile.ZipFile:
+        if self._archive is None:
+            self._archive = zipfile.ZipFile(self.archive_path, 'r')
+        return self._archive
+
+    def members(self) -> list[zipfile.ZipInfo]:
+        """
+        :raises FileNotFoundError: If the archive is not found.
+        """
+        infos = [
+            info for info in self._open().infolist()
+            if not info.is_dir() and info.filename.lower().endswith('.json')
+        ]
+        return sorted(infos, key=lambda info: info.filename)
+
+    def get_name(self, member: zipfile.ZipInfo) -> str:
+        return PurePosixPath(member.filename).name
+
+    def read(self, member: zipfile.ZipInfo) -> bytes:
+        with self._open().open(member) as file:
+            return file.read()
+
+    def stat(self, member: zipfile.ZipInfo) -> tuple[float, int]:
+        return time.mktime(member.date_time + (0, 0, -1)), member.file_size
+
+    def content_hash(self, member: zipfile.ZipInfo) -> str:
+        # The archive already stores each member's CRC-32, so nothing needs to be read
+        return f"{member.CRC:08x}"
@@ -0,0 +1,41 @@
+import numpy as np
+import os
+
+
+class NumpyInteractor:
+    """
+    This class is responsible for interacting with NumPy array files.\n
+    Author: Jonathan Farrand\n
+    Date: 2026-10-18
+    """
+
+    @staticmethod
+    def save_array(array: np.ndarray, location: str) -> None:
+        """
+        Saves a NumPy array to a .npy file.\n
+        The array is written to a temporary file first, so a partly written file is never read.\n
+
+        :param array: The array to save.\n
+        :param location: The location of the .npy file (without extension).
+        """
+        if not location.endswith('.npy'):
+            location = f"{location}.npy"
+        temp_location = f"{location}.tmp.npy"
+        np.save(temp_location, array)
+        os.replace(temp_location, location)
+
+    @staticmethod
+    def get_array(location: str, memory_map: bool = False) -> np.ndarray:
+        """
+        Reads a NumPy array from a .npy file.\n
+
+        :param location: The location of the .npy file (without extension).\n
+        :param memory_map: If True, the array is a read-only memory map of the file, so only the parts used are read.\n
+
+        :return: The array.\n
+
+        :raises FileNotFoundError: If the file is not found.
+        """
+        if not location.endswith('.npy'):
+            location = f"{location}.npy"
+        return np.load(location, mmap_mode="r" if memory_map else None)
@@ -0,0 +1,245 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pandas as pd
+import shutil
+import os
+
+
+class ParquetInteractor:
+    """
+    This class is responsible for interacting with partitioned Parquet datasets.\n
+    Datasets are folders of Parquet files split into hive style partitions (such as match_type=t20/gender=male),
+    so reads filtered on the partition columns only open the matching folders,
+    and only the requested columns are read from each file.\n
+    Author: Jonathan Farrand\n
+    Date: 2026-10-18
+    """
+
+    @staticmethod
+    def write_dataset(location: str, batches, schema: pa.Schema, partitions: list) -> None:
+        """
+        Writes record batches to a partitioned Parquet dataset, replacing any existing dataset.\n
+        The batches are streamed, so they do not need to fit in memory at once.
+        The dataset is written to a temporary folder first, so the existing dataset stays readable until the new one is complete.\n
+
+        :param location: The folder of the dataset.\n
+        :param batches: An iterable of record batches following schema.\n
+        :param schema: The schema of the batches.\n
+        :param partitions: The columns the dataset is partitioned by, from the outermost folder inwards.
+        """
+        temp_location = f"{location}.tmp"
+        if os.path.exists(temp_location):
+            shutil.rmtree(temp_location)
+
+        partitioning = ds.partitioning(pa.schema([schema.field(name) for name in partitions]), flavor="hive")
+        ds.write_dataset(
+            batches,
+            temp_location,
+            schema=schema,
+            format="parquet",
+            partitioning=partitioning,
+            basename_template="part-{i}.parquet",
+            max_partitions=100_000
+        )
+
+        if os.path.exists(location):
+            shutil.rmtree(location)
+        os.replace(temp_location, location)
+
+    @staticmethod
+    def get_dataset(
+        location: str,
+        schema: pa.Schema,
+        partitions: list,
+        filters=None,
+        columns: list = None
+    ) -> pd.DataFrame:
+        """
+        Reads a partitioned Parquet dataset, only reading the partitions and columns that are needed.\n
+
+        :param location: The folder of the dataset.\n
+        :param schema: The schema the dataset was written with.\n
+        :param partitions: The columns the dataset is partitioned by.\n
+        :param filters: The rows to read. Either a dictionary mapping columns to a value or a list of accepted values,
+            a list of (column, operator, value) tuples as accepted by pandas.read_parquet, or a pyarrow expression.
+            If None, every row is read.\n
+        :param columns: The columns to read. If None, every column is read.\n
+
+        :return: A pandas DataFrame with the columns in schema order, with partition columns of dictionary type read as categoricals.\n
+
+        :raises FileNotFoundError: If the dataset is not found.
+        """
+        if not os.path.isdir(location):
+            raise FileNotFoundError(f"The dataset '{location}' was not found.")
+
+        # Partition values are read as strings, as dictionary partition columns cannot hold missing values
+        partitioning = ds.partitioning(pa.schema([(name, pa.string()) for name in partitions]), flavor="hive")
+        dataset = ds.dataset(location, format="parquet", partitioning=partitioning)
+
+        if columns is None:
+            columns = schema.names
+        table = dataset.to_table(filter=ParquetInteractor.to_expression(filters), columns=columns)
+
+        for name in partitions:
+            if name in columns and pa.types.is_dictionary(schema.field(name).type):
+                table = table.set_column(table.schema.get_field_index(name), schema.field(name), pc.dictionary_encode(table.column(name)))
+        return table.to_pandas()
+
+    @staticmethod
+    def get_dataset_files(location: str, partitions: list, filters=None) -> list:
+        """
+        Lists the files of a partitioned Parquet dataset that a read with the given filters would open.\n
+        Only filters on the partition columns narrow the list, as other filters are checked inside each file.\n
+
+        :param location: The folder of the dataset.\n
+        :param partitions: The columns the dataset is partitioned by.\n
+        :param filters: The rows to read, in any form accepted by to_expression. If None, every file is listed.\n
+
+        :return: The sorted paths of the files, or an empty list if the dataset is not found.
+        """
+        if not os.path.isdir(location):
+            return []
+        partitioning = ds.partitioning(pa.schema([(name, pa.string()) for name in partitions]), flavor="hive")
+        dataset = ds.dataset(location, format="parquet", partitioning=partitioning)
+        # Only the partition columns can be checked against a file's partition, so any other column is ignored
+        fragments = dataset.get_fragments(filter=ParquetInteractor.to_expression(filters))
+        return sorted(fragment.path for fragment in fragments)
+
+    @staticmethod
+    def get_dataset_partitions(location: str, partitions: list, filters=None) -> list:
+        """
+        Lists the partitions of a partitioned Parquet dataset that a read with the given filters would open.\n
+
+        :param location: The folder of the dataset.\n
+        :param partitions: The columns the dataset is partitioned by.\n
+        :param filters: The rows to read, in any form accepted by to_expression. If None, every partition is listed.\n
+
+        :return: A list of dictionaries, one per partition in folder order, holding its keys (a dictionary mapping each
+            partition column to its value, left out when the value is missing), filter (a pyarrow expression selecting
+            only its rows) and files (the sorted paths of its files). Empty if the dataset is not found.
+        """
+        if not os.path.isdir(location):
+            return []
+        partitioning = ds.partitioning(pa.schema([(name, pa.string()) for name in partitions]), flavor="hive")
+        dataset = ds.dataset(location, format="parquet", partitioning=partitioning)
+
+        found = dict()
+        for fragment in dataset.get_fragments(filter=ParquetInteractor.to_expression(filters)):
+            folder = os.path.dirname(fragment.path)
+            if folder not in found:
+                found[folder] = {
+                    "keys": ds.get_partition_keys(fragment.partition_expression),
+                    "filter": fragment.partition_expression,
+                    "files": []
+                }
+            found[folder]["files"].append(fragment.path)
+        for partition in found.values():
+            partition["files"].sort()
+        return [found[folder] for folder in sorted(found)]
+
+    @staticmethod
+    def get_parquet(location: str, filters=None, columns: list = None) -> pd.DataFrame:
+        """
+        Reads a single Parquet file and returns it as a pandas DataFrame.\n
+
+        :param location: The location of the Parquet file (without extension).\n
+        :param filters: The rows to read, in any form accepted by to_expression. If None, every row is read.\n
+        :param columns: The columns to read. If None, every column is read.\n
+
+        :return: A pandas DataFrame containing the data from the Parquet file.\n
+
+        :raises FileNotFoundError: If the file is not found.
+        """
+        if not location.endswith('.parquet'):
+            location = f"{location}.parquet"
+        return pq.read_table(location, columns=columns, filters=ParquetInteractor.to_expression(filters)).to_pandas()
+
+    @staticmethod
+    def save_parquet(df: pd.DataFrame, location: str) -> int:
+        """
+        Saves a pandas DataFrame to a single Parquet file, keeping its index and column types.\n
+        The file is written to a temporary file first, so a partly written file is never read.\n
+
+        :param df: The DataFrame to save.\n
+        :param location: The location of the Parquet file (without extension).\n
+
+        :return: The size of the file in bytes.\n
+
+        :raises pyarrow.ArrowException: If a column cannot be stored in Parquet, such as one holding mixed types.
+        """
+        if not location.endswith('.parquet'):
+            location = f"{location}.parquet"
+        temp_location = f"{location}.tmp"
+        try:
+            pq.write_table(pa.Table.from_pandas(df), temp_location)
+        except Exception:
+            if os.path.exists(temp_location):
+                os.remove(temp_location)
+            raise
+        os.replace(temp_location, location)
+        return os.path.getsize(location)
+
+    @staticmethod
+    def to_expression(filters) -> pc.Expression | None:
+        """
+        Converts filters to a pyarrow expression.\n
+
+        :param filters: A dictionary mapping columns to a value or a list of accepted values,
+            a list of (column, operator, value) tuples, a pyarrow expression, or None.\n
+
+        :return: The filters as a pyarrow expression, or None if there are no filters.
+        """
+        if filters is None or isinstance(filters, pc.Expression):
+            return filters
+        if isinstance(filters, dict):
+            expression = None
+            for key, value in filters.items():
+                if isinstance(value, (list, tuple, set)):
+                    condition = pc.field(key).isin(list(value))
+                else:
+                    condition = pc.field(key) == value
+                expression = condition if expression is None else expression & condition
+            return expression
+        return pq.filters_to_expression(filters)
+
+    @staticmethod
+    def get_filter_columns(filters) -> list | None:
+        """
+        Finds the columns filters are applied to.\n
+
+        :param filters: A dictionary mapping columns to a value or a list of accepted values,
+            a list of (column, operator, value) tuples, a pyarrow expression, or None.\n
+
+        :return: A list of the columns, or None if the filters are a pyarrow expression, whose columns are not known.
+        """
+        if filters is None:
+            return []
+        if isinstance(filters, pc.Expression):
+            return None
+        if isinstance(filters, dict):
+            return list(filters)
+        # A list of lists of tuples is a disjunction of conjunctions
+        conditions = [condition for group in filters for condition in (group if isinstance(group, list) else [group])]
+        return list(dict.fromkeys(column for column, _, _ in conditions))
+
+    @staticmethod
+    def get_partition_filters(filters, partitions: list):
+        """
+        Keeps only the filters on partition columns, which select whole partitions.\n
+
+        :param filters: A dictionary mapping columns to a value or a list of accepted values,
+            a list of (column, operator, value) tuples, a pyarrow expression, or None.\n
+        :param partitions: The columns the dataset is partitioned by.\n
+
+        :return: The filters on partition columns in the same form, or None if there are none
+            or the filters cannot be split (a pyarrow expression or a disjunction of conjunctions).
+        """
+        if isinstance(filters, dict):
+            kept = {column: value for column, value in filters.items() if column in partitions}
+        elif isinstance(filters, list) and all(isinstance(condition, tuple) for condition in filters):
+            kept = [condition for condition in filters if condition[0] in partitions]
+        else:
+            return None
+        return kept if len(kept) > 0 else None
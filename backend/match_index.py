@@ -0,0 +1,129 @@
+from .interactors.feather_interactor import FeatherInteractor
+from .interactors.parquet_interactor import ParquetInteractor
+import pandas as pd
+import numpy as np
+import datetime
+
+
+class MatchIndex:
+    """
+    This class is responsible for finding the rows of matches in a ball-by-ball feather file.\n
+    The balls of each match are stored together, with matches ordered by date then match ID,
+    so the index holds the (start_row, end_row) range of every match in file order.
+    The rows of a match, or of every match between two dates, are then found by a binary search
+    and read as one contiguous slice of the memory-mapped file rather than by scanning every ball.\n
+    Author: Jonathan Farrand\n
+    Date: 2026-10-18
+    """
+    def __init__(self, ranges: pd.DataFrame = None) -> None:
+        """
+        Initializes the MatchIndex.\n
+
+        :param ranges: A DataFrame with a row per match in file order, holding its match_id, date, start_row and end_row
+            (one past its last row). If None, the index is empty.
+        """
+        if ranges is None:
+            ranges = pd.DataFrame({
+                "match_id": np.zeros(0, dtype=np.int64),
+                "date": pd.Series(dtype="datetime64[ms]"),
+                "start_row": np.zeros(0, dtype=np.int64),
+                "end_row": np.zeros(0, dtype=np.int64)
+            })
+        self.ranges = ranges.reset_index(drop=True)
+        self._match_ids = self.ranges["match_id"].to_numpy(dtype=np.int64)
+        # Matches are in date order in the file, but not in match ID order
+        self._match_order = np.argsort(self._match_ids, kind="stable")
+        self._sorted_match_ids = self._match_ids[self._match_order]
+        dates = self.ranges["date"].to_numpy(dtype="datetime64[D]")
+        # Undated matches are stored after every dated match
+        self._dates = dates[:len(dates) - int(np.isnat(dates).sum())]
+
+    @staticmethod
+    def build(location: str) -> "MatchIndex":
+        """
+        Builds the index of a ball-by-ball feather file, reading only its match_id and date columns.\n
+
+        :param location: The location of the feather file (without extension), with the balls of each match together.\n
+
+        :return: The index of the file.\n
+
+        :raises FileNotFoundError: If the file is not found.
+        """
+        table = FeatherInteractor.open_table(location, ["match_id", "date"])
+        match_ids = table.column("match_id").to_numpy()
+        starts = np.flatnonzero(np.r_[True, match_ids[1:] != match_ids[:-1]]) if len(match_ids) > 0 else np.zeros(0, dtype=np.int64)
+        return MatchIndex(pd.DataFrame({
+            "match_id": match_ids[starts].astype(np.int64),
+            "date": table.column("date").take(starts).to_pandas().astype("datetime64[ms]"),
+            "start_row": starts.astype(np.int64),
+            "end_row": np.r_[starts[1:], len(match_ids)][:len(starts)].astype(np.int64)
+        }))
+
+    @staticmethod
+    def load(location: str) -> "MatchIndex":
+        """
+        Loads an index from a Parquet file.\n
+
+        :param location: The location of the index file (without extension).\n
+
+        :return: The loaded index.\n
+
+        :raises FileNotFoundError: If the file is not found.
+        """
+        return MatchIndex(ParquetInteractor.get_parquet(location))
+
+    def save(self, location: str) -> int:
+        """
+        Saves the index to a Parquet file.\n
+
+        :param location: The location of the index file (without extension).\n
+
+        :return: The size of the file in bytes.
+        """
+        return ParquetInteractor.save_parquet(self.ranges, location)
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def get_match_rows(self, match_id: int) -> tuple | None:
+        """
+        Finds the rows of a match.\n
+
+        :param match_id: The ID of the match.\n
+
+        :return: A tuple of the match's start_row and end_row (one past its last row), or None if it is not in the index.
+        """
+        position = np.searchsorted(self._sorted_match_ids, match_id)
+        if position == len(self._sorted_match_ids) or self._sorted_match_ids[position] != match_id:
+            return None
+        match = self._match_order[position]
+        return int(self.ranges["start_row"].iat[match]), int(self.ranges["end_row"].iat[match])
+
+    def get_date_rows(self, start_date=None, end_date=None) -> tuple:
+        """
+        Finds the rows of every match played between two dates, inclusive.\n
+
+        :param start_date: The first date, as a datetime.date or an ISO date string. If None, starts from the first match.\n
+        :param end_date: The last date, as a datetime.date or an ISO date string. If None, runs to the last dated match.\n
+
+        :return: A tuple of the start_row and end_row (one past the last row) of the matches, which are equal if there are none.
+            Undated matches are stored last, and are only included when neither date is given.
+        """
+        if start_date is None and end_date is None:
+            return (0, int(self.ranges["end_row"].iat[-1])) if len(self.ranges) > 0 else (0, 0)
+
+        first = 0 if start_date is None else np.searchsorted(self._dates, MatchIndex._to_day(start_date), side="left")
+        last = len(self._dates) if end_date is None else np.searchsorted(self._dates, MatchIndex._to_day(end_date), side="right")
+        if last <= first:
+            return 0, 0
+        return int(self.ranges["start_row"].iat[first]), int(self.ranges["end_row"].iat[last - 1])
+
+    @staticmethod
+    def _to_day(date) -> np.datetime64:
+        """
+        :param date: A datetime.date or an ISO date string.
+        :return: The date as a NumPy day.
+        """
+        if isinstance(date, datetime.datetime):
+            date = date.date()
+        return np.datetime64(date, "D")
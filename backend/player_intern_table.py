@@ -0,0 +1,97 @@
+import numpy as np
+import pyarrow as pa
+from .interactors.json_interactor import JSONInteractor
+from .specialised.cricket_data_transformer.match.ball_schema import BALL_SCHEMA, PLAYER_ID_COLUMNS
+
+
+class PlayerInternTable:
+    """
+    This class is responsible for mapping cricsheet player IDs to small integer keys.\n
+    Each new ID is given the next key, starting from 0, and keys are never reused or reassigned,
+    so the table can be saved and extended by later ingests without changing the keys already written.
+    Keys are assigned only by the process writing the ball-by-ball files, so every ingest worker shares
+    the same table without any coordination between them.\n
+    Author: Jonathan Farrand\n
+    Date: 2026-10-18
+    """
+    def __init__(self, ids: list = None) -> None:
+        """
+        Initializes the PlayerInternTable.\n
+
+        :param ids: The cricsheet IDs in key order. If None, the table starts empty.
+        """
+        self.ids = ids if ids is not None else []
+        self._keys = {player_id: key for key, player_id in enumerate(self.ids)}
+
+    @staticmethod
+    def load(location: str) -> "PlayerInternTable":
+        """
+        Loads a table from a JSON file.\n
+
+        :param location: The location of the table file (without extension).\n
+
+        :return: The loaded table, which is empty if the file does not exist or cannot be read.
+        """
+        data = JSONInteractor.load_json_file_as_dict(location)
+        return PlayerInternTable(data.get("ids", []))
+
+    def save(self, location: str) -> bool:
+        """
+        Saves the table to a JSON file.\n
+
+        :param location: The location of the table file (without extension).\n
+
+        :return: True if successful, False otherwise.
+        """
+        return JSONInteractor.save_dict_to_json({"ids": self.ids}, location)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def intern(self, ids: list) -> np.ndarray:
+        """
+        Returns the keys of cricsheet IDs, adding any IDs not seen before.\n
+
+        :param ids: The cricsheet IDs. None is given the key -1.\n
+
+        :return: An int32 array of keys.
+        """
+        keys = np.empty(len(ids), dtype=np.int32)
+        for i, player_id in enumerate(ids):
+            if player_id is None:
+                keys[i] = -1
+                continue
+            key = self._keys.get(player_id)
+            if key is None:
+                key = len(self.ids)
+                self._keys[player_id] = key
+                self.ids.append(player_id)
+            keys[i] = key
+        return keys
+
+    def get_ids(self, keys) -> list:
+        """
+        Returns the cricsheet IDs of keys.\n
+
+        :param keys: The keys to look up.\n
+
+        :return: A list of cricsheet IDs, with None for the key -1.
+        """
+        return [self.ids[key] if key >= 0 else None for key in keys]
+
+    def intern_batch(self, batch: pa.RecordBatch) -> pa.RecordBatch:
+        """
+        Replaces the cricsheet IDs in the player columns of a match batch with their keys.\n
+        Only the dictionary of each column is looked up, so each player is interned once per match rather than once per ball.\n
+
+        :param batch: A record batch following MATCH_SCHEMA or LEAN_MATCH_SCHEMA, whose player columns are dictionaries of cricsheet IDs.\n
+
+        :return: The batch following BALL_SCHEMA (or LEAN_BALL_SCHEMA), with missing players given the key -1.
+        """
+        arrays = batch.columns
+        for name in PLAYER_ID_COLUMNS:
+            index = batch.schema.get_field_index(name)
+            column = arrays[index]
+            keys = np.append(self.intern(column.dictionary.to_pylist()), np.int32(-1))
+            arrays[index] = pa.array(keys[column.indices.fill_null(len(keys) - 1).to_numpy()], type=BALL_SCHEMA.field(name).type)
+        return pa.RecordBatch.from_arrays(arrays, schema=pa.schema([BALL_SCHEMA.field(name) for name in batch.schema.names]))
@@ -0,0 +1,201 @@
+from .config import RESULT_CACHE_PATH, RESULT_CACHE_MAX_BYTES
+from .interactors.parquet_interactor import ParquetInteractor
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+
+
+class ResultCache:
+    """
+    This class is responsible for keeping the results of analytics on disk between sessions.\n
+    Each result is stored as a Parquet file named by a hash of the method that made it, its parameters,
+    a description of how the data was selected (the scope) and a fingerprint of the files the data was read from.
+    The fingerprint is taken from the path, modification time and size of every file on each lookup,
+    so results of data that has since been re-ingested are never returned, and are removed as they fall out of use.\n
+    The cache is bounded by size, and the least recently used results are removed first.\n
+    Author: Jonathan Farrand\n
+    Date: 2026-10-18
+    """
+    def __init__(
+        self,
+        dataset_paths: list,
+        scope=None,
+        location: str = RESULT_CACHE_PATH,
+        max_bytes: int = RESULT_CACHE_MAX_BYTES
+    ) -> None:
+        """
+        Initializes the ResultCache.\n
+
+        :param dataset_paths: The files or folders the data was read from.\n
+        :param scope: Anything that can be written as JSON describing how the rows were selected from those files,
+            such as the filters they were read with. Data selected differently must be given a different scope.\n
+        :param location: The folder the results are stored in.\n
+        :param max_bytes: The most bytes of results to keep.
+        """
+        self.dataset_paths = list(dataset_paths)
+        self.scope = scope
+        self.location = location
+        self.max_bytes = max_bytes
+
+    def fingerprint(self) -> str:
+        """
+        Fingerprints the files the data was read from, walking into folders.\n
+
+        :return: A hash of the path, modification time and size of every file, which changes whenever a file is
+            written, added or removed.
+        """
+        digest = hashlib.sha1()
+        for path in self.dataset_paths:
+            files = [path]
+            if os.path.isdir(path):
+                files = sorted(os.path.join(folder, name) for folder, _, names in os.walk(path) for name in names)
+            for file in files:
+                try:
+                    stat = os.stat(file)
+                    digest.update(f"{file}|{stat.st_mtime_ns}|{stat.st_size}\n".encode())
+                except FileNotFoundError:
+                    digest.update(f"{file}|missing\n".encode())
+        return digest.hexdigest()
+
+    def get_key(self, method: str, params: dict) -> str:
+        """
+        Makes the key of a result from a canonical form of its query.\n
+
+        :param method: The name of the method that makes the result.\n
+        :param params: The parameters of the method. DataFrames and Series are included by a hash of their contents.\n
+
+        :return: The key of the result.
+        """
+        query = {"method": method, "params": params, "scope": self.scope, "fingerprint": self.fingerprint()}
+        canonical = json.dumps(query, sort_keys=True, default=ResultCache._canonical)
+        return hashlib.sha1(canonical.encode()).hexdigest()
+
+    @staticmethod
+    def _canonical(value):
+        """
+        Converts a value that json cannot write to a canonical form.\n
+
+        :param value: The value to convert.\n
+
+        :return: A form of the value json can write, equal for equal values.
+        """
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            contents = pd.util.hash_pandas_object(value, index=True).to_numpy()
+            header = repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name)
+            return hashlib.sha1(contents.tobytes() + header.encode()).hexdigest()
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, (set, frozenset)):
+            return sorted(value, key=repr)
+        return repr(value)
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """
+        Returns a stored result, marking it as recently used.\n
+
+        :param key: The key of the result.\n
+
+        :return: The result, or None if it is not stored or cannot be read.
+        """
+        location = os.path.join(self.location, f"{key}.parquet")
+        try:
+            result = ParquetInteractor.get_parquet(location)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Unreadable results are removed and made again
+            self._remove(location)
+            return None
+        os.utime(location)
+        return result
+
+    def put(self, key: str, result: pd.DataFrame) -> bool:
+        """
+        Stores a result, then removes the least recently used results until the cache fits in max_bytes.\n
+
+        :param key: The key of the result.\n
+        :param result: The result to store.\n
+
+        :return: True if the result was stored, False if it cannot be stored in Parquet.
+        """
+        os.makedirs(self.location, exist_ok=True)
+        try:
+            ParquetInteractor.save_parquet(result, os.path.join(self.location, f"{key}.parquet"))
+        except Exception:
+            return False
+        self._evict()
+        return True
+
+    def get_or_compute(self, method: str, params: dict, compute, to_frame=None, from_frame=None):
+        """
+        Returns a stored result, or computes and stores it.\n
+
+        :param method: The name of the method that makes the result.\n
+        :param params: The parameters of the method.\n
+        :param compute: A function taking no arguments that computes the result.\n
+        :param to_frame: A function converting the result to a DataFrame to store it. If None, the result is a DataFrame.\n
+        :param from_frame: A function converting a stored DataFrame back to a result. If None, the result is a DataFrame.\n
+
+        :return: The result.
+        """
+        key = self.get_key(method, params)
+        stored = self.get(key)
+        if stored is not None:
+            return stored if from_frame is None else from_frame(stored)
+
+        result = compute()
+        self.put(key, result if to_frame is None else to_frame(result))
+        return result
+
+    def clear(self) -> None:
+        """
+        Removes every stored result.
+        """
+        for location, _, _ in self._entries():
+            self._remove(location)
+
+    def _entries(self) -> list:
+        """
+        Lists the stored results.\n
+
+        :return: A list of the location, last use time and size of each result, least recently used first.
+        """
+        if not os.path.isdir(self.location):
+            return []
+        entries = []
+        for name in os.listdir(self.location):
+            if not name.endswith(".parquet"):
+                continue
+            location = os.path.join(self.location, name)
+            try:
+                stat = os.stat(location)
+            except FileNotFoundError:
+                continue
+            entries.append((location, stat.st_mtime_ns, stat.st_size))
+        return sorted(entries, key=lambda entry: entry[1])
+
+    def _evict(self) -> None:
+        """
+        Removes the least recently used results until the cache fits in max_bytes.
+        """
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        for location, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(location)
+            total -= size
+
+    @staticmethod
+    def _remove(location: str) -> None:
+        """
+        Removes a stored result if it still exists.\n
+
+        :param location: The location of the result.
+        """
+        try:
+            os.remove(location)
+        except FileNotFoundError:
+            pass
@@ -1,14 +1,78 @@
 
 from .config import NAME_DATA_URL, NAME_DATA_FILE_PATH, PLAYER_DATA_FILE_PATH, PLAYER_DATA_URL, \
-    MATCH_DATA_FILE_PATH, MATCH_DATA_URL, DIRECTORIES_TO_CREATE, ROLE_DATA_URL, PLAYER_ROLE_FILE_PATH, BALL_BY_BALL_FILE_PATH
+    MATCH_DATA_FILE_PATH, MATCH_DATA_URL, DIRECTORIES_TO_CREATE, ROLE_DATA_URL, PLAYER_ROLE_FILE_PATH, BALL_BY_BALL_FILE_PATH, \
+    INGEST_CHUNK_SIZE, BALL_BY_BALL_FLUSH_SIZE, MATCH_FORMATS, BALL_BY_BALL_MANIFEST_FILE_PATH, \
+    MATCH_DECODER_BACKEND, MATCH_SOURCE, MATCH_ARCHIVE_FILE_PATH, PLAYER_KEYS_FILE_PATH, \
+    BALL_BY_BALL_DATASET_PATH, BALL_BY_BALL_PARTITIONS, BALL_BY_BALL_COMPRESSION, LADDERS_FILE_PATH, \
+    BALL_BY_BALL_INDEX_FILE_PATH, BALL_BY_BALL_LEAN
 from .interactors.csv_interactor import CSVInteractor
 from .interactors.request_interactor import RequestInteractor
 from .interactors.json_interactor import JSONInteractor
 from .interactors.r_interactor import RInteractor
+from .interactors.feather_interactor import FeatherInteractor
+from .interactors.parquet_interactor import ParquetInteractor
+from .interactors.match_decoder import MatchDecoder
+from .interactors.match_source import MatchSource, FolderMatchSource, ArchiveMatchSource
+from .ingest_manifest import IngestManifest
+from .match_index import MatchIndex
+from .player_intern_table import PlayerInternTable
+from .result_cache import ResultCache
 from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import os
-from src.specialised.cricket_data_transformer.match_data import MatchData
+from src.specialised.cricket_data_transformer.match.match_data import MatchData
+from src.specialised.cricket_data_transformer.match.ball_schema import BALL_SCHEMA, LEAN_BALL_SCHEMA
+from src.specialised.cricket_data_transformer.player_summaries import PlayerSummaries, SUMMARY_COLUMNS
+from src.specialised.cricket_data_transformer.ladder import Ladder, LADDER_COLUMNS
+from src.specialised.cricket_data_transformer.cumulative_columns import CumulativeColumns, CUMULATIVE_BASE_COLUMNS
+from src.specialised.cricket_data_transformer.derived_columns import DerivedColumns, DERIVED_COLUMNS
+
+# Schema of the ball-by-ball files and dataset, which leave out the running totals when BALL_BY_BALL_LEAN is set
+BALL_BY_BALL_SCHEMA = LEAN_BALL_SCHEMA if BALL_BY_BALL_LEAN else BALL_SCHEMA
+
+
+def process_match(source: MatchSource, member, decoder: str = MATCH_DECODER_BACKEND, lean: bool = BALL_BY_BALL_LEAN) -> tuple:
+    """
+    Processes a single match file into a record batch of its balls.\n
+    This runs inside the ingest worker processes, so errors are returned rather than raised.\n
+
+    :param source: The MatchSource the match file belongs to.\n
+    :param member: The member of the source to process.\n
+    :param decoder: The MatchDecoder backend used to read the file.\n
+    :param lean: If True, the running totals are left out and the batch follows LEAN_MATCH_SCHEMA.\n
+
+    :return: A tuple of the match format (t20, od or mdm) and a record batch of the match's balls following MATCH_SCHEMA,
+        or a tuple of None and the error message if the match could not be processed.
+    """
+    try:
+        game = MatchDecoder.get(decoder).decode(source.read(member))
+        game["file_name"] = source.get_name(member)
+        cur_match = MatchData(game, lean)
+        batch = cur_match.to_record_batch()
+        if batch.num_rows == 0:
+            return None, "match has no deliveries"
+        return Setup.get_format_key(cur_match.meta.match_type), batch
+    except Exception as match_error:
+        return None, str(match_error)
+
+
+def process_matches(source: MatchSource, members: list, decoder: str = MATCH_DECODER_BACKEND, lean: bool = BALL_BY_BALL_LEAN) -> list:
+    """
+    Processes a batch of match files, so each task sent to a worker process covers several matches.\n
+
+    :param source: The MatchSource the match files belong to.\n
+    :param members: The members of the source to process.\n
+    :param decoder: The MatchDecoder backend used to read the files.\n
+    :param lean: If True, the running totals are left out of the batches.\n
+
+    :return: A list with the result of process_match for each member, in the same order.
+    """
+    return [process_match(source, member, decoder, lean) for member in members]
+
 
 class Setup:
     """
@@ -16,12 +80,14 @@ class Setup:
     Author: Jonathan Farrand\n
     Date: 2025-4-22
     """
-    def __init__(self, setup: bool = False, update: bool = False) -> None:
+    def __init__(self, setup: bool = False, update: bool = False, workers: int = 1, incremental: bool = False) -> None:
         """
         Initializes the Setup class.\n
 
         :param setup: If True, creates the necessary directories for data storage.\n
-        :param update: If True, updates the data files from the specified URLs.
+        :param update: If True, updates the data files from the specified URLs.\n
+        :param workers: The number of worker processes used to build the ball-by-ball data when updating.\n
+        :param incremental: If True, updating only processes match files that are new or have changed since the last update.
         """
         if setup:
             update = setup
@@ -36,10 +102,11 @@ class Setup:
         self.matches_data = None
         self.player_roles = None
         self.ball_by_ball = None
+        self.match_indexes = dict()
 
         if update:
             self.update_files()
-            self.json_to_ball_by_ball()
+            self.json_to_ball_by_ball_method(setup, workers, incremental)
         pass
 
     def get_player_name_data(self, update: bool = False) -> pd.DataFrame:
@@ -78,21 +145,55 @@ class Setup:
 
     def get_match_data(self, update: bool = False) -> [dict]:
         """
-        Returns all the match data as a pandas DataFrame.\n
-        If the data is not already loaded, it will be retrieved from the specified file.\n
+        Returns all the match data as a list of dictionaries.\n
+        If the data is not already loaded, it will be retrieved from the match source set by MATCH_SOURCE.\n
         If update is True, the data will be downloaded again from the URL.\n
 
         :param update: If True, updates the match data file from the specified URL.\n
 
-        :return: A pandas DataFrame containing the match data.\n
+        :return: A list of dictionaries containing the match data.\n
 
         :raises FileNotFoundError: If the file is not found.
         """
         if update:
-            RequestInteractor.download_and_extract_zip(MATCH_DATA_URL, MATCH_DATA_FILE_PATH)
+            self.download_match_data()
         if self.matches_data is None:
-            self.matches_data = JSONInteractor.get_multiple_json_files(MATCH_DATA_FILE_PATH, False)
+            if MATCH_SOURCE == "archive":
+                self.matches_data = list(self.iter_match_data())
+            else:
+                self.matches_data = JSONInteractor.get_multiple_json_files(MATCH_DATA_FILE_PATH, False)
         return self.matches_data
+
+    def iter_match_data(self):
+        """
+        Lazily yields the match data one match at a time, without holding every match in memory.\n
+
+        :return: A generator of match dictionaries, each with a "file_name" key.
+        """
+        return self.get_match_source().iter_matches(MatchDecoder.get("json"))
+
+    def get_match_source(self) -> MatchSource:
+        """
+        Returns the source the match files are read from.\n
+        When MATCH_SOURCE is "archive" matches are streamed straight out of the downloaded zip,
+        otherwise they are read from the folder the zip was extracted to.\n
+
+        :return: An ArchiveMatchSource or FolderMatchSource.
+        """
+        if MATCH_SOURCE == "archive":
+            return ArchiveMatchSource(MATCH_ARCHIVE_FILE_PATH)
+        return FolderMatchSource(MATCH_DATA_FILE_PATH)
+
+    def download_match_data(self) -> bool:
+        """
+        Downloads the match zip file. It is only extracted when MATCH_SOURCE is "folder".\n
+
+        :return: True if successful, False otherwise.
+        """
+        self.matches_data = None
+        if MATCH_SOURCE == "archive":
+            return RequestInteractor.get_zip_file(MATCH_DATA_URL, MATCH_ARCHIVE_FILE_PATH)
+        return RequestInteractor.download_and_extract_zip(MATCH_DATA_URL, MATCH_DATA_FILE_PATH)
     
     def get_player_role_data(self, update: bool = False) -> pd.DataFrame:
         """
@@ -119,99 +220,597 @@ class Setup:
         """
         self.get_player_name_data(True)
         self.get_player_id_data(True)
-        self.get_match_data(True)
+        self.download_match_data()
         self.get_player_role_data(True)
     
 
 
-    def json_to_ball_by_ball_method(self, setup) -> pd.DataFrame:
-        data_list = []
-        matches = self.get_match_data()
-        col_check = False
-        columns = None
-        t20_dict = dict()
-        mdm_dict = dict()
-        od_dict = dict()
+    def json_to_ball_by_ball_method(
+        self,
+        setup,
+        workers: int = 1,
+        incremental: bool = False,
+        decoder: str = MATCH_DECODER_BACKEND,
+        source: MatchSource = None
+    ) -> None:
+        """
+        Builds the t20, od and mdm ball-by-ball feather files from the match JSON files.\n
+        Matches are processed lazily, either in this process or across a pool of worker processes,
+        and their balls are streamed into the output files in batches of BALL_BY_BALL_FLUSH_SIZE rows,
+        so memory use stays flat regardless of how many matches there are.
+        The balls of each match are kept together, with matches ordered by date then match ID,
+        and a MatchIndex of each file is saved so the balls of a match or date range are read as one slice.\n
+        Every processed file is recorded in a manifest. When incremental is True only new or changed files
+        are processed, their balls are appended to the existing files, and the balls of changed or removed
+        files are dropped. If the existing files or manifest are missing or out of date everything is rebuilt.\n
+        Once the files have changed they are also written as a Parquet dataset partitioned by BALL_BY_BALL_PARTITIONS,
+        which is what get_ball_by_ball reads.\n
+        The PlayerSummaries tables are built alongside the files, and incremental ingests only add the balls of new
+        matches to them and take away the balls of changed or removed matches.\n
+        Player IDs are written as keys from the saved PlayerInternTable, which is extended with any new players
+        and kept across rebuilds, so a player's key never changes.\n
+
+        :param setup: Unused, kept for backwards compatibility.\n
+        :param workers: The number of worker processes to use. 1 processes matches in this process and None uses every core.
+            Only reading and processing the match files is spread across the workers. Writing the files, the dataset
+            and the PlayerSummaries stays in this process, so the speedup is bounded by that share of the ingest.\n
+        :param incremental: If True, only processes match files that have changed since the last ingest.\n
+        :param decoder: The MatchDecoder backend used to read the match files.\n
+        :param source: The MatchSource to read the match files from. If None, the source set by MATCH_SOURCE is used.\n
+
+        :raises ValueError: If an unexpected error stops the processing of the matches.
+        """
+        if source is None:
+            source = self.get_match_source()
+        if workers is None:
+            workers = os.cpu_count()
+        self.player_keys = PlayerInternTable.load(PLAYER_KEYS_FILE_PATH)
+
+        if incremental and self._ball_by_ball_is_current():
+            manifest = IngestManifest.load(BALL_BY_BALL_MANIFEST_FILE_PATH)
+            changed, removed = manifest.scan(source)
+            updated = len(changed) > 0 or len(removed) > 0
+            if updated:
+                self._update_ball_by_ball(source, manifest, changed, removed, workers, decoder)
+            else:
+                print("Ball-by-ball data is up to date")
+        else:
+            manifest = IngestManifest()
+            self._write_ball_by_ball(source, source.members(), workers, manifest, "", decoder)
+            for match_format in MATCH_FORMATS:
+                FeatherInteractor.sort_groups(
+                    f"{BALL_BY_BALL_FILE_PATH}{match_format}", "match_id", ["date", "match_id"], BALL_BY_BALL_FLUSH_SIZE,
+                    BALL_BY_BALL_COMPRESSION
+                )
+            self.write_player_summaries()
+            updated = True
+
+        self.player_keys.save(PLAYER_KEYS_FILE_PATH)
+        manifest.save(BALL_BY_BALL_MANIFEST_FILE_PATH)
+
+        if updated or not os.path.isdir(BALL_BY_BALL_DATASET_PATH):
+            self.write_ball_by_ball_dataset()
+        if updated or not all(os.path.exists(f"{BALL_BY_BALL_INDEX_FILE_PATH}{match_format}.parquet") for match_format in MATCH_FORMATS):
+            self.write_match_indexes()
+        if not PlayerSummaries().exists():
+            self.write_player_summaries()
+        return None
+
+    def write_ball_by_ball_dataset(self) -> None:
+        """
+        Writes the t20, od and mdm ball-by-ball feather files as one Parquet dataset partitioned by BALL_BY_BALL_PARTITIONS.\n
+        The feather files are streamed a record batch at a time, so memory use stays flat.
+        """
+        batches = (
+            batch
+            for match_format in MATCH_FORMATS
+            for batch in FeatherInteractor.iter_batches(f"{BALL_BY_BALL_FILE_PATH}{match_format}")
+        )
+        ParquetInteractor.write_dataset(BALL_BY_BALL_DATASET_PATH, batches, BALL_BY_BALL_SCHEMA, BALL_BY_BALL_PARTITIONS)
+        self.ball_by_ball = None
+
+    def write_match_indexes(self) -> None:
+        """
+        Builds and saves the MatchIndex of the t20, od and mdm ball-by-ball feather files.
+        """
+        for match_format in MATCH_FORMATS:
+            MatchIndex.build(f"{BALL_BY_BALL_FILE_PATH}{match_format}").save(f"{BALL_BY_BALL_INDEX_FILE_PATH}{match_format}")
+        self.match_indexes = dict()
 
-        t20_counter  = 0
-        mdm_counter  = 0
-        od_counter  = 0
+    def write_player_summaries(self) -> None:
+        """
+        Builds the PlayerSummaries tables from the t20, od and mdm ball-by-ball feather files,
+        reading only the columns they need from one file at a time.
+        """
+        PlayerSummaries().build(
+            FeatherInteractor.get_feather(f"{BALL_BY_BALL_FILE_PATH}{match_format}", SUMMARY_COLUMNS)
+            for match_format in MATCH_FORMATS
+        )
+
+    def _ball_by_ball_is_current(self) -> bool:
+        """
+        Checks whether the existing ball-by-ball files and manifest can be updated incrementally.\n
+
+        :return: True if the manifest and player keys exist and every format file exists with the current schema,
+            so switching BALL_BY_BALL_LEAN rebuilds the files.
+        """
+        if not os.path.exists(f"{BALL_BY_BALL_MANIFEST_FILE_PATH}.json") or not os.path.exists(f"{PLAYER_KEYS_FILE_PATH}.json"):
+            return False
+        for match_format in MATCH_FORMATS:
+            schema = FeatherInteractor.get_schema(f"{BALL_BY_BALL_FILE_PATH}{match_format}")
+            if schema is None or not schema.equals(BALL_BY_BALL_SCHEMA):
+                return False
+        return True
+
+    def _update_ball_by_ball(
+        self,
+        source: MatchSource,
+        manifest: IngestManifest,
+        changed: list,
+        removed: list,
+        workers: int,
+        decoder: str
+    ) -> None:
+        """
+        Applies new, changed and removed match files to the existing ball-by-ball files.\n
+        The balls of changed files are written to temporary files, then each affected format file is rewritten
+        without the balls of changed or removed matches and with the new balls added, keeping matches in date order.
+        If the PlayerSummaries tables exist, the dropped and new balls are also taken away from and added to them.\n
+
+        :param source: The MatchSource holding the match files.\n
+        :param manifest: The manifest of the existing files, updated in place.\n
+        :param changed: Members of the source that are new or have changed.\n
+        :param removed: Names of match files that have been removed.\n
+        :param workers: The number of worker processes to use.\n
+        :param decoder: The MatchDecoder backend used to read the match files.
+        """
+        drop_ids = {match_format: set() for match_format in MATCH_FORMATS}
+        for name in removed + [source.get_name(member) for member in changed]:
+            entry = manifest.entries.get(name)
+            if entry is not None and entry["format"] is not None:
+                drop_ids[entry["format"]].add(entry["match_id"])
+
+        for name in removed:
+            manifest.remove(name)
+
+        writers = self._write_ball_by_ball(source, changed, workers, manifest, ".new", decoder)
+
+        summaries = PlayerSummaries()
+        summarise = summaries.exists()
+        removed_balls, added_balls = [], []
+        for match_format, writer in writers.items():
+            if writer.rows_written > 0 or len(drop_ids[match_format]) > 0:
+                if summarise:
+                    # The dropped balls are read before the file is rewritten, as they were when summarised
+                    match_ids = pa.array(list(drop_ids[match_format]), pa.int64())
+                    removed_balls.append(pa.Table.from_batches([
+                        batch.filter(pc.is_in(batch.column("match_id"), match_ids)).select(SUMMARY_COLUMNS)
+                        for batch in FeatherInteractor.iter_batches(f"{BALL_BY_BALL_FILE_PATH}{match_format}")
+                    ], schema=pa.schema([BALL_SCHEMA.field(name) for name in SUMMARY_COLUMNS])).to_pandas())
+                    added_balls.append(FeatherInteractor.get_feather(writer.location, SUMMARY_COLUMNS))
+                FeatherInteractor.sort_groups(
+                    f"{BALL_BY_BALL_FILE_PATH}{match_format}", "match_id", ["date", "match_id"], BALL_BY_BALL_FLUSH_SIZE,
+                    BALL_BY_BALL_COMPRESSION, drop_ids[match_format], writer.location
+                )
+            os.remove(writer.location)
+
+        if summarise and len(added_balls) > 0:
+            summaries.update(pd.concat(removed_balls, ignore_index=True), pd.concat(added_balls, ignore_index=True))
+
+        print(f"Processed {len(changed)} new or changed match files and removed {len(removed)} match files")
+
+    def _write_ball_by_ball(
+        self,
+        source: MatchSource,
+        members: list,
+        workers: int,
+        manifest: IngestManifest,
+        suffix: str,
+        decoder: str
+    ) -> dict:
+        """
+        Processes match files and streams their balls into one feather file per format, recording each file in the manifest.\n
+
+        :param source: The MatchSource holding the match files.\n
+        :param members: The members of the source to process.\n
+        :param workers: The number of worker processes to use.\n
+        :param manifest: The manifest to record processed files in.\n
+        :param suffix: Appended to the name of each format file, for writing to temporary files.\n
+        :param decoder: The MatchDecoder backend used to read the match files.\n
+
+        :return: A dictionary mapping each format to its closed FeatherBatchWriter.\n
+
+        :raises ValueError: If an unexpected error stops the processing of the matches.
+        """
+        writers = {
+            match_format: FeatherInteractor.open_batch_writer(
+                f"{BALL_BY_BALL_FILE_PATH}{match_format}{suffix}", BALL_BY_BALL_SCHEMA, BALL_BY_BALL_FLUSH_SIZE,
+                BALL_BY_BALL_COMPRESSION
+            )
+            for match_format in MATCH_FORMATS
+        }
 
         try:
-            for game in tqdm(matches, desc="Processing Matches"):
-                try:
-                    curMatch = MatchData(game)
-                    ball_data = curMatch.ball_data
-                    if "t20" in curMatch.ball_data[0]["match_type"]:
-                        for ball in curMatch.ball_data.values():
-                            if not col_check:
-                                columns = curMatch.get_dataframe().columns
-                                col_check = True
-                            
-                            t20_dict[t20_counter] = ball
-                            t20_counter += 1
-                    elif "od" in curMatch.ball_data[0]["match_type"]:
-                        for ball in curMatch.ball_data.values():
-                            if not col_check:
-                                columns = curMatch.get_dataframe().columns
-                                col_check = True
-                            od_dict[od_counter] = ball
-                            od_counter += 1
-                    else:
-                        for ball in curMatch.ball_data.values():
-                            if not col_check:
-                                columns = curMatch.get_dataframe().columns
-                                col_check = True
-                            mdm_dict[mdm_counter] = ball
-                            mdm_counter += 1
-
-
-
-                except Exception as match_error:
-                    print(f"Skipping problematic match file: {game.get('file_name', 'Unknown file')} due to error: {match_error}")
+            results = Setup._iter_match_batches(source, members, workers, decoder)
+            for member, (match_format, batch) in tqdm(zip(members, results), total=len(members), desc="Processing Matches"):
+                if match_format is None:
+                    print(f"Skipping problematic match file: {source.get_name(member)} due to error: {batch}")
+                    manifest.record(source, member, None, None)
+                    continue
+                writers[match_format].add(self.player_keys.intern_batch(batch))
+                manifest.record(source, member, match_format, batch.column("match_id")[0].as_py())
 
         except Exception as e:
             print(f"Unexpected fatal error: {e}")
             raise ValueError() from e
 
-        t20_data = pd.DataFrame.from_dict(t20_dict, orient='index', columns=columns)
-        od_data = pd.DataFrame.from_dict(od_dict, orient='index', columns=columns)
-        mdm_data = pd.DataFrame.from_dict(mdm_dict, orient='index', columns=columns)
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        for writer in writers.values():
+            print(f"Wrote {writer.rows_written} balls to {writer.location}")
 
+        return writers
 
-        print("Created df for each format")
+    @staticmethod
+    def _iter_match_batches(source: MatchSource, members: list, workers: int, decoder: str):
+        """
+        Lazily processes match files into record batches, yielding results in the same order as the members.\n
+        When using worker processes only a bounded number of batches are in flight at once,
+        so finished batches never pile up faster than they are written.
+        Each worker reads its members from the source itself, so only member references are sent to it.\n
 
-        for col in t20_data.select_dtypes(include='number').columns:
-            t20_data[col] = pd.to_numeric(t20_data[col], downcast='integer')
-            od_data[col] = pd.to_numeric(od_data[col], downcast='integer')
-            mdm_data[col] = pd.to_numeric(mdm_data[col], downcast='integer')
+        :param source: The MatchSource holding the match files.\n
+        :param members: The members of the source to process.\n
+        :param workers: The number of worker processes to use.\n
+        :param decoder: The MatchDecoder backend used to read the match files.\n
 
-        print("Downsized df")
+        :return: A generator of (match_format, batch) tuples as returned by process_match.
+        """
+        if workers <= 1:
+            for member in members:
+                yield process_match(source, member, decoder)
+            return
+
+        member_batches = (members[i:i + INGEST_CHUNK_SIZE] for i in range(0, len(members), INGEST_CHUNK_SIZE))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()
+            for member_batch in member_batches:
+                in_flight.append(executor.submit(process_matches, source, member_batch, decoder))
+                if len(in_flight) >= 2 * workers:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+
+    @staticmethod
+    def get_format_key(match_type: str) -> str:
+        """
+        Returns the output format (t20, od or mdm) a match belongs to based on its match type.\n
 
-        t20_data.to_feather(f"{BALL_BY_BALL_FILE_PATH}t20.feather")
-        od_data.to_feather(f"{BALL_BY_BALL_FILE_PATH}od.feather")
-        mdm_data.to_feather(f"{BALL_BY_BALL_FILE_PATH}mdm.feather")
+        :param match_type: The lower case cricsheet match type, such as it20 or odi.\n
 
-        return None
+        :return: The format key used to name the ball-by-ball output files.
+        """
+        if "t20" in match_type:
+            return "t20"
+        elif "od" in match_type:
+            return "od"
+        return "mdm"
 
-    def get_ball_by_ball(self):
+    def get_ball_by_ball(self, filters=None, columns: list = None, memory_map: bool = False) -> pd.DataFrame:
         """
         Returns the ball-by-ball data as a pandas DataFrame.\n
-        If the data is not already loaded, it will be retrieved from the specified file.\n
-        If update is True, the data will be downloaded again from the URL.\n
+        The data is read from the partitioned Parquet dataset, so filters on the partition columns
+        (match_type, gender, team_type and season) skip the files of every other partition,
+        and other filters are applied while the files are read.
+        If there are no filters or columns, the whole dataset is loaded once and kept.\n
+        If memory_map is True the t20, od and mdm feather files are memory-mapped instead, and every column is a
+        zero-copy pandas ArrowDtype column over the files. Loading is near-instant and memory only grows with the
+        columns that are used, but filters are applied after opening and copy the rows they keep.\n
+        Columns in DERIVED_COLUMNS, such as balls_remaining and wickets_remaining, are calculated when asked for by name,
+        and if the files are lean (see BALL_BY_BALL_LEAN) so are the running totals asked for, from every ball of the
+        matches read, see DerivedColumns. Results with calculated columns read from the dataset are kept in a ResultCache.\n
+
+        :param filters: The rows to read. Either a dictionary mapping columns to a value or a list of accepted values,
+            such as {"match_type": ["it20", "t20"], "gender": "male"}, or a list of (column, operator, value) tuples,
+            such as [("event", "==", "indian premier league"), ("over_num", "<", 6)]. If None, every row is read.\n
+        :param columns: The columns to read. If None, every column is read.\n
+        :param memory_map: If True, reads the memory-mapped feather files rather than the Parquet dataset.\n
+
+        :return: A pandas DataFrame containing the ball-by-ball data.\n
+
+        :raises FileNotFoundError: If the dataset is not found.
+        """
+        if memory_map:
+            read_columns = Setup._get_read_columns(columns, filters)
+            table = pa.concat_tables([
+                Setup._add_calculated_columns(
+                    FeatherInteractor.open_table(f"{BALL_BY_BALL_FILE_PATH}{match_format}", read_columns), columns
+                )
+                for match_format in MATCH_FORMATS
+            ])
+            if filters is not None:
+                table = table.filter(ParquetInteractor.to_expression(filters))
+            return Setup._select_columns(table, columns).to_pandas(types_mapper=pd.ArrowDtype)
+
+        if filters is not None or columns is not None:
+            return self._get_dataset(filters, columns)
+        if self.ball_by_ball is None:
+            self.ball_by_ball = self._get_dataset()
+        return self.ball_by_ball
+
+    def _get_dataset(self, filters=None, columns: list = None) -> pd.DataFrame:
+        """
+        Reads the ball-by-ball Parquet dataset, calculating the derived columns asked for,
+        and the running totals asked for if the dataset is lean.\n
 
-        :param update: If True, updates the ball-by-ball data file from the specified URL.\n
+        :param filters: The rows to read, see get_ball_by_ball.\n
+        :param columns: The columns to read. If None, every column is read.\n
 
-        :return: A pandas DataFrame containing the ball-by-ball role data.\n
+        :return: A pandas DataFrame of the balls, with the columns in BALL_SCHEMA order.
+        """
+        if len(Setup._get_calculated_columns(columns)) == 0:
+            return ParquetInteractor.get_dataset(
+                BALL_BY_BALL_DATASET_PATH, BALL_BY_BALL_SCHEMA, BALL_BY_BALL_PARTITIONS, filters, columns
+            )
+
+        def calculate() -> pd.DataFrame:
+            read_filter = None
+            if filters is not None:
+                # Calculated columns need every ball of an innings, so every ball of the matches the filters select is read
+                # from the partitions they select, and the filters are applied afterwards
+                match_ids = ParquetInteractor.get_dataset(
+                    BALL_BY_BALL_DATASET_PATH, BALL_BY_BALL_SCHEMA, BALL_BY_BALL_PARTITIONS, filters, ["match_id"]
+                )["match_id"].unique()
+                read_filter = pc.field("match_id").isin(pa.array(match_ids, pa.int64()))
+                partition_filter = ParquetInteractor.to_expression(
+                    ParquetInteractor.get_partition_filters(filters, BALL_BY_BALL_PARTITIONS)
+                )
+                if partition_filter is not None:
+                    read_filter = read_filter & partition_filter
+
+            ball_by_ball = ParquetInteractor.get_dataset(
+                BALL_BY_BALL_DATASET_PATH, BALL_BY_BALL_SCHEMA, BALL_BY_BALL_PARTITIONS, read_filter,
+                Setup._get_read_columns(columns, filters)
+            )
+            table = Setup._add_calculated_columns(pa.Table.from_pandas(ball_by_ball, preserve_index=False), columns)
+            if filters is not None:
+                table = table.filter(ParquetInteractor.to_expression(filters))
+            return Setup._select_columns(table, columns).to_pandas()
+
+        return self.get_result_cache(filters, columns).get_or_compute("DerivedColumns", {}, calculate)
+
+    @staticmethod
+    def _get_calculated_columns(columns: list = None) -> list:
+        """
+        :param columns: The columns asked for. If None, every column is asked for.
+        :return: The columns asked for that are not stored in the ball-by-ball files, which are the running totals
+            if the files are lean and any DERIVED_COLUMNS asked for by name.
+        """
+        cumulative_columns = CumulativeColumns.get_requested(columns) if BALL_BY_BALL_LEAN else []
+        return cumulative_columns + DerivedColumns.get_requested(columns)
+
+    @staticmethod
+    def _get_dependencies(columns: list = None) -> list:
+        """
+        :param columns: The columns asked for. If None, every column is asked for.
+        :return: The stored columns the calculated columns asked for are calculated from.
+        """
+        dependencies = DerivedColumns.get_dependencies(DerivedColumns.get_requested(columns))
+        stored = [column for column in dependencies if column in BALL_BY_BALL_SCHEMA.names]
+        cumulative_columns = CumulativeColumns.get_requested(columns) + CumulativeColumns.get_requested(dependencies)
+        if BALL_BY_BALL_LEAN and len(cumulative_columns) > 0:
+            stored += CUMULATIVE_BASE_COLUMNS
+        return list(dict.fromkeys(stored))
+
+    @staticmethod
+    def _get_read_columns(columns: list = None, filters=None) -> list | None:
+        """
+        Finds the columns to read from the ball-by-ball files to return columns.\n
+
+        :param columns: The columns asked for. If None, every column is asked for.\n
+        :param filters: The filters applied after reading, whose columns are also read.\n
+
+        :return: The columns to read, or None to read every column.
+        """
+        if columns is None:
+            return None
+        filter_columns = ParquetInteractor.get_filter_columns(filters)
+        if filter_columns is None:
+            return None
+        stored = [column for column in columns + filter_columns if column in BALL_BY_BALL_SCHEMA.names]
+        return list(dict.fromkeys(stored + Setup._get_dependencies(columns)))
+
+    @staticmethod
+    def _add_calculated_columns(table: pa.Table, columns: list = None) -> pa.Table:
+        """
+        Adds the calculated columns asked for (see _get_calculated_columns) to a table of every ball of its matches.\n
+
+        :param table: The balls, holding the columns they are calculated from (see _get_dependencies).\n
+        :param columns: The columns asked for. If None, every column is asked for.\n
+
+        :return: The table with the calculated columns added.
+        """
+        calculated_columns = Setup._get_calculated_columns(columns)
+        if len(calculated_columns) == 0:
+            return table
+        dependencies = [column for column in Setup._get_dependencies(columns) if column in table.column_names]
+        derived_columns = DerivedColumns(table.select(dependencies).to_pandas())
+        for column in calculated_columns:
+            if column in DERIVED_COLUMNS:
+                field = pa.field(column, DERIVED_COLUMNS[column][0])
+            else:
+                field = BALL_SCHEMA.field(column)
+            table = table.append_column(field, pa.array(derived_columns.get(column), field.type))
+        return table
+
+    @staticmethod
+    def _select_columns(table: pa.Table, columns: list = None) -> pa.Table:
+        """
+        :param table: A table of balls.
+        :param columns: The columns asked for. If None, every column is asked for.
+        :return: The table holding only the columns asked for, in BALL_SCHEMA order if every column is asked for.
+        """
+        if columns is None:
+            return table.select([name for name in BALL_SCHEMA.names if name in table.column_names])
+        return table.select(columns)
+
+    def get_match_index(self, match_format: str) -> MatchIndex:
+        """
+        Returns the MatchIndex of a ball-by-ball feather file.\n
+        If the index is not already loaded, it will be retrieved from the specified file.\n
+
+        :param match_format: The format of the file, one of MATCH_FORMATS.\n
+
+        :return: The MatchIndex of the file.\n
 
         :raises FileNotFoundError: If the file is not found.
         """
-        if self.ball_by_ball is None:
-            self.ball_by_ball = pd.read_feather(f"{BALL_BY_BALL_FILE_PATH}.feather")
-        return self.ball_by_ball
+        if match_format not in self.match_indexes:
+            self.match_indexes[match_format] = MatchIndex.load(f"{BALL_BY_BALL_INDEX_FILE_PATH}{match_format}")
+        return self.match_indexes[match_format]
+
+    def get_match_balls(self, match_id: int, columns: list = None) -> pd.DataFrame:
+        """
+        Returns the balls of a single match, read as one slice of the memory-mapped feather file holding it.\n
 
-        
+        :param match_id: The ID of the match.\n
+        :param columns: The columns to read. If None, every column is read.\n
 
+        :return: A pandas DataFrame of the match's balls in order, empty if the match is not found.\n
+
+        :raises FileNotFoundError: If the files or their indexes are not found.
+        """
+        for match_format in MATCH_FORMATS:
+            rows = self.get_match_index(match_format).get_match_rows(match_id)
+            if rows is not None:
+                return self._get_ball_rows(match_format, rows, columns)
+        return self._get_ball_rows(MATCH_FORMATS[0], (0, 0), columns)
+
+    def get_balls_between(self, start_date=None, end_date=None, match_formats: list = None, columns: list = None) -> pd.DataFrame:
+        """
+        Returns the balls of every match played between two dates, inclusive,
+        read as one slice of each memory-mapped feather file.\n
+
+        :param start_date: The first date, as a datetime.date or an ISO date string. If None, starts from the first match.\n
+        :param end_date: The last date, as a datetime.date or an ISO date string. If None, runs to the last match.\n
+        :param match_formats: The formats to read, from MATCH_FORMATS. If None, every format is read.\n
+        :param columns: The columns to read. If None, every column is read.\n
+
+        :return: A pandas DataFrame of the balls, with each format's matches ordered by date then match ID.\n
+
+        :raises FileNotFoundError: If the files or their indexes are not found.
+        """
+        if match_formats is None:
+            match_formats = MATCH_FORMATS
+        return pd.concat([
+            self._get_ball_rows(match_format, self.get_match_index(match_format).get_date_rows(start_date, end_date), columns)
+            for match_format in match_formats
+        ], ignore_index=True)
+
+    @staticmethod
+    def _get_ball_rows(match_format: str, rows: tuple, columns: list = None) -> pd.DataFrame:
+        """
+        Reads a range of rows of a ball-by-ball feather file through a memory map.\n
+
+        :param match_format: The format of the file, one of MATCH_FORMATS.\n
+        :param rows: A tuple of the first row and one past the last row.\n
+        :param columns: The columns to read. If None, every column is read.\n
+
+        :return: A pandas DataFrame of the rows.
+        """
+        table = FeatherInteractor.open_table(f"{BALL_BY_BALL_FILE_PATH}{match_format}", Setup._get_read_columns(columns))
+        table = Setup._add_calculated_columns(table.slice(rows[0], rows[1] - rows[0]), columns)
+        return Setup._select_columns(table, columns).to_pandas()
+
+    def get_result_cache(self, filters=None, columns: list = None, memory_map: bool = False) -> ResultCache:
+        """
+        Returns a ResultCache for analytics of the ball-by-ball data read by get_ball_by_ball with the same arguments.\n
+        Results are fingerprinted by the files such a read would open, so re-ingesting the data,
+        or adding a partition the filters select, stops older results from being returned.\n
+
+        :param filters: The filters the data was read with, see get_ball_by_ball.\n
+        :param columns: The columns the data was read with, see get_ball_by_ball.\n
+        :param memory_map: Whether the data was read from the memory-mapped feather files, see get_ball_by_ball.\n
+
+        :return: A ResultCache for the data.
+        """
+        if memory_map:
+            paths = [f"{BALL_BY_BALL_FILE_PATH}{match_format}.feather" for match_format in MATCH_FORMATS]
+        else:
+            paths = ParquetInteractor.get_dataset_files(BALL_BY_BALL_DATASET_PATH, BALL_BY_BALL_PARTITIONS, filters)
+        return ResultCache(paths, {"filters": filters, "columns": columns, "memory_map": memory_map})
+
+    def get_ladders(self, filters=None) -> pd.DataFrame:
+        """
+        Returns the ladder of every event and season in the ball-by-ball dataset, see Ladder.build.\n
+        Ladders are kept in one Parquet file at LADDERS_FILE_PATH, alongside a fingerprint of the dataset partition
+        each was built from, so after an ingest only the partitions whose files changed are read again,
+        and those are built together in one pass.\n
+
+        :param filters: The ladders to return, on any of LADDER_KEYS, in any form accepted by ParquetInteractor.to_expression,
+            such as {"event": "indian premier league"}. If None, every ladder is returned.\n
+
+        :return: A DataFrame with one row per team in each ladder.\n
+
+        :raises FileNotFoundError: If the dataset is not found.
+        """
+        if not os.path.isdir(BALL_BY_BALL_DATASET_PATH):
+            raise FileNotFoundError(f"The dataset '{BALL_BY_BALL_DATASET_PATH}' was not found.")
+
+        partitions = ParquetInteractor.get_dataset_partitions(BALL_BY_BALL_DATASET_PATH, BALL_BY_BALL_PARTITIONS)
+        fingerprints = [ResultCache(partition["files"]).fingerprint() for partition in partitions]
+        try:
+            stored = ParquetInteractor.get_parquet(LADDERS_FILE_PATH)
+        except (FileNotFoundError, pa.ArrowException):
+            stored = None
+
+        stored_fingerprints = set() if stored is None else set(stored["fingerprint"])
+        stale = [index for index, fingerprint in enumerate(fingerprints) if fingerprint not in stored_fingerprints]
+        if stored is None or len(stale) > 0 or not stored_fingerprints.issubset(fingerprints):
+            # Ladders of partitions that were changed or removed are dropped, and changed partitions are built again
+            ladders = [] if stored is None else [stored[stored["fingerprint"].isin(fingerprints)]]
+            if len(stale) > 0:
+                ladders.append(self._build_ladders([partitions[index] for index in stale], [fingerprints[index] for index in stale]))
+            stored = Ladder.rank(pd.concat(ladders, ignore_index=True)) if len(ladders) > 0 else self._build_ladders([], [])
+            ParquetInteractor.save_parquet(stored, LADDERS_FILE_PATH)
+
+        ladders = stored
+        if filters is not None:
+            ladders = pa.Table.from_pandas(ladders).filter(ParquetInteractor.to_expression(filters)).to_pandas()
+        return ladders.drop(columns="fingerprint").reset_index(drop=True)
+
+    @staticmethod
+    def _build_ladders(partitions: list, fingerprints: list) -> pd.DataFrame:
+        """
+        Builds the ladders of partitions of the ball-by-ball dataset in one pass.\n
+
+        :param partitions: The partitions, as listed by ParquetInteractor.get_dataset_partitions.\n
+        :param fingerprints: The fingerprint of each partition's files.\n
+
+        :return: The ladders, with a fingerprint column holding the fingerprint of the partition each was built from.
+        """
+        if len(partitions) == 0:
+            return Ladder(pd.DataFrame(columns=LADDER_COLUMNS)).build().assign(fingerprint=pd.Series(dtype=object))
+
+        partition_filter = partitions[0]["filter"]
+        for partition in partitions[1:]:
+            partition_filter = partition_filter | partition["filter"]
+        ladders = Ladder(ParquetInteractor.get_dataset(
+            BALL_BY_BALL_DATASET_PATH, BALL_BY_BALL_SCHEMA, BALL_BY_BALL_PARTITIONS, partition_filter, LADDER_COLUMNS
+        )).build()
+
+        # Every ladder's matches are in a single partition, found by its partition columns
+        labels = pd.Series("", index=ladders.index)
+        for name in BALL_BY_BALL_PARTITIONS:
+            labels = labels + "|" + ladders[name].astype(object).fillna("").astype(str)
+        partition_labels = {
+            "".join(f"|{partition['keys'].get(name) or ''}" for name in BALL_BY_BALL_PARTITIONS): fingerprint
+            for partition, fingerprint in zip(partitions, fingerprints)
+        }
+        ladders["fingerprint"] = labels.map(partition_labels)
+        return ladders
 
 if __name__ == "__main__":
     Setup().json_to_ball_by_ball_method(False)
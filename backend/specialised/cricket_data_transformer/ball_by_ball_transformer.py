@@ -1,178 +1,205 @@
 import pandas as pd
 from src.setup import Setup
+from src.result_cache import ResultCache
+from .state_statistics import StateStatistics
+from .markov_solver import MarkovSolver
+from .win_probability import WinProbability
+from .match.scorecard import Scorecard
+from .derived_columns import DerivedColumns
+import numpy as np
+
+# Change to the (runs, balls, wickets) of a state caused by each outcome. Balls count down, so they are taken away
+OUTCOMES = {
+    "0": (0, 1, 0),
+    "1": (1, 1, 0),
+    "2": (2, 1, 0),
+    "3": (3, 1, 0),
+    "4": (4, 1, 0),
+    "5": (5, 1, 0),
+    "6": (6, 1, 0),
+    "1-extra": (1, 0, 0),
+    "2-extra": (2, 0, 0),
+    "3-extra": (3, 0, 0),
+    "4-extra": (4, 0, 0),
+    "5-extra": (5, 0, 0),
+    "6-extra": (6, 0, 0),
+    "wicket": (0, 1, 1)
+}
+
 
 class BallByBallTransformer:
-    def __init__(self, ball_by_ball_data: pd.DataFrame):
+    def __init__(self, ball_by_ball_data: pd.DataFrame, cache: ResultCache = None):
+        # Results are kept in the cache between sessions if given, see Setup.get_result_cache
         self._ball_data: pd.DataFrame = ball_by_ball_data
-    
-    def get_expected_runs_df(self):
-        expected_runs = dict()
-        # Expected Runs structure
-        # Key 1: Current Score
-        # Key 2: Balls Left
-        # Key 3: Wickets Left
-        # Value Array holding runs scored after this point (final_score - total_runs)
-
-        for row in self._ball_data.itertuples():
-            current_score = row.current_score
-            balls_left = row.balls_remaining
-            wickets_left = row.wickets_remaining
-            total_score = row.total_score
-
-            if current_score not in expected_runs.keys():
-                expected_runs[current_score] = dict()
-            curPosition = expected_runs[current_score]
+        self._cache = cache
+        # Derived columns (such as balls_remaining) missing from the data are calculated once, when first used
+        self._derived_columns = DerivedColumns(ball_by_ball_data)
+
+    def _cached(self, method: str, params: dict, compute):
+        """
+        Returns the result of a method from the cache, computing and storing it if it is not there.
+        :param method: The name of the method.
+        :param params: The parameters of the method.
+        :param compute: A function taking no arguments that computes the result.
+        :return: The result of the method.
+        """
+        if self._cache is None:
+            return compute()
+        return self._cache.get_or_compute(f"BallByBallTransformer.{method}", params, compute)
 
-            if balls_left not in curPosition.keys():
-                curPosition[balls_left] = dict()
-            curPosition = curPosition[balls_left]
-
-            if wickets_left not in curPosition.keys():
-                curPosition[wickets_left] = []
-            curPosition = curPosition[wickets_left]
-
-            curPosition.append(total_score)
-
-        df_rows = []
+    def get_expected_runs_df(self):
+        return self._cached("get_expected_runs_df", {}, self._calc_expected_runs_df)
 
-        for key_one in expected_runs.keys():
-            for key_two in expected_runs[key_one].keys():
-                for key_three in expected_runs[key_one][key_two].keys():
-                    diff_vals = expected_runs[key_one][key_two][key_three]
-                    avg_diff = sum(diff_vals) / len(diff_vals)
-                    row_data = [key_one, key_two, key_three, avg_diff, len(diff_vals)]
-                    df_rows.append(row_data)
+    def _calc_expected_runs_df(self):
+        # Expected Runs structure
+        # One row per (current score, balls left, wickets left) state, ordered by first appearance of the
+        # current score, then of the balls left for that score, then of the wickets left for both
+        # Expected total is the average final score (total_score) from this state
+        ball_data = self._derived_columns.add(["current_score", "balls_remaining", "wickets_remaining", "total_score"])
+        expected_runs = StateStatistics(ball_data).calculate(
+            ["current_score", "balls_remaining", "wickets_remaining"], "total_score"
+        ).rename(columns={
+            "balls_remaining": "balls_left",
+            "wickets_remaining": "wickets_left",
+            "mean": "expected_total",
+            "count": "observations"
+        })
 
         cols = ["current_score", "balls_left", "wickets_left", "expected_total", "observations"]
-        return pd.DataFrame(df_rows, columns=cols)
+        expected_runs = expected_runs[cols]
+        # States are stored as int64, as they were when built one row at a time
+        return expected_runs.astype({col: "int64" for col in cols[:3] if pd.api.types.is_integer_dtype(expected_runs[col])})
     
+    def get_markov_solver(self, max_balls: int = 120):
+        # Expected remaining runs of every (balls left, wickets left) state, including unobserved ones,
+        # solved from the outcome probabilities of each state rather than averaged
+        return MarkovSolver(self._ball_data, max_balls).solve()
+
+    def get_win_probability(self, max_balls: int = 120):
+        # Chance of the chasing team winning from every (runs required, balls left, wickets left) state
+        return WinProbability(self._ball_data, max_balls).build()
+
+    def get_scorecard(self):
+        # Batting and bowling cards of every innings in the data, built in one pass, see Scorecard.get_match
+        return Scorecard(self._ball_data).build()
+
+    def aggregate(self, group_keys: list, aggregates: dict, per: list = None, per_aggregates: dict = None):
+        """
+        Aggregates the ball-by-ball data by any group keys in one vectorized pass, see StateStatistics.aggregate.
+        When per is given the balls are first aggregated into one row per group and unit (such as per innings),
+        then those rows are aggregated by the group keys, e.g. the average powerplay score per innings for each event.
+        :param group_keys: The columns to group by, such as ["event", "season"]. Columns in DERIVED_COLUMNS, such as phase,
+        are calculated if they are missing from the data.
+        :param aggregates: A dictionary mapping output column names to a tuple of a column and an aggregate,
+        such as {"avg_score": ("total_score", "mean"), "median_score": ("total_score", "quantile", 0.5)}.
+        When per is given the columns are those made by per_aggregates.
+        :param per: The columns identifying each unit aggregated first, such as ["match_id", "inn_num"]. If None, balls are aggregated directly.
+        :param per_aggregates: The aggregates calculated for each unit, in the same form as aggregates.
+        :return: A tidy DataFrame with one row per group, sorted by the group keys, holding the group keys and a column for each aggregate.
+        """
+        params = {"group_keys": group_keys, "aggregates": aggregates, "per": per, "per_aggregates": per_aggregates}
+        return self._cached("aggregate", params, lambda: self._aggregate(group_keys, aggregates, per, per_aggregates))
+
+    def _aggregate(self, group_keys: list, aggregates: dict, per: list = None, per_aggregates: dict = None):
+        aggregated = (per_aggregates if per is not None else aggregates).values()
+        ball_data = self._derived_columns.add(group_keys + (per or []) + [aggregate[0] for aggregate in aggregated])
+        if per is not None:
+            ball_data = StateStatistics(ball_data).aggregate(group_keys + per, per_aggregates)
+        return StateStatistics(ball_data).aggregate(group_keys, aggregates)
+
     def calc_avg_score(self, keys: list):
-        scores = dict()
-
-        for ball in self._ball_data.itertuples():
-            curPos = scores
-            for keyidx, key in enumerate(keys):
-                if key not in curPos.keys() and keyidx != len(keys) - 1:
-                    curPos[key] = dict()
-                elif key not in curPos.keys():
-                    curPos[key] = []
-                curPos = curPos[key]
-            curPos.append(ball.total_score)
-
-    def calc_avg_powerplay_score(self, keys:list):
-        scores = dict()
-        matches = dict()
-        for ball in self._ball_data.itertuples()
-
-        for ball in self._ball_data.itertuples():
-            curPos = scores
-            for keyidx, key in enumerate(keys):
-                if key not in curPos.keys() and keyidx != len(keys) - 1:
-                    curPos[key] = dict()
-                elif key not in curPos.keys():
-                    curPos[key] = []
-                curPos = curPos[key]
-            curPos.append(ball.total_score)
+        # Each innings counts once, however many balls it lasted
+        return self.aggregate(
+            keys,
+            {"avg_score": ("total_score", "mean"), "innings": ("total_score", "count")},
+            per=["match_id", "inn_num"],
+            per_aggregates={"total_score": ("total_score", "first")}
+        )
+
+    def calc_avg_powerplay_score(self, keys: list):
+        return self._cached("calc_avg_powerplay_score", {"keys": keys}, lambda: self._calc_avg_powerplay_score(keys))
+
+    def _calc_avg_powerplay_score(self, keys: list):
+        # Runs scored during the powerplay of each innings, from innings that had a powerplay
+        powerplay_balls = BallByBallTransformer(self._ball_data[self._ball_data["powerplay"]])
+        return powerplay_balls.aggregate(
+            keys,
+            {"avg_powerplay_score": ("powerplay_score", "mean"), "innings": ("powerplay_score", "count")},
+            per=["match_id", "inn_num"],
+            per_aggregates={"powerplay_score": ("ball_runs", "sum")}
+        )
 
-    
     def calc_avg_impact(self, expected_run_data: pd.DataFrame):
+        return self._cached(
+            "calc_avg_impact", {"expected_run_data": expected_run_data}, lambda: self._calc_avg_impact(expected_run_data)
+        )
+
+    def _calc_avg_impact(self, expected_run_data: pd.DataFrame):
         # Disregard byes and leg byes
-        outcomes = ["0", "1", "2", "3", "4", "5", "6", "1-extra", "2-extra", "3-extra", "4-extra", "5-extra", "6-extra", "wicket"]
+        # Every state looks up the state each outcome leads to in a dense index, all at once
+        states = expected_run_data[["current_score", "balls_left", "wickets_left"]].to_numpy(dtype=np.int64)
+        expected_totals = expected_run_data["expected_total"].to_numpy(dtype=np.float64)
+        deltas = np.array(list(OUTCOMES.values()), dtype=np.int64) * np.array([1, -1, -1])
 
-        outcome_store = dict()
-        for val in outcomes:
-            outcome_store[val] = []
-        
-        for row in expected_run_data.itertuples():
-            cur_runs = row.current_score
-            balls_left = row.balls_left
-            wickets_left = row.wickets_left
-            expected_added_runs = row.expected_total
-
-            for outcome in outcomes:
-                added_runs, added_balls, added_wickets = self._match_outcome_to_case(outcome)
-                new_data = expected_run_data.loc[
-                                (expected_run_data["balls_left"] == (balls_left - added_balls)) & 
-                                (expected_run_data["current_score"] == (cur_runs + added_runs)) & 
-                                (expected_run_data["wickets_left"] == (wickets_left - added_wickets))
-                            ]
-
-                if (len(new_data) == 1):
-                    new_row = new_data.iloc[0]
-                    outcome_store[outcome].append(new_row.expected_total - expected_added_runs)
+        successor_rows = np.full((len(states), len(OUTCOMES)), -1, dtype=np.int64)
+        if len(states) > 0:
+            index, lowest = self._index_states(states)
+            offsets = states[:, None, :] + deltas[None, :, :] - lowest
+            in_range = ((offsets >= 0) & (offsets < index.shape)).all(axis=2)
+            successor_rows[in_range] = index[tuple(offsets[in_range].T)]
+
+        found = successor_rows >= 0
+        impacts = expected_totals[successor_rows] - expected_totals[:, None]
 
         summary = []
         cols = ["outcome", "average_impact", "observations"]
-        for key in outcome_store.keys():
-            avg_val = sum(outcome_store[key]) / len(outcome_store[key])
-            row = [key, avg_val, len(outcome_store[key])]
+        for i, outcome in enumerate(OUTCOMES.keys()):
+            outcome_impacts = impacts[found[:, i], i]
+            # Summed in state order, the same order the impacts used to be appended in
+            avg_val = np.cumsum(outcome_impacts)[-1] / len(outcome_impacts) if len(outcome_impacts) > 0 else np.nan
+            row = [outcome, avg_val, len(outcome_impacts)]
 
             summary.append(row)
         
         return pd.DataFrame(summary, columns=cols)
+
+    @staticmethod
+    def _index_states(states: np.ndarray):
+        """
+        Indexes (current score, balls left, wickets left) states in a dense array covering every state
+        between the lowest and highest values seen.
+        :param states: A (states, 3) array of integer states.
+        :return: A tuple of the index, holding the row of each state (-1 if it is missing and -2 if it appears
+        more than once), and the lowest value of each part of the state, which is position 0 of the index.
+        """
+        lowest = states.min(axis=0)
+        positions = tuple((states - lowest).T)
+        shape = tuple(states.max(axis=0) - lowest + 1)
+
+        counts = np.zeros(shape, dtype=np.int64)
+        np.add.at(counts, positions, 1)
+        index = np.full(shape, -1, dtype=np.int64)
+        index[positions] = np.arange(len(states))
+        index[counts > 1] = -2
+        return index, lowest
                          
     
     def _match_outcome_to_case(self, outcome):
-        added_runs = 0
-        added_wickets = 0
-        added_balls = 1
-        match outcome:
-            case "0":
-                pass
-            case "1":
-                added_runs = 1
-            case "2":
-                added_runs = 2
-            case "3":
-                added_runs = 3
-            case "4":
-                added_runs = 4
-            case "5":
-                added_runs = 5
-            case "6":
-                added_runs = 6
-            case "1-extra":
-                added_runs = 1
-                added_balls = 0
-            case "2-extra":
-                added_runs = 2
-                added_balls = 0
-            case "3-extra":
-                added_runs = 3
-                added_balls = 0
-            case "4-extra":
-                added_runs = 4
-                added_balls = 0
-            case "5-extra":
-                added_runs = 5
-                added_balls = 0
-            case "6-extra":
-                added_runs = 6
-                added_balls = 0
-            case "wicket":
-                added_wickets = 1
-        return (added_runs, added_balls, added_wickets)
-
-            
-                
+        return OUTCOMES[outcome]
 
     
 if __name__ == "__main__":
-    # Get the ball-by-ball data
-    ball_data = Setup().get_ball_by_ball()
+    # Get the ball-by-ball data, with the derived balls_remaining and wickets_remaining columns
+    ball_data = Setup().get_ball_by_ball(filters=[
+        ("match_type", "in", ["it20", "t20"]),
+        ("gender", "==", "male"),
+        ("team_type", "==", "club"),
+        #("inn_num", "==", 1),
+        ("over_num", "<", 6)
+    ], columns=["match_id", "inn_num", "event", "current_score", "balls_remaining", "wickets_remaining", "total_score"])
     ball_data = ball_data[(ball_data["balls_remaining"] >= 0)]
     ball_data = ball_data[(ball_data["wickets_remaining"] >= 0)]
 
-
-    ball_data = ball_data[(ball_data["match_type"].isin(["it20", "t20"]))]
-
-    ball_data = ball_data[(ball_data["gender"] == "male")]
-
-    ball_data = ball_data[(ball_data["team_type"] == "club")]
-
-    #ball_data = ball_data[(ball_data["inn_num"] == 1)]
-    ball_data = ball_data[(ball_data["over_num"] < 6)]
-
     # Keep only T20 and T20I matches
     bbl_ball_data = ball_data[(ball_data["event"] == "big bash league")]
     ipl_ball_data = ball_data[(ball_data["event"] == "indian premier league")]
@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+from .state_statistics import StateStatistics
+from .match.ball_schema import BALL_SCHEMA, BAT_STAT_KEYS, BOWL_STAT_KEYS
+from .match.innings_processor import ball_dict
+
+
+def _faced(balls: pd.DataFrame) -> np.ndarray:
+    # Deliveries faced by the batter are everything except wides
+    return balls["wides"].to_numpy() == 0
+
+
+def _faced_runs(balls: pd.DataFrame) -> np.ndarray:
+    return np.where(_faced(balls), balls["bat_runs"].to_numpy(), 0)
+
+
+def _powerplay_split(column: str, powerplay: bool):
+    return lambda balls: np.where(balls["powerplay"].to_numpy() == powerplay, balls[column].to_numpy(), 0)
+
+
+def _run_count(runs: int):
+    return lambda balls: _faced(balls) & (balls["bat_runs"].to_numpy() == runs)
+
+
+# Amount each ball adds to the batter's and bowler's running totals, matching the InningsProcessor
+BAT_INCREMENTS = {
+    "balls": _faced,
+    "runs": _faced_runs,
+}
+BOWL_INCREMENTS = {
+    "legal_balls": lambda balls: _faced(balls) & (balls["noballs"].to_numpy() == 0),
+    "illegal_balls": lambda balls: (balls["wides"].to_numpy() > 0) | (balls["noballs"].to_numpy() > 0),
+    "total_balls": lambda balls: np.ones(len(balls), dtype=bool),
+    "bat_runs": _faced_runs,
+    "wides": lambda balls: balls["wides"].to_numpy(),
+    "noballs": lambda balls: np.where(_faced(balls), balls["noballs"].to_numpy(), 0),
+}
+for _runs, _key in ball_dict.items():
+    BAT_INCREMENTS[_key] = _run_count(_runs)
+    BOWL_INCREMENTS[_key] = _run_count(_runs)
+
+# Every running total column, mapped to who it is kept for and the amount each ball adds to it.
+# Totals are kept for the innings, or for the batter, non-striker or bowler within the innings,
+# and innings_total columns hold the sum over the whole innings on every ball
+CUMULATIVE_COLUMNS = {
+    "current_score": ("innings", lambda balls: balls["ball_runs"].to_numpy()),
+    "wickets_lost": ("innings", lambda balls: balls["dismissal"].to_numpy()),
+    "powerplay_wickets": ("innings", _powerplay_split("dismissal", True)),
+    "non_powerplay_wickets": ("innings", _powerplay_split("dismissal", False)),
+    "bat_powerplay_runs": ("innings", _powerplay_split("bat_runs", True)),
+    "bat_non_powerplay_runs": ("innings", _powerplay_split("bat_runs", False)),
+    "total_wides": ("innings", lambda balls: balls["wides"].to_numpy()),
+    "total_noballs": ("innings", lambda balls: balls["noballs"].to_numpy()),
+    "total_penalties": ("innings", lambda balls: balls["penalties"].to_numpy()),
+    "total_legbyes": ("innings", lambda balls: balls["legbyes"].to_numpy()),
+    "total_byes": ("innings", lambda balls: balls["byes"].to_numpy()),
+    "total_score": ("innings_total", lambda balls: balls["ball_runs"].to_numpy()),
+}
+CUMULATIVE_COLUMNS.update({f"bowler_{key}": ("bowler", BOWL_INCREMENTS[key]) for key in BOWL_STAT_KEYS})
+CUMULATIVE_COLUMNS.update({f"batter_{key}": ("batter", BAT_INCREMENTS[key]) for key in BAT_STAT_KEYS})
+CUMULATIVE_COLUMNS.update({f"non_striker_{key}": ("non_striker", BAT_INCREMENTS[key]) for key in BAT_STAT_KEYS})
+
+# Ball-by-ball columns needed to calculate any of the CUMULATIVE_COLUMNS
+CUMULATIVE_BASE_COLUMNS = [
+    "match_id", "inn_num", "batter_id", "non_striker_id", "bowler_id", "dismissal", "bat_runs", "ball_runs",
+    "wides", "noballs", "byes", "legbyes", "penalties", "powerplay"
+]
+
+
+class CumulativeColumns:
+    """
+    Class to calculate the running totals of the ball-by-ball data from the per-ball events,
+    for ball-by-ball files written without them (see BALL_BY_BALL_LEAN).
+    Each column in CUMULATIVE_COLUMNS is a cumulative sum of a per-ball amount within a group of balls,
+    so the columns asked for are calculated for every innings at once with one sort and one cumulative sum per group.
+
+    Author: Jonathan Farrand
+    Date: 2026-10-18
+    """
+    def __init__(self, ball_by_ball_data: pd.DataFrame):
+        """
+        Initializes the CumulativeColumns class.
+        :param ball_by_ball_data: A DataFrame holding CUMULATIVE_BASE_COLUMNS for every ball of each innings,
+        with the balls of each innings in order.
+        """
+        self.ball_by_ball = ball_by_ball_data
+        self._innings = None
+
+    @staticmethod
+    def get_requested(columns: list = None) -> list:
+        """
+        Finds the running total columns among requested columns.
+        :param columns: The requested columns. If None, every column is requested.
+        :return: A list of the requested CUMULATIVE_COLUMNS.
+        """
+        if columns is None:
+            return list(CUMULATIVE_COLUMNS)
+        return [column for column in columns if column in CUMULATIVE_COLUMNS]
+
+    def calculate(self, columns: list = None) -> pd.DataFrame:
+        """
+        Calculates running total columns.
+        :param columns: The CUMULATIVE_COLUMNS to calculate. If None, every one is calculated.
+        :return: A DataFrame of the columns with the index of the ball-by-ball data, typed as in BALL_SCHEMA.
+        :raises KeyError: If a column is not in CUMULATIVE_COLUMNS.
+        """
+        if columns is None:
+            columns = list(CUMULATIVE_COLUMNS)
+
+        owners = dict()
+        for column in columns:
+            owner, _ = CUMULATIVE_COLUMNS[column]
+            owners.setdefault(owner, []).append(column)
+
+        values = dict()
+        for owner, owned in owners.items():
+            increments = np.column_stack([
+                CUMULATIVE_COLUMNS[column][1](self.ball_by_ball).astype(np.int64) for column in owned
+            ]) if len(self.ball_by_ball) > 0 else np.zeros((0, len(owned)), dtype=np.int64)
+            totals = self._owner_totals(owner, increments)
+            for i, column in enumerate(owned):
+                values[column] = totals[:, i].astype(BALL_SCHEMA.field(column).type.to_pandas_dtype())
+
+        return pd.DataFrame({column: values[column] for column in columns}, index=self.ball_by_ball.index)
+
+    def _owner_totals(self, owner: str, increments: np.ndarray) -> np.ndarray:
+        """
+        Sums increments within the groups of balls of an owner.
+        :param owner: Who the totals are kept for: innings, innings_total, batter, non_striker or bowler.
+        :param increments: A (balls, columns) array of the amount each ball adds to each column.
+        :return: A (balls, columns) array of the totals on each ball.
+        """
+        innings = self._get_innings()
+        if owner == "innings":
+            return CumulativeColumns.grouped_cumsum(innings, increments)
+        if owner == "innings_total":
+            sums = np.zeros((innings.max(initial=-1) + 1, increments.shape[1]), dtype=np.int64)
+            np.add.at(sums, innings, increments)
+            return sums[innings]
+        if owner == "bowler":
+            groups, _ = StateStatistics.group_states(
+                pd.DataFrame({"innings": innings, "bowler": self.ball_by_ball["bowler_id"].to_numpy()}),
+                ["innings", "bowler"]
+            )
+            return CumulativeColumns.grouped_cumsum(groups, increments)
+
+        # Strikers and non-strikers share one set of batting totals within an innings
+        num_balls = len(innings)
+        pairs, _ = pd.factorize(np.concatenate([
+            CumulativeColumns._player_pairs(innings, self.ball_by_ball["batter_id"].to_numpy()),
+            CumulativeColumns._player_pairs(innings, self.ball_by_ball["non_striker_id"].to_numpy())
+        ]))
+        batter_pairs, non_striker_pairs = pairs[:num_balls], pairs[num_balls:]
+        if owner == "batter":
+            return CumulativeColumns.grouped_cumsum(batter_pairs, increments)
+
+        # The non-striker's totals are the batter totals on the last ball they faced up to this one, or nothing
+        order = np.argsort(batter_pairs, kind="stable")
+        totals = CumulativeColumns.grouped_cumsum(batter_pairs[order], increments[order], True)
+        positions = np.searchsorted(
+            batter_pairs[order] * num_balls + order, non_striker_pairs * num_balls + np.arange(num_balls), side="right"
+        ) - 1
+        found = positions >= 0
+        found[found] = batter_pairs[order[positions[found]]] == non_striker_pairs[found]
+        return np.where(found[:, None], totals[np.maximum(positions, 0)], 0)
+
+    def _get_innings(self) -> np.ndarray:
+        """
+        :return: The code of the innings of every ball.
+        """
+        if self._innings is None:
+            self._innings, _ = StateStatistics.group_states(self.ball_by_ball, ["match_id", "inn_num"])
+        return self._innings
+
+    @staticmethod
+    def _player_pairs(innings: np.ndarray, players: np.ndarray) -> np.ndarray:
+        """
+        :param innings: The code of the innings of every ball.
+        :param players: The player key of every ball, -1 when there is no player.
+        :return: A number unique to each (innings, player) pair.
+        """
+        return innings.astype(np.int64) * (np.iinfo(np.int32).max + 2) + players.astype(np.int64) + 1
+
+    @staticmethod
+    def grouped_cumsum(groups: np.ndarray, increments: np.ndarray, is_sorted: bool = False) -> np.ndarray:
+        """
+        Calculates cumulative sums that restart for every group, keeping the order of the balls within each group.
+        :param groups: The group code of every ball.
+        :param increments: A (balls, columns) array of the amount each ball adds.
+        :param is_sorted: Whether the balls are already ordered by group.
+        :return: A (balls, columns) array of the running totals of each ball's group.
+        """
+        order = np.arange(len(groups)) if is_sorted else np.argsort(groups, kind="stable")
+        sorted_groups = groups[order]
+        sums = np.cumsum(increments[order], axis=0)
+
+        # Each group's totals carry on from the sums before its first ball, which are taken away
+        starts = np.ones(len(groups), dtype=bool)
+        starts[1:] = sorted_groups[1:] != sorted_groups[:-1]
+        start_rows = np.flatnonzero(starts)
+        before = np.zeros((len(start_rows), increments.shape[1]), dtype=sums.dtype)
+        before[1:] = sums[start_rows[1:] - 1]
+        group_sums = sums - before[np.cumsum(starts) - 1]
+
+        totals = np.empty_like(group_sums)
+        totals[order] = group_sums
+        return totals
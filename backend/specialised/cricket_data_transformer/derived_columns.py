@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from .state_statistics import StateStatistics
+from .cumulative_columns import CumulativeColumns, CUMULATIVE_COLUMNS
+from .match.ball_schema import CATEGORY
+
+# Legal balls in an innings of each limited overs format
+MAX_BALLS = {"t20": 120, "od": 300}
+MAX_WICKETS = 10
+# First over (counting from 0) of the middle overs and of the death overs in each limited overs format
+PHASE_OVERS = {"t20": (6, 15), "od": (10, 40)}
+PHASES = ["powerplay", "middle", "death"]
+
+
+def _get_formats(balls: pd.DataFrame) -> np.ndarray:
+    """
+    :param balls: A DataFrame holding the match_type of every ball.
+    :return: The format (t20, od or mdm) of every ball, split the same way as Setup.get_format_key.
+    """
+    codes, match_types = pd.factorize(balls["match_type"], use_na_sentinel=False)
+    formats = [
+        "t20" if "t20" in str(match_type) else "od" if "od" in str(match_type) else "mdm"
+        for match_type in match_types
+    ]
+    return np.array(formats + ["mdm"], dtype=object)[codes]
+
+
+def _legal_balls_bowled(columns: "DerivedColumns") -> np.ndarray:
+    innings, _ = columns.get_innings()
+    return CumulativeColumns.grouped_cumsum(innings, columns.get("legal_ball")[:, None].astype(np.int64))[:, 0]
+
+
+def _balls_remaining(columns: "DerivedColumns") -> np.ndarray:
+    formats = _get_formats(columns.ball_by_ball)
+    max_balls = np.array([MAX_BALLS.get(match_format, -1) for match_format in formats], dtype=np.int64)
+    return np.where(max_balls >= 0, max_balls - columns.get("legal_balls_bowled"), -1)
+
+
+def _runs_to_target(columns: "DerivedColumns") -> np.ndarray:
+    innings, first_rows = columns.get_innings()
+    match_ids = columns.get("match_id").astype(np.int64)[first_rows]
+    innings_nums = columns.get("inn_num").astype(np.int64)[first_rows]
+    totals = columns.get("total_score").astype(np.float64)[first_rows]
+
+    # Even innings of limited overs matches (the chase, and the second innings of a super over) chase the innings before
+    previous = pd.Index(match_ids * 256 + innings_nums).get_indexer(match_ids * 256 + innings_nums - 1)
+    chasing = (innings_nums % 2 == 0) & (previous >= 0) & (_get_formats(columns.ball_by_ball)[first_rows] != "mdm")
+    targets = np.where(chasing, totals[np.maximum(previous, 0)] + 1, np.nan)
+    return targets[innings] - columns.get("current_score")
+
+
+def _phase(columns: "DerivedColumns") -> pd.Categorical:
+    formats = _get_formats(columns.ball_by_ball)
+    middle = np.array([PHASE_OVERS.get(match_format, (-1, -1))[0] for match_format in formats])
+    death = np.array([PHASE_OVERS.get(match_format, (-1, -1))[1] for match_format in formats])
+    over_num = columns.get("over_num")
+    phases = np.where(middle < 0, -1, (over_num >= middle).astype(np.int64) + (over_num >= death))
+    return pd.Categorical.from_codes(phases, PHASES)
+
+
+# Every derived column, mapped to its type, the columns it is calculated from and a function calculating it from
+# a DerivedColumns. The columns it is calculated from can be stored, running totals or other derived columns
+DERIVED_COLUMNS = {
+    "legal_ball": (
+        pa.bool_(), ["wides", "noballs"],
+        lambda columns: (columns.get("wides") == 0) & (columns.get("noballs") == 0)
+    ),
+    "legal_balls_bowled": (pa.int16(), ["match_id", "inn_num", "legal_ball"], _legal_balls_bowled),
+    "balls_remaining": (pa.int16(), ["match_type", "legal_balls_bowled"], _balls_remaining),
+    "wickets_remaining": (pa.int8(), ["wickets_lost"], lambda columns: MAX_WICKETS - columns.get("wickets_lost")),
+    "runs_to_target": (
+        pa.float32(), ["match_id", "inn_num", "match_type", "current_score", "total_score"], _runs_to_target
+    ),
+    "phase": (CATEGORY, ["match_type", "over_num"], _phase),
+}
+
+
+class DerivedColumns:
+    """
+    Class to calculate columns that are not stored in the ball-by-ball files from the columns that are,
+    such as the balls and wickets an innings has left. Each column is declared once in DERIVED_COLUMNS,
+    calculated for every ball at once, and kept so it is only calculated once for the data.
+    Running totals missing from the data (see BALL_BY_BALL_LEAN) are calculated with CumulativeColumns.\n
+    The values are after the ball, like the running totals, so balls_remaining and wickets_remaining
+    with current_score make up the state an innings is in once the ball has been bowled.
+    balls_remaining is -1 for formats without a limit on balls, runs_to_target is NaN for innings without a target,
+    and phase is missing for formats without phases. Revised targets are not stored, so the target of a chase
+    is always one more than the total of the innings before it.
+
+    Author: Jonathan Farrand
+    Date: 2026-10-18
+    """
+    def __init__(self, ball_by_ball_data: pd.DataFrame):
+        """
+        Initializes the DerivedColumns class.
+        :param ball_by_ball_data: A DataFrame of every ball of each innings, with the balls of each innings in order,
+        holding the columns the derived columns are calculated from (see get_dependencies).
+        """
+        self.ball_by_ball = ball_by_ball_data
+        self._values = dict()
+        self._innings = None
+        self._cumulative_columns = None
+
+    @staticmethod
+    def get_requested(columns: list = None) -> list:
+        """
+        Finds the derived columns among requested columns.
+        :param columns: The requested columns. If None, no derived columns are requested, as they are only calculated by name.
+        :return: A list of the requested DERIVED_COLUMNS.
+        """
+        if columns is None:
+            return []
+        return [column for column in columns if column in DERIVED_COLUMNS]
+
+    @staticmethod
+    def get_dependencies(columns: list) -> list:
+        """
+        Finds the columns that are not derived which derived columns are calculated from.
+        :param columns: The derived columns.
+        :return: A list of the stored and running total columns they need, in the order they are first needed.
+        """
+        dependencies = []
+        for column in columns:
+            for dependency in DERIVED_COLUMNS[column][1]:
+                if dependency in DERIVED_COLUMNS:
+                    dependencies += DerivedColumns.get_dependencies([dependency])
+                else:
+                    dependencies.append(dependency)
+        return list(dict.fromkeys(dependencies))
+
+    def get(self, column: str):
+        """
+        Returns the values of a column, calculating it if it is derived or a running total missing from the data.
+        :param column: The name of the column.
+        :return: A NumPy array (or a Categorical for phase) of the column's value on every ball.
+        :raises KeyError: If the column is not in the data and cannot be calculated.
+        """
+        if column in self._values:
+            return self._values[column]
+        if column in self.ball_by_ball.columns:
+            values = self.ball_by_ball[column].to_numpy()
+        elif column in DERIVED_COLUMNS:
+            column_type, _, calculate = DERIVED_COLUMNS[column]
+            values = calculate(self)
+            if not pa.types.is_dictionary(column_type):
+                values = np.asarray(values).astype(column_type.to_pandas_dtype())
+        elif column in CUMULATIVE_COLUMNS:
+            if self._cumulative_columns is None:
+                self._cumulative_columns = CumulativeColumns(self.ball_by_ball)
+            values = self._cumulative_columns.calculate([column])[column].to_numpy()
+        else:
+            raise KeyError(f"The column '{column}' is not in the ball-by-ball data and cannot be calculated.")
+        self._values[column] = values
+        return values
+
+    def get_innings(self) -> tuple:
+        """
+        :return: A tuple of the code of the innings of every ball, and the first row of each innings, see StateStatistics.group_states.
+        """
+        if self._innings is None:
+            self._innings = StateStatistics.group_states(self.ball_by_ball, ["match_id", "inn_num"])
+        return self._innings
+
+    def add(self, columns: list) -> pd.DataFrame:
+        """
+        Returns the ball-by-ball data with columns added to it if they are missing.
+        :param columns: The derived or running total columns to add.
+        :return: A DataFrame of the ball-by-ball data holding the columns, which is the same DataFrame if none were missing.
+        """
+        missing = [column for column in columns if column not in self.ball_by_ball.columns]
+        if len(missing) == 0:
+            return self.ball_by_ball
+        return self.ball_by_ball.assign(**{column: self.get(column) for column in missing})
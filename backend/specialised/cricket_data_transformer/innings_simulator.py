@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from src.config import SIMULATION_BATCH_SIZE
+from .outcome_distribution import OutcomeDistribution
+from .markov_solver import MarkovSolver, SMOOTHING
+
+# Each simulated innings is packed into one integer: runs in the low bits, then legal balls, then wickets
+BALLS_SHIFT = 12
+WICKETS_SHIFT = 21
+RUNS_MASK = (1 << BALLS_SHIFT) - 1
+
+
+def simulate_batch(tables: dict, num_innings: int, seed: np.random.SeedSequence) -> tuple:
+    """
+    Plays out a batch of innings together, one ball at a time, until every innings has ended.
+    Module level so it can be run in a ProcessPoolExecutor.
+    :param tables: The sampling tables from InningsSimulator.build_tables.
+    :param num_innings: The number of innings to play out.
+    :param seed: The seed of the batch's random numbers.
+    :return: A tuple of the number of innings ending on each score, and on each number of wickets.
+    """
+    rng = np.random.default_rng(seed)
+    states, thresholds = tables["states"], tables["thresholds"]
+    accept_deltas, alias_deltas = tables["accept_deltas"], tables["alias_deltas"]
+    column_shift, bits_mask, terminal = tables["column_shift"], tables["bits_mask"], tables["terminal"]
+
+    innings = np.zeros(num_innings, dtype=np.uint32)
+    ended = []
+    balls = 0
+    while len(innings) > 0:
+        # The top bits of each draw pick a column of the state's alias table, and the rest decide between
+        # the column's own outcome and its alias
+        draws = rng.integers(0, 1 << 32, size=len(innings), dtype=np.uint32)
+        cells = states[innings >> BALLS_SHIFT] + (draws >> column_shift)
+        innings += np.where((draws & bits_mask) < thresholds[cells], accept_deltas[cells], alias_deltas[cells])
+
+        balls += 1
+        # Ended innings stay in the terminal state, and are only taken out once an over
+        if balls % 6 == 0:
+            is_ended = states[innings >> BALLS_SHIFT] == terminal
+            if is_ended.any():
+                ended.append(innings[is_ended])
+                innings = innings[~is_ended]
+
+    ended = np.concatenate(ended) if len(ended) > 0 else innings
+    return np.bincount(ended & RUNS_MASK), np.bincount(ended >> WICKETS_SHIFT, minlength=tables["max_wickets"] + 1)
+
+
+class InningsSimulator:
+    """
+    Class to simulate the scores and wickets of innings by playing them out one ball at a time.
+    The outcome of each ball (its runs, whether it was legal and whether it took a wicket) is drawn from the
+    conditional distribution of outcomes given the over and wickets lost, which also separates the phases of the
+    innings, found with OutcomeDistribution and smoothed like MarkovSolver.
+    Every innings of a batch advances together in NumPy, drawing from alias tables so each ball costs one random
+    number and a few lookups however many outcomes there are, and batches can be spread over a process pool.
+
+    Author: Jonathan Farrand
+    Date: 2026-10-18
+    """
+    def __init__(self, ball_by_ball_data: pd.DataFrame, max_balls: int = 120, max_wickets: int = 10, smoothing: float = SMOOTHING):
+        """
+        Initializes the InningsSimulator class with ball-by-ball data.
+        :param ball_by_ball_data: A DataFrame containing ball-by-ball data of innings of one format, in ball order.
+        :param max_balls: The number of legal balls in an innings, such as 120 for T20s or 300 for one day matches.
+        :param max_wickets: The number of wickets in an innings.
+        :param smoothing: The weight, in balls, of the outcomes of the same over that each state is shrunk towards,
+        see MarkovSolver.smooth_outcomes.
+        """
+        self.ball_by_ball = ball_by_ball_data
+        self.max_balls = max_balls
+        self.max_wickets = max_wickets
+        self.smoothing = smoothing
+        self.outcome_probabilities = None
+        self.tables = None
+
+    def build_tables(self) -> dict:
+        """
+        Finds the probability of each outcome in each (over, wickets lost) state and builds the tables
+        simulate_batch samples from. Called by simulate the first time it is used.
+        :return: The sampling tables.
+        """
+        balls = MarkovSolver.get_ball_outcomes(self.ball_by_ball, self.max_balls, self.max_wickets)
+        in_innings = balls["in_innings"]
+        overs = -(-self.max_balls // 6)
+        outcome_shape = (int(balls["runs"].max(initial=0)) + 1, 2, 2)
+        outcome_frame = pd.DataFrame({
+            "state": (balls["balls_bowled"] // 6 * self.max_wickets + balls["wickets_lost"])[in_innings],
+            "outcome": np.ravel_multi_index((balls["runs"], balls["legal"], balls["wicket"]), outcome_shape)[in_innings]
+        })
+        counted = OutcomeDistribution(outcome_frame).batch_conditional_distribution([({}, "outcome", None, "state")])
+
+        counts = np.zeros((overs * self.max_wickets, int(np.prod(outcome_shape))))
+        counts[counted["group"].to_numpy(dtype=np.int64), counted["value"].to_numpy(dtype=np.int64)] = counted["count"]
+        probabilities = MarkovSolver.smooth_outcomes(counts.reshape((overs, self.max_wickets) + outcome_shape), self.smoothing)
+        self.outcome_probabilities = probabilities
+
+        runs, legal, wicket = np.unravel_index(np.arange(counts.shape[1]), outcome_shape)
+        deltas = (runs + (legal << BALLS_SHIFT) + (wicket << WICKETS_SHIFT)).astype(np.uint32)
+        self.tables = InningsSimulator._alias_tables(probabilities.reshape(counts.shape), deltas)
+        self.tables["states"] = self._state_lookup()
+        self.tables["max_wickets"] = self.max_wickets
+        return self.tables
+
+    def _state_lookup(self) -> np.ndarray:
+        """
+        Maps the balls and wickets bits of a packed innings to the first cell of its state's row of the alias tables.
+        :return: An array indexed by the packed innings shifted right by BALLS_SHIFT, pointing ended innings at the terminal row.
+        """
+        balls, wickets = np.meshgrid(np.arange(1 << (WICKETS_SHIFT - BALLS_SHIFT)), np.arange(16))
+        rows = np.where(
+            (balls < self.max_balls) & (wickets < self.max_wickets),
+            balls // 6 * self.max_wickets + wickets,
+            -(-self.max_balls // 6) * self.max_wickets
+        )
+        return (rows * self.tables["columns"]).astype(np.uint32).ravel()
+
+    @staticmethod
+    def _alias_tables(probabilities: np.ndarray, deltas: np.ndarray) -> dict:
+        """
+        Builds a Walker alias table for every state, plus a terminal state whose outcome changes nothing.
+        :param probabilities: The probability of each outcome in each state, with a row per state.
+        :param deltas: The change each outcome makes to a packed innings.
+        :return: A dictionary of the flattened thresholds and deltas of every table cell, and how to split a random
+        number into a column and the bits compared with the column's threshold.
+        """
+        num_states, num_outcomes = probabilities.shape
+        columns = 1 << int(np.ceil(np.log2(max(num_outcomes, 2))))
+        column_shift = 32 - int(np.log2(columns))
+        full = 1 << column_shift
+
+        thresholds = np.full((num_states + 1, columns), full, dtype=np.uint64)
+        accepted = np.zeros((num_states + 1, columns), dtype=np.int64)
+        aliases = np.zeros((num_states + 1, columns), dtype=np.int64)
+        for state in range(num_states):
+            scaled = np.zeros(columns)
+            scaled[:num_outcomes] = probabilities[state] * columns / probabilities[state].sum()
+            accepted[state] = np.arange(columns)
+            small = [column for column in range(columns) if scaled[column] < 1]
+            large = [column for column in range(columns) if scaled[column] >= 1]
+            while small and large:
+                column, alias = small.pop(), large.pop()
+                thresholds[state, column] = min(int(round(scaled[column] * full)), full)
+                aliases[state, column] = alias
+                scaled[alias] -= 1 - scaled[column]
+                (small if scaled[alias] < 1 else large).append(alias)
+            # Columns left over are within rounding of 1 and always keep their own outcome
+
+        padded = np.zeros(columns, dtype=np.uint32)
+        padded[:num_outcomes] = deltas
+        accept_deltas = padded[accepted]
+        alias_deltas = padded[aliases]
+        accept_deltas[num_states] = 0
+        alias_deltas[num_states] = 0
+        return {
+            "thresholds": thresholds.astype(np.uint32).ravel(),
+            "accept_deltas": accept_deltas.ravel(),
+            "alias_deltas": alias_deltas.ravel(),
+            "columns": columns,
+            "column_shift": np.uint32(column_shift),
+            "bits_mask": np.uint32(full - 1),
+            "terminal": np.uint32(num_states * columns)
+        }
+
+    def simulate(self, num_innings: int, seed: int = None, workers: int = 1, batch_size: int = SIMULATION_BATCH_SIZE) -> tuple:
+        """
+        Simulates innings and tabulates how they ended.
+        The innings are split into batches with their own random numbers spawned from the seed,
+        so the same seed gives the same results whatever the number of workers.
+        :param num_innings: The number of innings to simulate.
+        :param seed: The seed of the random numbers. If None, the results are not reproducible.
+        :param workers: The number of processes to spread the batches over. If 1, they are simulated in this process.
+        :param batch_size: The number of innings played out together.
+        :return: A tuple of two DataFrames: the number and proportion of innings ending on each score
+        (score, innings, probability), and on each number of wickets (wickets, innings, probability).
+        """
+        if self.tables is None:
+            self.build_tables()
+
+        sizes = [min(batch_size, num_innings - start) for start in range(0, num_innings, batch_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(simulate_batch, [self.tables] * len(sizes), sizes, seeds))
+        else:
+            results = [simulate_batch(self.tables, size, batch_seed) for size, batch_seed in zip(sizes, seeds)]
+
+        scores = np.zeros(max([len(score_counts) for score_counts, _ in results], default=1), dtype=np.int64)
+        wickets = np.zeros(self.max_wickets + 1, dtype=np.int64)
+        for score_counts, wicket_counts in results:
+            scores[:len(score_counts)] += score_counts
+            wickets += wicket_counts
+
+        total = max(num_innings, 1)
+        return (
+            pd.DataFrame({"score": np.arange(len(scores)), "innings": scores, "probability": scores / total}),
+            pd.DataFrame({"wickets": np.arange(len(wickets)), "innings": wickets, "probability": wickets / total})
+        )
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+from .state_statistics import StateStatistics
+
+# Columns every ladder is split by. The match type, gender and team type keep competitions sharing an event name apart
+LADDER_KEYS = ["match_type", "gender", "team_type", "event", "season"]
+# Ball-by-ball columns needed to build ladders
+LADDER_COLUMNS = ["match_id", "bat_team", "bowl_team", "winner"] + LADDER_KEYS
+
+
+class Ladder:
+    """
+    Class to build the ladder (standings) of every event and season from match-level data.
+    Each match is read once, turned into a row for each of its two teams, and every ladder is counted
+    in one grouped pass rather than one event and season at a time.
+    Matches without a winner (ties, draws and no results) count as draws, worth half a win in the win percentage.
+
+    Author: Jonathan Farrand
+    Date: 2026-10-18
+    """
+    def __init__(self, match_data: pd.DataFrame):
+        """
+        Initializes the Ladder class with match data.
+        :param match_data: A DataFrame holding at least the match_id, bat_team, bowl_team and winner columns, and any
+        of LADDER_KEYS, with one or more rows per match, such as ball-by-ball data.
+        Ladder keys that are missing are left out of the grouping.
+        """
+        self.match_data = match_data
+
+    def get_matches(self) -> pd.DataFrame:
+        """
+        Keeps the first row of every match.
+        Both teams of a match are on each of its rows, as one is batting and the other bowling.
+        :return: A DataFrame with one row per match, in order of first appearance.
+        """
+        _, first_rows = StateStatistics.group_states(self.match_data, ["match_id"])
+        columns = [column for column in LADDER_COLUMNS if column in self.match_data.columns]
+        return self.match_data[columns].iloc[first_rows].reset_index(drop=True)
+
+    def build(self) -> pd.DataFrame:
+        """
+        Builds every ladder.
+        :return: A DataFrame with one row per team in each ladder, holding the ladder keys, team, position, games,
+        wins, draws, losses and pct ((wins + 0.5 * draws) / games). Ladders are in key order, and teams within each
+        are ordered by pct then wins, with position counting from 1.
+        """
+        matches = self.get_matches()
+        keys = [key for key in LADDER_KEYS if key in matches.columns]
+
+        # Each match becomes a row for the batting team followed by a row for the bowling team
+        teams = pd.api.types.union_categoricals(
+            [pd.Categorical(matches["bat_team"]), pd.Categorical(matches["bowl_team"])], ignore_order=True
+        )
+        winners = np.tile(matches["winner"].astype(object).to_numpy(), 2)
+        team_names = teams.astype(object)
+        results = pd.DataFrame({key: np.tile(matches[key].to_numpy(), 2) for key in keys})
+        results["team"] = teams
+        results["win"] = winners == team_names
+        results["draw"] = pd.isna(winners)
+        results["loss"] = ~(results["win"] | results["draw"])
+
+        ladders = StateStatistics(results).aggregate(keys + ["team"], {
+            "games": ("win", "count"),
+            "wins": ("win", "sum"),
+            "draws": ("draw", "sum"),
+            "losses": ("loss", "sum")
+        })
+        counts = ["games", "wins", "draws", "losses"]
+        ladders[counts] = ladders[counts].astype(np.int64)
+        ladders["pct"] = (ladders["wins"] + 0.5 * ladders["draws"]) / ladders["games"]
+        return Ladder.rank(ladders)
+
+    @staticmethod
+    def rank(ladders: pd.DataFrame) -> pd.DataFrame:
+        """
+        Orders and numbers the teams of every ladder.
+        Used both when building ladders and when joining ladders built separately, such as cached ones.
+        :param ladders: A DataFrame of ladders, as returned by build.
+        :return: The ladders in key order, with teams within each ordered by pct then wins, and a position column
+        counting from 1 after the team column.
+        """
+        keys = [key for key in LADDER_KEYS if key in ladders.columns]
+        ladders = ladders.drop(columns="position", errors="ignore").sort_values(
+            keys + ["pct", "wins", "team"], ascending=[True] * len(keys) + [False, False, True], ignore_index=True
+        )
+        groups, _ = StateStatistics.group_states(ladders, keys)
+        # Rows of a ladder are next to each other, so a team's position is its distance from the ladder's first row
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]]) if len(ladders) > 0 else np.zeros(0, dtype=np.int64)
+        group_sizes = np.diff(np.r_[starts, len(ladders)])
+        ladders.insert(ladders.columns.get_loc("team") + 1, "position", np.arange(len(ladders)) - np.repeat(starts, group_sizes) + 1)
+        return ladders
@@ -0,0 +1,232 @@
+import numpy as np
+import pandas as pd
+
+
+# Weight, in balls, of the pooled outcome distribution that each state's observed outcomes are shrunk towards
+SMOOTHING = 20.0
+
+
+class MarkovSolver:
+    """
+    Class to calculate the expected remaining runs, and their distribution, from every (balls left, wickets left)
+    state of an innings, including states that were rarely or never observed.
+    Each ball is treated as an outcome drawn from the state it was bowled in: the runs it scored, whether it was a
+    legal ball (wides and no balls are bowled again) and whether it took a wicket. The probability of each outcome
+    in each state is estimated from the ball-by-ball data, then backward induction from the end of the innings
+    fills a dense (balls left, wickets left) tensor, so every query afterwards is a lookup.
+
+    Author: Jonathan Farrand
+    Date: 2026-10-18
+    """
+    def __init__(self, ball_by_ball_data: pd.DataFrame, max_balls: int = 120, max_wickets: int = 10, smoothing: float = SMOOTHING):
+        """
+        Initializes the MarkovSolver class with ball-by-ball data.
+        :param ball_by_ball_data: A DataFrame containing ball-by-ball data of innings of one format, in ball order.
+        :param max_balls: The number of legal balls in an innings, such as 120 for T20s or 300 for one day matches.
+        :param max_wickets: The number of wickets in an innings.
+        :param smoothing: The weight, in balls, of the outcomes of every state with the same balls left that each
+        state's outcomes are shrunk towards, which are themselves shrunk towards the outcomes of every state.
+        States with many observations keep their own outcomes, and unobserved states take the pooled outcomes.
+        """
+        self.ball_by_ball = ball_by_ball_data
+        self.max_balls = max_balls
+        self.max_wickets = max_wickets
+        self.smoothing = smoothing
+        # Total runs covered by the run distributions, the chance of scoring more in the rest of an innings is negligible
+        self.max_runs = 1 << int(np.ceil(np.log2(3 * max_balls + 1)))
+
+        self.observations = None
+        self.outcome_probabilities = None
+        self.expected_runs = None
+        self.run_distribution = None
+
+    def solve(self) -> "MarkovSolver":
+        """
+        Estimates the outcome probabilities of every state and runs backward induction over them.
+        Called by every query the first time one is made.
+        :return: The solver, for chaining.
+        """
+        counts = self._count_outcomes()
+        self.observations = counts.sum(axis=(2, 3, 4))
+        self.outcome_probabilities = self._smooth(counts)
+        self.expected_runs, self.run_distribution = self._induct(self.outcome_probabilities)
+        return self
+
+    def _count_outcomes(self) -> np.ndarray:
+        """
+        Counts the outcomes of the balls bowled in each state.
+        :return: An array of counts indexed by balls left, wickets left, runs, whether the ball was legal and whether
+        it took a wicket. Balls are counted in the state before they were bowled, and balls bowled in states outside
+        the innings (such as after max_balls legal balls) are left out.
+        """
+        balls = MarkovSolver.get_ball_outcomes(self.ball_by_ball, self.max_balls, self.max_wickets)
+        in_innings = balls["in_innings"]
+        balls_left = self.max_balls - balls["balls_bowled"]
+        wickets_left = self.max_wickets - balls["wickets_lost"]
+
+        shape = (self.max_balls + 1, self.max_wickets + 1, int(balls["runs"].max(initial=0)) + 1, 2, 2)
+        outcomes = np.ravel_multi_index((
+            balls_left[in_innings], wickets_left[in_innings],
+            balls["runs"][in_innings], balls["legal"][in_innings], balls["wicket"][in_innings]
+        ), shape)
+        return np.bincount(outcomes, minlength=int(np.prod(shape))).reshape(shape).astype(np.float64)
+
+    @staticmethod
+    def get_ball_outcomes(ball_by_ball: pd.DataFrame, max_balls: int, max_wickets: int) -> dict:
+        """
+        Finds the state each ball was bowled in and its outcome.
+        :param ball_by_ball: A DataFrame containing ball-by-ball data, in ball order.
+        :param max_balls: The number of legal balls in an innings.
+        :param max_wickets: The number of wickets in an innings.
+        :return: A dictionary of arrays holding, for each ball, the legal balls bowled and wickets lost in the innings
+        before it (balls_bowled and wickets_lost), its runs, whether it was legal and whether it took a wicket (as 0 or 1),
+        and whether it was bowled before the innings ended (in_innings).
+        """
+        legal = ((ball_by_ball["wides"] == 0) & (ball_by_ball["noballs"] == 0)).to_numpy(dtype=np.int64)
+        wicket = (ball_by_ball["dismissal"] > 0).to_numpy(dtype=np.int64)
+
+        # Legal balls bowled in the innings before each ball, with innings told apart by where they start
+        match_ids = ball_by_ball["match_id"].to_numpy(dtype=np.int64)
+        innings_nums = ball_by_ball["inn_num"].to_numpy(dtype=np.int64)
+        starts = np.ones(len(ball_by_ball), dtype=bool)
+        starts[1:] = (match_ids[1:] != match_ids[:-1]) | (innings_nums[1:] != innings_nums[:-1])
+        balls_bowled = np.cumsum(legal) - legal
+        balls_bowled -= balls_bowled[np.flatnonzero(starts)][np.cumsum(starts) - 1]
+
+        wickets_lost = ball_by_ball["wickets_lost"].to_numpy(dtype=np.int64) - wicket
+        return {
+            "balls_bowled": balls_bowled,
+            "wickets_lost": wickets_lost,
+            "runs": ball_by_ball["ball_runs"].to_numpy(dtype=np.int64),
+            "legal": legal,
+            "wicket": wicket,
+            "in_innings": (balls_bowled >= 0) & (balls_bowled < max_balls) & (wickets_lost >= 0) & (wickets_lost < max_wickets)
+        }
+
+    def _smooth(self, counts: np.ndarray) -> np.ndarray:
+        """
+        Turns outcome counts into probabilities, see smooth_outcomes.
+        :param counts: The outcome counts from _count_outcomes.
+        :return: An array of the probability of each outcome in each state, in the same shape as counts.
+        """
+        return MarkovSolver.smooth_outcomes(counts, self.smoothing)
+
+    @staticmethod
+    def smooth_outcomes(counts: np.ndarray, smoothing: float) -> np.ndarray:
+        """
+        Turns outcome counts into probabilities, shrinking each state towards the states at the same point of the
+        innings, and those towards every state.
+        :param counts: An array of outcome counts indexed by point of the innings (such as balls left or overs bowled),
+        wickets, runs, whether the ball was legal and whether it took a wicket.
+        :param smoothing: The weight, in balls, of the outcomes each state is shrunk towards.
+        :return: An array of the probability of each outcome in each state, in the same shape as counts.
+        """
+        outcome_axes = (1, 2, 3)
+        pooled = counts.sum(axis=(0, 1))
+        pooled = pooled / max(pooled.sum(), 1.0)
+
+        by_point = counts.sum(axis=1)
+        by_point = (by_point + smoothing * pooled) / (by_point.sum(axis=outcome_axes, keepdims=True) + smoothing)
+
+        totals = counts.sum(axis=(2, 3, 4), keepdims=True)
+        return (counts + smoothing * by_point[:, None]) / (totals + smoothing)
+
+    def _induct(self, probabilities: np.ndarray) -> tuple:
+        """
+        Runs backward induction from the end of the innings, where no more runs are scored.
+        A state depends on the states with one fewer ball left (after legal balls), with one fewer wicket left
+        and the same balls left (after wickets from wides and no balls) and itself (after other wides and no balls),
+        so each balls left is solved for every wicket at once, with the first order recurrence over wickets unrolled.
+        Run distributions are built in the frequency domain, where adding the runs of a ball is a multiplication.
+        :param probabilities: The outcome probabilities from _smooth.
+        :return: A tuple of the expected remaining runs of each state, and the probability of each number of remaining runs.
+        """
+        runs = np.arange(probabilities.shape[2])
+        frequencies = np.exp(-2j * np.pi * np.outer(runs, np.arange(self.max_runs // 2 + 1)) / self.max_runs)
+
+        expected = np.zeros((self.max_balls + 1, self.max_wickets + 1))
+        spectra = np.ones((self.max_balls + 1, self.max_wickets + 1, frequencies.shape[1]), dtype=np.complex128)
+        for balls_left in range(1, self.max_balls + 1):
+            # Probabilities of each outcome by wickets left and runs
+            legal, legal_wicket = probabilities[balls_left, :, :, 1, 0], probabilities[balls_left, :, :, 1, 1]
+            extra, extra_wicket = probabilities[balls_left, :, :, 0, 0], probabilities[balls_left, :, :, 0, 1]
+            previous_expected, previous_spectra = expected[balls_left - 1], spectra[balls_left - 1]
+
+            # Extras that take no wicket bowl the same state again, so it is solved for
+            repeat = 1 - extra.sum(axis=1)
+            scored = (legal + legal_wicket + extra + extra_wicket) @ runs
+            constant = (scored + legal.sum(axis=1) * previous_expected) / repeat
+            constant[1:] += legal_wicket[1:].sum(axis=1) * previous_expected[:-1] / repeat[1:]
+            factor = extra_wicket.sum(axis=1) / repeat
+
+            repeat_spectra = 1 - extra @ frequencies
+            constant_spectra = (legal @ frequencies) * previous_spectra
+            constant_spectra[1:] += (legal_wicket[1:] @ frequencies) * previous_spectra[:-1]
+            constant_spectra /= repeat_spectra
+            factor_spectra = (extra_wicket @ frequencies) / repeat_spectra
+
+            for wickets_left in range(1, self.max_wickets + 1):
+                expected[balls_left, wickets_left] = constant[wickets_left] + factor[wickets_left] * expected[balls_left, wickets_left - 1]
+                spectra[balls_left, wickets_left] = constant_spectra[wickets_left] + factor_spectra[wickets_left] * spectra[balls_left, wickets_left - 1]
+
+        distribution = np.clip(np.fft.irfft(spectra, n=self.max_runs, axis=-1), 0, None)
+        return expected, distribution
+
+    def get_expected_runs(self, balls_left, wickets_left):
+        """
+        Looks up the expected remaining runs of states.
+        :param balls_left: The legal balls left, as an int or an array.
+        :param wickets_left: The wickets left, as an int or an array of the same shape.
+        :return: The expected remaining runs of each state.
+        :raises IndexError: If a state is outside the innings.
+        """
+        if self.expected_runs is None:
+            self.solve()
+        return self.expected_runs[self._check_states(balls_left, wickets_left)]
+
+    def get_run_distribution(self, balls_left, wickets_left) -> np.ndarray:
+        """
+        Looks up the distribution of the remaining runs of states.
+        :param balls_left: The legal balls left, as an int or an array.
+        :param wickets_left: The wickets left, as an int or an array of the same shape.
+        :return: The probability of scoring each number of runs from 0 to max_runs - 1 in the rest of the innings,
+        along the last axis.
+        :raises IndexError: If a state is outside the innings.
+        """
+        if self.run_distribution is None:
+            self.solve()
+        return self.run_distribution[self._check_states(balls_left, wickets_left)]
+
+    def _check_states(self, balls_left, wickets_left) -> tuple:
+        """
+        Checks that states are inside the innings, as negative values would otherwise index from the end.
+        :param balls_left: The legal balls left.
+        :param wickets_left: The wickets left.
+        :return: The states as an index into the solved tensors.
+        :raises IndexError: If a state is outside the innings.
+        """
+        balls_left, wickets_left = np.asarray(balls_left), np.asarray(wickets_left)
+        if np.any((balls_left < 0) | (balls_left > self.max_balls) | (wickets_left < 0) | (wickets_left > self.max_wickets)):
+            raise IndexError(f"States must have 0 to {self.max_balls} balls left and 0 to {self.max_wickets} wickets left")
+        return balls_left, wickets_left
+
+    def get_expected_runs_df(self) -> pd.DataFrame:
+        """
+        Tabulates the solved states.
+        :return: A DataFrame with one row per state, ordered by balls left then wickets left, holding balls_left,
+        wickets_left, expected_runs (remaining), observations (balls bowled in the state) and the 10th, 50th and 90th
+        percentiles of the remaining runs.
+        """
+        if self.expected_runs is None:
+            self.solve()
+        balls_left, wickets_left = np.indices(self.expected_runs.shape)
+        cumulative = np.cumsum(self.run_distribution, axis=-1)
+        result = {
+            "balls_left": balls_left.ravel(),
+            "wickets_left": wickets_left.ravel(),
+            "expected_runs": self.expected_runs.ravel(),
+            "observations": self.observations.ravel().astype(np.int64)
+        }
+        for percentile in [10, 50, 90]:
+            result[f"runs_p{percentile}"] = (cumulative < percentile / 100).sum(axis=-1).ravel()
+        return pd.DataFrame(result)
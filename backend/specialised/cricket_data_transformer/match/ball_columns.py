@@ -0,0 +1,102 @@
+import numpy as np
+import pyarrow as pa
+from .ball_schema import MATCH_SCHEMA
+from .match_meta import MatchMeta
+
+# Columns holding a code into one of the BallColumns lookup lists rather than a value
+CODED_COLUMNS = {
+    "batter_id": "players",
+    "bowler_id": "players",
+    "non_striker_id": "players",
+    "player_out_id": "players",
+    "dismissal_type": "dismissal_types",
+    "bat_team": "teams",
+    "bowl_team": "teams",
+}
+
+
+class BallColumns:
+    """
+    Preallocated column buffers holding the processed balls of a single match.
+    Per-ball values are stored in NumPy arrays sized from the number of deliveries in the match,
+    strings that repeat from ball to ball (player IDs, teams, dismissal types) are stored as codes
+    into small lookup lists, and match-level values are stored once rather than once per ball.
+
+    Author: Jonathan Farrand
+    Date: 2026-10-18
+    """
+    def __init__(self, num_balls: int, meta: MatchMeta, schema: pa.Schema = MATCH_SCHEMA):
+        """
+        Allocates the column buffers.
+        :param num_balls: The number of deliveries in the match.
+        :param meta: The MatchMeta of the match, whose match_keys are stored once for every ball.
+        :param schema: The columns to hold, either MATCH_SCHEMA or LEAN_MATCH_SCHEMA.
+        """
+        self.num_balls = num_balls
+        self.constants = meta.match_keys()
+        self.schema = schema
+
+        self.arrays = dict()
+        for field in schema:
+            if field.name in self.constants:
+                continue
+            if field.name in CODED_COLUMNS:
+                self.arrays[field.name] = np.full(num_balls, -1, dtype=np.int16)
+            else:
+                self.arrays[field.name] = np.zeros(num_balls, dtype=field.type.to_pandas_dtype())
+
+        self.players = []
+        self.dismissal_types = []
+        self.teams = []
+        self._codes = {"players": dict(), "dismissal_types": dict(), "teams": dict()}
+
+    def get_code(self, lookup: str, value) -> int:
+        """
+        Returns the code of a value in one of the lookup lists, adding it if it has not been seen before.
+        :param lookup: The lookup list, one of players, dismissal_types or teams.
+        :param value: The value to encode. None is stored like any other value.
+        :return: The index of the value in the lookup list.
+        """
+        codes = self._codes[lookup]
+        if value not in codes:
+            codes[value] = len(codes)
+            getattr(self, lookup).append(value)
+        return codes[value]
+
+    def to_record_batch(self) -> pa.RecordBatch:
+        """
+        Returns the balls as an Arrow record batch following the schema of the columns.
+        Match-level values are repeated for every ball. Coded columns become dictionary arrays over their lookup list
+        when the schema dictionary-encodes them, otherwise codes are replaced by the values they stand for.
+        :return: A RecordBatch with one row per ball.
+        """
+        arrays = []
+        for field in self.schema:
+            if field.name in self.constants:
+                value = self.constants[field.name]
+                if pa.types.is_dictionary(field.type):
+                    # A missing value (such as the winner of a tie) has no category, so every ball is null
+                    codes = pa.array(np.zeros(self.num_balls, dtype=np.int32), mask=np.full(self.num_balls, value is None))
+                    values = [] if value is None else [value]
+                    arrays.append(pa.DictionaryArray.from_arrays(codes, pa.array(values, type=field.type.value_type)))
+                else:
+                    arrays.append(pa.repeat(pa.scalar(value, type=field.type), self.num_balls))
+            elif field.name in CODED_COLUMNS:
+                codes = self.arrays[field.name]
+                codes = pa.array(codes.astype(np.int32), mask=codes < 0)
+                if pa.types.is_dictionary(field.type):
+                    values = pa.array(getattr(self, CODED_COLUMNS[field.name]), type=field.type.value_type)
+                    arrays.append(pa.DictionaryArray.from_arrays(codes, values))
+                else:
+                    values = pa.array(getattr(self, CODED_COLUMNS[field.name]), type=field.type)
+                    arrays.append(values.take(codes))
+            else:
+                arrays.append(pa.array(self.arrays[field.name], type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def to_rows(self) -> list:
+        """
+        Returns the balls as a list of dictionaries, one per ball, keyed by column name.
+        :return: A list of dictionaries in schema column order.
+        """
+        return self.to_record_batch().to_pylist()
@@ -1,5 +1,8 @@
 from src.specialised.cricket_data_transformer.match.player_registry import PlayerRegistry
 EXTRA_TYPES = ["wides", "noballs", "byes", "legbyes", "penalties"]
+# Order of the values returned by BallProcessor.get_events
+EVENT_KEYS = ["batter", "bowler", "non_striker", "player_out", "dismissal", "dismissal_type", "bat_runs", "ball_runs"] + EXTRA_TYPES
+NO_EXTRAS = dict()
 
 class BallProcessor:
     """
@@ -73,4 +76,43 @@ class BallProcessor:
 
         # Add extras dynamically
         extras_data = self.extras.copy()
-        return {**base_data, **extras_data}
\ No newline at end of file
+        return {**base_data, **extras_data}
+
+    @staticmethod
+    def get_events(delivery: dict, player_codes: dict, columns) -> tuple:
+        """
+        Reads the events of a delivery as a tuple of integers, without building any intermediate dictionaries.
+        Used by the InningsProcessor when filling column buffers, where this runs once for every ball.
+        :param delivery: A dictionary containing details of the ball delivery.
+        :param player_codes: A dictionary mapping player names, as written in the delivery, to their player codes.
+        :param columns: The BallColumns the dismissal type codes belong to.
+        :return: A tuple of values in EVENT_KEYS order. Player codes and the dismissal type are -1 when missing.
+        """
+        runs = delivery["runs"]
+        extras = delivery.get("extras", NO_EXTRAS)
+        wickets = delivery.get("wickets")
+
+        player_out = -1
+        dismissal = 0
+        dismissal_type = -1
+        if wickets:
+            player_out = player_codes[wickets[0].get("player_out", "")]
+            if wickets[0].get("kind") != "retired not out":
+                dismissal = 1
+                dismissal_type = columns.get_code("dismissal_types", wickets[0].get("kind"))
+
+        return (
+            player_codes[delivery["batter"]],
+            player_codes[delivery["bowler"]],
+            player_codes[delivery["non_striker"]],
+            player_out,
+            dismissal,
+            dismissal_type,
+            runs["batter"],
+            runs["total"],
+            extras.get("wides", 0),
+            extras.get("noballs", 0),
+            extras.get("byes", 0),
+            extras.get("legbyes", 0),
+            extras.get("penalties", 0)
+        )
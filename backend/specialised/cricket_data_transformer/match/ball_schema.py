@@ -0,0 +1,91 @@
+import pyarrow as pa
+
+# Running counters kept for each batter (striker and non-striker) and bowler by the InningsProcessor
+BAT_STAT_KEYS = ["balls", "runs", "dots", "singles", "twos", "threes", "fours", "sixes"]
+BOWL_STAT_KEYS = ["legal_balls", "illegal_balls", "total_balls", "bat_runs", "wides", "noballs",
+                  "dots", "singles", "twos", "threes", "fours", "sixes"]
+
+# Repeated strings are dictionary-encoded, so they are stored as int32 codes and read back as pandas categoricals
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+# Player columns hold int32 keys from the PlayerInternTable, -1 when there is no player
+PLAYER_ID_COLUMNS = ["batter_id", "bowler_id", "non_striker_id", "player_out_id"]
+PLAYER_KEY = pa.int32()
+
+
+def _ball_schema(player_type: pa.DataType) -> pa.Schema:
+    """
+    Returns the column types of the ball-by-ball output, in the order the InningsProcessor emits them.
+    :param player_type: The type of the player ID columns.
+    :return: The schema of a batch of balls.
+    """
+    return pa.schema(
+        [
+            ("match_id", pa.int64()),
+            ("date", pa.date32()),
+            ("gender", CATEGORY),
+            ("season", pa.string()),
+            ("venue", CATEGORY),
+            ("team_type", CATEGORY),
+            ("match_type", CATEGORY),
+            ("event", CATEGORY),
+            ("winner", CATEGORY),
+
+            ("batter_id", player_type),
+            ("bowler_id", player_type),
+            ("non_striker_id", player_type),
+            ("player_out_id", player_type),
+            ("dismissal", pa.int8()),
+            ("bat_runs", pa.int8()),
+            ("ball_runs", pa.int8()),
+            ("dismissal_type", CATEGORY),
+            ("wides", pa.int8()),
+            ("noballs", pa.int8()),
+            ("byes", pa.int8()),
+            ("legbyes", pa.int8()),
+            ("penalties", pa.int8()),
+
+            ("result", pa.float32()),
+            ("inn_num", pa.int8()),
+            ("over_num", pa.int16()),
+            ("ball_num", pa.int8()),
+            ("bat_team", CATEGORY),
+            ("bowl_team", CATEGORY),
+            ("current_score", pa.int16()),
+            ("wickets_lost", pa.int8()),
+            ("powerplay_wickets", pa.int8()),
+            ("non_powerplay_wickets", pa.int8()),
+            ("bat_powerplay_runs", pa.int16()),
+            ("bat_non_powerplay_runs", pa.int16()),
+            ("total_wides", pa.int16()),
+            ("total_noballs", pa.int16()),
+            ("total_penalties", pa.int16()),
+            ("total_legbyes", pa.int16()),
+            ("total_byes", pa.int16()),
+            ("total_score", pa.int16()),
+            ("powerplay", pa.bool_()),
+        ]
+        + [(f"bowler_{key}", pa.int16()) for key in BOWL_STAT_KEYS]
+        + [(f"batter_{key}", pa.int16()) for key in BAT_STAT_KEYS]
+        + [(f"non_striker_{key}", pa.int16()) for key in BAT_STAT_KEYS]
+    )
+
+
+# Fixing the types up front lets every batch written during ingest share one schema
+BALL_SCHEMA = _ball_schema(PLAYER_KEY)
+# Batches built for a single match hold cricsheet player IDs rather than keys,
+# as keys are only assigned by the ingest process writing the ball-by-ball files
+MATCH_SCHEMA = _ball_schema(CATEGORY)
+
+# Running totals kept for every ball, which make up most of the width of the ball-by-ball files.
+# Lean files leave them out, and they are calculated when read instead, see CumulativeColumns
+RUNNING_TOTAL_COLUMNS = [
+    "current_score", "wickets_lost", "powerplay_wickets", "non_powerplay_wickets", "bat_powerplay_runs",
+    "bat_non_powerplay_runs", "total_wides", "total_noballs", "total_penalties", "total_legbyes", "total_byes",
+    "total_score"
+] + [f"bowler_{key}" for key in BOWL_STAT_KEYS] + [f"batter_{key}" for key in BAT_STAT_KEYS] \
+    + [f"non_striker_{key}" for key in BAT_STAT_KEYS]
+
+# Schemas of the per-ball events alone, used when BALL_BY_BALL_LEAN is set
+LEAN_BALL_SCHEMA = pa.schema([field for field in BALL_SCHEMA if field.name not in RUNNING_TOTAL_COLUMNS])
+LEAN_MATCH_SCHEMA = pa.schema([field for field in MATCH_SCHEMA if field.name not in RUNNING_TOTAL_COLUMNS])
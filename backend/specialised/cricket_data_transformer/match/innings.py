@@ -1,4 +1,6 @@
 import pandas as pd
+from .scorecard import Scorecard, INNINGS_KEYS
+from .ball_processor import EXTRA_TYPES
 
 class Innings:
     """
@@ -28,29 +30,30 @@ class Innings:
     def generate_scorecard_from_df(self, ball_by_ball_data: pd.DataFrame):
         """
         Generates the scorecard from a DataFrame containing ball-by-ball data.
-        :param ball_by_ball_data: A DataFrame containing ball-by-ball data.
+        The cards are built by a Scorecard, see Scorecard.build. To build the cards of many innings use a Scorecard directly.
+        :param ball_by_ball_data: A DataFrame containing ball-by-ball data of a single innings, in ball order.
         """
-        dismissal_rows = ball_by_ball_data[(ball_by_ball_data["dismissal"] == 1)]
-        for row in dismissal_rows.itertuples():
-            if row.player_out_id not in self.bat_scores:
-                self.bat_scores[row.player_out_id] = dict()
-                self.bat_scores[row.player_out_id]["runs"] = row.batter_runs
-                self.bat_scores[row.player_out_id]["balls"] = row.batter_balls
-                self.bat_scores[row.player_out_id]["dots"] = row.batter_dots
-                self.bat_scores[row.player_out_id]["singles"] = row.batter_singles
-                self.bat_scores[row.player_out_id]["twos"] = row.batter_twos
-                self.bat_scores[row.player_out_id]["threes"] = row.batter_threes
-                self.bat_scores[row.player_out_id]["fours"] = row.batter_fours
-                self.bat_scores[row.player_out_id]["sixes"] = row.batter_sixes
-                self.bat_scores[row.player_out_id]["dismissed"] = True
-                self.bat_scores[row.player_out_id]["dismissal_type"] = row.dismissal_type
-
-        pass
+        batting, bowling = Scorecard(ball_by_ball_data).build().get_match(ball_by_ball_data["match_id"].iloc[0])
+        # Each player's line of the card, keyed by their player key or ID
+        self.bat_scores = batting.drop(columns=INNINGS_KEYS + ["bat_team"]).set_index("batter_id").to_dict(orient="index")
+        self.bowl_scores = bowling.drop(columns=INNINGS_KEYS + ["bowl_team"]).set_index("bowler_id").to_dict(orient="index")
+
+        self.bat_team = ball_by_ball_data["bat_team"].iloc[0]
+        self.bowl_team = ball_by_ball_data["bowl_team"].iloc[0]
+        self.extras = {
+            extra: int(ball_by_ball_data[extra].sum())
+            for extra in EXTRA_TYPES if extra in ball_by_ball_data.columns
+        }
+        legal_balls = int(bowling["balls"].sum())
+        self.overs_played, self.over_balls = divmod(legal_balls, 6)
+        self.score = int(ball_by_ball_data["ball_runs"].sum()) if "ball_runs" in ball_by_ball_data.columns else \
+            int(batting["runs"].sum()) + sum(self.extras.values())
+        self.wickets = int(batting["dismissed"].sum())
 
     def generate_scorecard_from_dict(self, innings_data: list):
         """
         Generates the scorecard from a list of dictionaries containing ball-by-ball data.
-        :param innings_data: A list of dictionaries containing ball-by-ball data.
+        :param innings_data: A list of dictionaries containing ball-by-ball data of a single innings, in ball order,
+        such as the rows returned by BallColumns.to_rows.
         """
-        pass
-
+        self.generate_scorecard_from_df(pd.DataFrame(innings_data))
@@ -1,6 +1,9 @@
 from .match_meta import MatchMeta
 from .player_registry import PlayerRegistry
-from .ball_processor import BallProcessor
+from .ball_processor import BallProcessor, EXTRA_TYPES, EVENT_KEYS
+from .ball_columns import BallColumns
+from .ball_schema import BAT_STAT_KEYS, BOWL_STAT_KEYS
+import numpy as np
 import math
 
 ball_dict = {
@@ -13,6 +16,30 @@ ball_dict = {
 }
 
 
+class PlayerCodes(dict):
+    """
+    Maps player names, as written in the deliveries, to their codes in a BallColumns.
+    Each name is only looked up in the PlayerRegistry the first time it is seen in the match.
+    Names missing from the registry are given the code -1.
+
+    Author: Jonathan Farrand
+    Date: 2026-10-18
+    """
+    def __init__(self, registry: PlayerRegistry, columns: BallColumns):
+        """
+        :param registry: The PlayerRegistry used to find the ID of each name.
+        :param columns: The BallColumns the player codes belong to.
+        """
+        super().__init__()
+        self.registry = registry
+        self.columns = columns
+
+    def __missing__(self, name):
+        player_id = self.registry.get_id(name)
+        code = self.columns.get_code("players", player_id) if player_id is not None else -1
+        self[name] = code
+        return code
+
 
 class InningsProcessor:
     """
@@ -44,12 +71,35 @@ class InningsProcessor:
                     plays.append(i)
             self.powerplays = plays
 
+    def count_deliveries(self):
+        """
+        Counts the deliveries bowled in the innings, used to size the column buffers before processing.
+        :return: The number of deliveries in the innings.
+        """
+        return sum(len(over["deliveries"]) for over in self.innings_data["overs"])
+
     def process(self, innings_num):
         """
         Processes the innings data and generates a list of dictionaries for each ball bowled.
         :param innings_num: The innings number (1 or 2).
         :return: A list of dictionaries containing data for each ball bowled in the innings.
         """
+        columns = BallColumns(self.count_deliveries(), self.meta)
+        self.process_columns(innings_num, columns, 0)
+        self.ball_rows = columns.to_rows()
+        return self.ball_rows
+
+    def process_columns(self, innings_num, columns: BallColumns, start: int, player_codes: PlayerCodes = None):
+        """
+        Processes the innings data into preallocated column buffers.
+        Only the events of each delivery are read one ball at a time. The running totals for the innings,
+        batters and bowler are then calculated for every ball at once with cumulative sums.
+        :param innings_num: The innings number (1 or 2).
+        :param columns: The BallColumns of the match, with room for this innings from start onwards.
+        :param start: The index of the first ball of this innings in the buffers.
+        :param player_codes: The PlayerCodes of the match, shared by its innings. If None, names are resolved for this innings alone.
+        :return: The number of balls written.
+        """
         team_batting = self.innings_data["team"]
         team_bowling = list(set(self.meta.teams) - {team_batting})[0]
         result = 0
@@ -58,141 +108,136 @@ class InningsProcessor:
         elif self.meta.winner == None:
             result = 0.5
 
-        current_score = 0
-        bat_powerplay_runs = 0
-        bat_non_powerplay_runs = 0
-
-        wickets_lost = 0
-        powerplay_wickets = 0
-        non_powerplay_wickets = 0
-
-        wides = 0
-        noballs = 0
-        legbyes = 0
-        byes = 0
-        penalties = 0
-
-        bat_dict = dict()
-        bowl_dict = dict()
-
-        for over_idx, over in enumerate(self.innings_data["overs"]):
-            for ball_idx, delivery in enumerate(over["deliveries"]):
-            
-                processor = BallProcessor(delivery, self.registry)
-                row = processor.get_data()
-
-                if row["batter_id"] not in bat_dict.keys():
-                    bat_dict[row["batter_id"]] = dict()
-                    bat_dict[row["batter_id"]]["balls"] = 0
-                    bat_dict[row["batter_id"]]["runs"] = 0
-                    bat_dict[row["batter_id"]]["dots"] = 0
-                    bat_dict[row["batter_id"]]["singles"] = 0
-                    bat_dict[row["batter_id"]]["twos"] = 0
-                    bat_dict[row["batter_id"]]["threes"] = 0
-                    bat_dict[row["batter_id"]]["fours"] = 0
-                    bat_dict[row["batter_id"]]["sixes"] = 0
-   
-                if row["non_striker_id"] not in bat_dict.keys():
-                    bat_dict[row["non_striker_id"]] = dict()
-                    bat_dict[row["non_striker_id"]]["balls"] = 0
-                    bat_dict[row["non_striker_id"]]["runs"] = 0
-                    bat_dict[row["non_striker_id"]]["dots"] = 0
-                    bat_dict[row["non_striker_id"]]["singles"] = 0
-                    bat_dict[row["non_striker_id"]]["twos"] = 0
-                    bat_dict[row["non_striker_id"]]["threes"] = 0
-                    bat_dict[row["non_striker_id"]]["fours"] = 0
-                    bat_dict[row["non_striker_id"]]["sixes"] = 0
-                
-                if row["bowler_id"] not in bowl_dict.keys():
-                    bowl_dict[row["bowler_id"]] = dict()
-                    bowl_dict[row["bowler_id"]]["legal_balls"] = 0
-                    bowl_dict[row["bowler_id"]]["illegal_balls"] = 0
-                    bowl_dict[row["bowler_id"]]["total_balls"] = 0
-
-                    bowl_dict[row["bowler_id"]]["bat_runs"] = 0
-                    bowl_dict[row["bowler_id"]]["wides"] = 0
-                    bowl_dict[row["bowler_id"]]["noballs"] = 0
-                    bowl_dict[row["bowler_id"]]["wides"] = 0
-
-                    bowl_dict[row["bowler_id"]]["dots"] = 0
-                    bowl_dict[row["bowler_id"]]["singles"] = 0
-                    bowl_dict[row["bowler_id"]]["twos"] = 0
-                    bowl_dict[row["bowler_id"]]["threes"] = 0
-                    bowl_dict[row["bowler_id"]]["fours"] = 0
-                    bowl_dict[row["bowler_id"]]["sixes"] = 0
-
-                bat_runs = row["bat_runs"]
-                bowl_dict[row["bowler_id"]]["total_balls"] += 1
-                ball_key = ball_dict[bat_runs] if bat_runs in ball_dict.keys() else None
-
-                if row["wides"] > 0:
-                    bowl_dict[row["bowler_id"]]["illegal_balls"] += 1
-                    bowl_dict[row["bowler_id"]]["wides"] += row["wides"]
-
-                else:
-                    if row["noballs"] > 0:
-                        bowl_dict[row["bowler_id"]]["illegal_balls"] += 1
-                        bowl_dict[row["bowler_id"]]["noballs"] += row["noballs"]
-
-                    bat_dict[row["batter_id"]]["balls"] += 1
-                    bat_dict[row["batter_id"]]["runs"] += bat_runs
-                    
-                    bowl_dict[row["bowler_id"]]["bat_runs"] += bat_runs
-                    
-                    if ball_key != None:
-                        bowl_dict[row["bowler_id"]][ball_key] += 1
-                        bat_dict[row["batter_id"]][ball_key] += 1
-
-                current_score = row["ball_runs"] + current_score
-                bat_powerplay_runs = bat_powerplay_runs + (bat_runs if (self.powerplays != None and over_idx in self.powerplays) else 0)
-                bat_non_powerplay_runs = bat_powerplay_runs + (bat_runs if (self.powerplays == None or over_idx not in self.powerplays) else 0)
-
-
-                wickets_lost += row["dismissal"]
-                powerplay_wickets = powerplay_wickets + (row["dismissal"] if (self.powerplays != None and over_idx in self.powerplays) else 0)
-                non_powerplay_wickets = non_powerplay_wickets + (row["dismissal"] if (self.powerplays == None or over_idx not in self.powerplays) else 0)
-
-                wides += row["wides"]
-                byes += row["byes"]
-                noballs += row["noballs"]
-                legbyes += row["legbyes"]
-                penalties += row["penalties"]
-
-                row.update({
-                    "result": result,
-                    "inn_num": innings_num,
-                    "over_num": over_idx,
-                    "ball_num": ball_idx + 1,
-                    "bat_team": team_batting,
-                    "bowl_team": team_bowling,
-                    "current_score": current_score,
-
-                    "wickets_lost": wickets_lost,
-                    "powerplay_wickets": powerplay_wickets,
-                    "non_powerplay_wickets": non_powerplay_wickets,
-                    
-                    "current_score": current_score,
-                    "bat_powerplay_runs": bat_powerplay_runs,
-                    "bat_non_powerplay_runs": bat_non_powerplay_runs,
-
-                    "total_wides": wides,
-                    "total_noballs": noballs,
-                    "total_penalties": penalties,
-                    "total_legbyes": legbyes,
-                    "total_byes": byes,
-                    
-                    "total_score": 0,
-                    "powerplay": False if (self.powerplays == None or over_idx not in self.powerplays) else True
-                })
-
-                bowler_data = {f"bowler_{k}": v for k, v in bowl_dict[row["bowler_id"]].items()}
-                batter_data = {f"batter_{k}": v for k, v in bat_dict[row["batter_id"]].items()}
-                nonstriker_data = {f"non_striker_{k}": v for k, v in bat_dict[row["non_striker_id"]].items()}
-
-                row = {**self.meta.match_keys(), **row, **bowler_data, **batter_data, **nonstriker_data}
-
-                self.ball_rows.append(row)
-
-        for row in self.ball_rows:
-            row["total_score"] = current_score
-        return self.ball_rows
\ No newline at end of file
+        if player_codes is None:
+            player_codes = PlayerCodes(self.registry, columns)
+        deliveries_per_over = []
+        rows = []
+        for over in self.innings_data["overs"]:
+            deliveries_per_over.append(len(over["deliveries"]))
+            for delivery in over["deliveries"]:
+                rows.append(BallProcessor.get_events(delivery, player_codes, columns))
+
+        num_balls = len(rows)
+        end = start + num_balls
+        if num_balls == 0:
+            return 0
+
+        events = dict(zip(EVENT_KEYS, np.array(rows, dtype=np.int32).T))
+        deliveries_per_over = np.array(deliveries_per_over)
+        events["over_num"] = np.repeat(np.arange(len(deliveries_per_over)), deliveries_per_over)
+        events["ball_num"] = np.arange(num_balls) - np.repeat(np.cumsum(deliveries_per_over) - deliveries_per_over, deliveries_per_over) + 1
+
+        bat_runs = events["bat_runs"]
+        dismissal = events["dismissal"]
+        wides = events["wides"]
+        noballs = events["noballs"]
+
+        if self.powerplays != None:
+            powerplay = np.isin(events["over_num"], self.powerplays)
+        else:
+            powerplay = np.zeros(num_balls, dtype=bool)
+
+        values = {
+            "dismissal": dismissal,
+            "bat_runs": bat_runs,
+            "ball_runs": events["ball_runs"],
+            "result": result,
+            "inn_num": innings_num,
+            "over_num": events["over_num"],
+            "ball_num": events["ball_num"],
+            "powerplay": powerplay
+        }
+        for key in EXTRA_TYPES:
+            values[key] = events[key]
+        # Lean columns leave the running totals out, so they are not calculated
+        if "current_score" in columns.arrays:
+            values.update(InningsProcessor._get_running_totals(events, powerplay))
+
+        for key, value in values.items():
+            columns.arrays[key][start:end] = value
+
+        for key in ["batter", "bowler", "non_striker", "player_out"]:
+            columns.arrays[f"{key}_id"][start:end] = events[key]
+        columns.arrays["dismissal_type"][start:end] = events["dismissal_type"]
+        columns.arrays["bat_team"][start:end] = columns.get_code("teams", team_batting)
+        columns.arrays["bowl_team"][start:end] = columns.get_code("teams", team_bowling)
+
+        return num_balls
+
+    @staticmethod
+    def _get_running_totals(events: dict, powerplay):
+        """
+        Calculates the running totals of the innings, batters and bowler after every ball with cumulative sums.
+        :param events: A dictionary of arrays holding the EVENT_KEYS of every ball.
+        :param powerplay: A boolean array, True for balls bowled in a powerplay.
+        :return: A dictionary mapping each of RUNNING_TOTAL_COLUMNS to its values.
+        """
+        num_balls = len(powerplay)
+        bat_runs = events["bat_runs"]
+        dismissal = events["dismissal"]
+        wides = events["wides"]
+        noballs = events["noballs"]
+
+        # Deliveries faced by the batter (everything except wides) and how many runs they scored off them
+        faced = wides == 0
+        faced_runs = np.where(faced, bat_runs, 0)
+        run_keys = np.stack([faced & (bat_runs == runs) for runs in ball_dict.keys()], axis=1)
+
+        bat_increments = np.column_stack([faced, faced_runs, run_keys])
+        bowl_increments = np.column_stack([
+            faced & (noballs == 0),
+            (wides > 0) | (noballs > 0),
+            np.ones(num_balls, dtype=bool),
+            faced_runs,
+            wides,
+            np.where(faced, noballs, 0),
+            run_keys
+        ])
+
+        # Strikers and non-strikers share one set of batting totals
+        _, bat_codes = np.unique(np.concatenate([events["batter"], events["non_striker"]]), return_inverse=True)
+        batter_idx, non_striker_idx = bat_codes[:num_balls], bat_codes[num_balls:]
+        _, bowler_idx = np.unique(events["bowler"], return_inverse=True)
+
+        batter_totals = InningsProcessor._running_totals(batter_idx, bat_codes.max() + 1, bat_increments)
+        bowler_totals = InningsProcessor._running_totals(bowler_idx, bowler_idx.max() + 1, bowl_increments)
+        rows = np.arange(num_balls)
+
+        current_score = np.cumsum(events["ball_runs"])
+        values = {
+            "current_score": current_score,
+
+            "wickets_lost": np.cumsum(dismissal),
+            "powerplay_wickets": np.cumsum(np.where(powerplay, dismissal, 0)),
+            "non_powerplay_wickets": np.cumsum(np.where(powerplay, 0, dismissal)),
+
+            "bat_powerplay_runs": np.cumsum(np.where(powerplay, bat_runs, 0)),
+            "bat_non_powerplay_runs": np.cumsum(np.where(powerplay, 0, bat_runs)),
+
+            "total_wides": np.cumsum(wides),
+            "total_noballs": np.cumsum(noballs),
+            "total_penalties": np.cumsum(events["penalties"]),
+            "total_legbyes": np.cumsum(events["legbyes"]),
+            "total_byes": np.cumsum(events["byes"]),
+
+            "total_score": current_score[-1]
+        }
+        for i, key in enumerate(BOWL_STAT_KEYS):
+            values[f"bowler_{key}"] = bowler_totals[rows, bowler_idx, i]
+        for i, key in enumerate(BAT_STAT_KEYS):
+            values[f"batter_{key}"] = batter_totals[rows, batter_idx, i]
+            values[f"non_striker_{key}"] = batter_totals[rows, non_striker_idx, i]
+        return values
+
+    @staticmethod
+    def _running_totals(players, num_players, increments):
+        """
+        Calculates every player's running totals after each ball.
+        :param players: The code (from 0 to num_players - 1) of the player credited on each ball.
+        :param num_players: The number of players in the innings.
+        :param increments: A (balls, stats) array of the amount each ball adds to the credited player's stats.
+        :return: A (balls, players, stats) array of every player's totals after each ball.
+        """
+        totals = np.zeros((len(players), num_players, increments.shape[1]), dtype=np.int32)
+        totals[np.arange(len(players)), players] = increments
+        return np.cumsum(totals, axis=0)
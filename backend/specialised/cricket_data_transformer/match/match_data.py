@@ -6,7 +6,9 @@ import os
 
 from .match_meta import MatchMeta
 from .player_registry import PlayerRegistry
-from.innings_processor import InningsProcessor
+from .innings_processor import InningsProcessor, PlayerCodes
+from .ball_columns import BallColumns
+from .ball_schema import MATCH_SCHEMA, LEAN_MATCH_SCHEMA
 
 
 class MatchData:
@@ -20,30 +22,51 @@ class MatchData:
     Date: 2025-08-19
     """
 
-    def __init__(self, match_dict: dict):
+    def __init__(self, match_dict: dict, lean: bool = False):
         """
         Initializes the MatchData with match metadata, player registry, and innings data.
         :param match_dict: A dictionary containing match data, including metadata, player registry, and innings data.
+        :param lean: If True, the running totals are left out and the balls follow LEAN_MATCH_SCHEMA.
         """
         self.match_dict = match_dict
         self.file_path = match_dict["file_name"]
         self.df = None
 
-        self.meta = MatchMeta(match_dict["info"])
+        self.meta = MatchMeta(match_dict["info"], MatchData.get_match_id(self.file_path))
         self.meta.validate_overs(self.file_path)
 
         self.registry = PlayerRegistry(match_dict["info"]["registry"]["people"])
 
-        self.ball_data = dict()
-        counter = 0
-        for i, innings in enumerate(match_dict["innings"]):
-            processor = InningsProcessor(innings, self.meta, self.registry)
-            inn_data = processor.process(i + 1)
-            for ball in inn_data:
-                self.ball_data[counter] = ball
-                counter += 1
+        processors = [InningsProcessor(innings, self.meta, self.registry) for innings in match_dict["innings"]]
+        self.columns = BallColumns(sum(processor.count_deliveries() for processor in processors), self.meta,
+                                   LEAN_MATCH_SCHEMA if lean else MATCH_SCHEMA)
 
-        
+        # Player names are resolved once for the whole match
+        player_codes = PlayerCodes(self.registry, self.columns)
+        start = 0
+        for i, processor in enumerate(processors):
+            start += processor.process_columns(i + 1, self.columns, start, player_codes)
+
+        self._ball_data = None
+
+    @property
+    def ball_data(self):
+        """
+        A dictionary of the processed balls keyed by their index in the match, built from the column buffers on first use.
+        """
+        if self._ball_data is None:
+            self._ball_data = dict(enumerate(self.columns.to_rows()))
+        return self._ball_data
+
+    @staticmethod
+    def get_match_id(file_path: str) -> int:
+        """
+        Returns the cricsheet match ID of a match file, which is the file name without its extension.
+        :param file_path: The path or name of the match file.
+        :return: The match ID as an integer.
+        :raises ValueError: If the file name is not a cricsheet match ID.
+        """
+        return int(os.path.splitext(os.path.basename(file_path))[0])
 
     def get_dataframe(self):
         """
@@ -52,10 +75,15 @@ class MatchData:
         :return: A DataFrame containing the match data.
         """
         if self.df is None:
-            self.df = pd.DataFrame(self.ball_data.values())
+            self.df = self.to_record_batch().to_pandas()
         return self.df
-    
-    
+
+    def to_record_batch(self):
+        """
+        Returns the processed match data as an Arrow record batch, the compact form handed back by ingest workers.
+        :return: A RecordBatch following MATCH_SCHEMA (or LEAN_MATCH_SCHEMA) with one row per ball.
+        """
+        return self.columns.to_record_batch()
 
     
     
@@ -1,3 +1,5 @@
+import datetime
+
 
 class MatchMeta:
     """
@@ -6,28 +8,32 @@ class MatchMeta:
     Author: Jonathan Farrand
     Date: 2025-08-19
     """
-    def __init__(self, info: dict):
+    def __init__(self, info: dict, match_id: int = None):
         """
         Initializes the MatchMeta with match information.
         :param info: A dictionary containing match details such as
             - gender
             - season
             - venue
-            - date
+            - dates (the days the match was played on, as ISO dates)
             - team_type
             - match_type
             - overs
             - event
             - teams
             - outcome (including winner)
+        :param match_id: The cricsheet ID of the match, taken from its file name.
         
         Author: Jonathan Farrand
         Date: 2025-08-19
         """
+        self.match_id = match_id
         self.gender = info.get("gender")
         self.season = str(info.get("season"))
         self.venue = info.get("venue", "").lower()
-        self.date = info.get("date")
+        # Cricsheet lists every day of the match, and the match is dated by its first day
+        dates = info.get("dates") or [None]
+        self.date = datetime.date.fromisoformat(str(dates[0])) if dates[0] is not None else None
         self.team_type = info.get("team_type", "").lower()
         self.match_type = info.get("match_type", "").lower()
         self.overs = info.get("overs")
@@ -55,6 +61,8 @@ class MatchMeta:
         :return: A dictionary containing match metadata.
         """
         return {
+            "match_id": self.match_id,
+            "date": self.date,
             "gender": self.gender,
             "season": self.season,
             "venue": self.venue,
@@ -1,17 +1,243 @@
+import numpy as np
+import pandas as pd
+from ..state_statistics import StateStatistics
+from ..player_summaries import BOWLER_DISMISSALS
 
+# Columns identifying an innings, which every card row starts with
+INNINGS_KEYS = ["match_id", "inn_num"]
+# Ball-by-ball columns needed to build scorecards
+SCORECARD_COLUMNS = INNINGS_KEYS + [
+    "over_num", "bat_team", "bowl_team", "batter_id", "non_striker_id", "bowler_id", "player_out_id",
+    "dismissal", "dismissal_type", "bat_runs", "wides", "noballs"
+]
+# Balls counted by the number of runs the batter scored from them
+RUN_COUNTS = {"dots": 0, "singles": 1, "twos": 2, "threes": 3, "fours": 4, "sixes": 6}
 
 
 class Scorecard:
     """
-    A class to represent a cricket match scorecard.
-    It stores batting and bowling scores, and provides methods to add scores and retrieve them.
-    
+    A class to represent the scorecards of any number of cricket matches.
+    Batting and bowling cards of every innings are built at once, with one grouped pass over the balls for each card,
+    and kept as two tidy tables ordered by match, innings and batting or bowling order,
+    so the cards of a single match or innings are found by a binary search rather than a filter.
+
     Author: Jonathan Farrand
     Date: 2025-08-19
     """
-    def __init__(self):
-        self.bat_scores = dict()
-        self.bowl_scores = dict()
-        self.scores = []
-        
-        pass
+    def __init__(self, ball_by_ball_data: pd.DataFrame):
+        """
+        Initializes the Scorecard with ball-by-ball data.
+        :param ball_by_ball_data: A DataFrame of ball-by-ball data holding at least SCORECARD_COLUMNS, with the balls
+        of each innings in order. Player columns can hold player keys (-1 when there is no player) or player IDs.
+        """
+        self.ball_by_ball = ball_by_ball_data
+        self.batting = None
+        self.bowling = None
+        self._match_ids = dict()
+
+    def build(self) -> "Scorecard":
+        """
+        Builds the batting and bowling cards of every innings.
+        :return: The Scorecard, for chaining.
+        """
+        self.batting = self._batting_card()
+        self.bowling = self._bowling_card()
+        self._match_ids = {
+            "batting": self.batting["match_id"].to_numpy(dtype=np.int64),
+            "bowling": self.bowling["match_id"].to_numpy(dtype=np.int64)
+        }
+        return self
+
+    def _batting_card(self) -> pd.DataFrame:
+        """
+        Builds the batting card of every innings.
+        Everyone who came to the crease is on the card, including batters who were not out and those who were
+        out without facing a ball. Each ball gives a row for the striker and one for the non-striker, and each
+        dismissal a row for the batter who was out, which are then summed by (match, innings, batter) in one pass.
+        :return: A DataFrame with one row per batter in each innings, holding match_id, inn_num, bat_team, batter_id,
+        position (batting order, from 1), runs, balls, the RUN_COUNTS columns, strike_rate (runs per 100 balls),
+        dismissed, dismissal_type and bowler_id (the bowler credited with the dismissal, if any).
+        """
+        data = self.ball_by_ball
+        num_balls = len(data)
+        bat_runs = data["bat_runs"].to_numpy(dtype=np.int64)
+        faced = data["wides"].to_numpy(dtype=np.int64) == 0
+        dismissal = data["dismissal"].to_numpy(dtype=np.int64) > 0
+        credited = dismissal & data["dismissal_type"].isin(BOWLER_DISMISSALS).to_numpy(dtype=bool, na_value=False)
+        no_dismissal = np.zeros(num_balls, dtype=bool)
+
+        def appearances(players: pd.Series, rows: np.ndarray, order: np.ndarray, counted: bool, out: bool) -> pd.DataFrame:
+            # Rows of the players on the given balls, holding what they scored if counted and how they were out if out
+            appearance = pd.DataFrame({
+                "match_id": data["match_id"].iloc[rows].to_numpy(),
+                "inn_num": data["inn_num"].iloc[rows].to_numpy(),
+                "bat_team": data["bat_team"].iloc[rows].reset_index(drop=True),
+                "batter_id": players.iloc[rows].reset_index(drop=True),
+                "order": order[rows],
+                "runs": bat_runs[rows] if counted else 0,
+                "balls": faced[rows] if counted else False
+            })
+            for name, runs in RUN_COUNTS.items():
+                appearance[name] = (faced[rows] & (bat_runs[rows] == runs)) if counted else False
+            appearance["dismissed"] = out
+            appearance["dismissal_type"] = data["dismissal_type"].where(dismissal if out else no_dismissal).iloc[rows].reset_index(drop=True)
+            appearance["bowler_id"] = Scorecard._players_where(data["bowler_id"], credited if out else no_dismissal).iloc[rows].reset_index(drop=True)
+            return appearance
+
+        order = 2 * np.arange(num_balls)
+        all_rows = np.arange(num_balls)
+        player_out = data["player_out_id"]
+        rows = pd.concat([
+            appearances(data["batter_id"], all_rows, order, True, False),
+            appearances(data["non_striker_id"], np.flatnonzero(Scorecard._has_player(data["non_striker_id"])), order + 1, False, False),
+            appearances(player_out, np.flatnonzero(dismissal & Scorecard._has_player(player_out)), order, False, True)
+        ], ignore_index=True)
+
+        counts = ["runs", "balls"] + list(RUN_COUNTS) + ["dismissed"]
+        # Dismissal rows come last, so the last row of a batter who was out holds how they were out
+        card = StateStatistics(rows).aggregate(
+            INNINGS_KEYS + ["bat_team", "batter_id"],
+            {
+                "order": ("order", "min"),
+                **{count: (count, "sum") for count in counts},
+                "dismissal_type": ("dismissal_type", "last"),
+                "bowler_id": ("bowler_id", "last")
+            },
+            sort=False
+        )
+        card = card.astype({count: np.int64 for count in counts}).astype({"dismissed": bool})
+        card["strike_rate"] = Scorecard._divide(100 * card["runs"], card["balls"])
+        return Scorecard._number(card, "position", [
+            "match_id", "inn_num", "bat_team", "batter_id", "position", "runs", "balls", *RUN_COUNTS, "strike_rate",
+            "dismissed", "dismissal_type", "bowler_id"
+        ])
+
+    def _bowling_card(self) -> pd.DataFrame:
+        """
+        Builds the bowling card of every innings.
+        The balls are summed by (match, innings, bowler, over) to find maidens, then those overs by (match, innings, bowler).
+        :return: A DataFrame with one row per bowler in each innings, holding match_id, inn_num, bowl_team, bowler_id,
+        position (bowling order, from 1), balls (legal balls), overs (such as 3.2 for 3 overs and 2 balls), maidens,
+        runs (conceded, including wides and no balls but not byes or leg byes), wickets, the RUN_COUNTS columns
+        (balls by the runs the batter scored from them), wides, noballs and economy (runs per 6 balls).
+        """
+        data = self.ball_by_ball
+        bat_runs = data["bat_runs"].to_numpy(dtype=np.int64)
+        wides = data["wides"].to_numpy(dtype=np.int64)
+        noballs = data["noballs"].to_numpy(dtype=np.int64)
+        legal = (wides == 0) & (noballs == 0)
+        dismissal = data["dismissal"].to_numpy(dtype=np.int64) > 0
+
+        balls = pd.DataFrame({key: data[key] for key in INNINGS_KEYS + ["bowl_team", "bowler_id", "over_num"]})
+        balls["order"] = np.arange(len(data))
+        balls["balls"] = legal
+        balls["runs"] = bat_runs + wides + noballs
+        balls["wickets"] = dismissal & data["dismissal_type"].isin(BOWLER_DISMISSALS).to_numpy(dtype=bool, na_value=False)
+        for name, runs in RUN_COUNTS.items():
+            balls[name] = (wides == 0) & (bat_runs == runs)
+        balls["wides"] = wides > 0
+        balls["noballs"] = noballs > 0
+
+        counts = ["balls", "runs", "wickets"] + list(RUN_COUNTS) + ["wides", "noballs"]
+        bowler_keys = INNINGS_KEYS + ["bowl_team", "bowler_id"]
+        overs = StateStatistics(balls).aggregate(
+            bowler_keys + ["over_num"],
+            {"order": ("order", "min"), **{count: (count, "sum") for count in counts}},
+            sort=False
+        )
+        overs["maidens"] = (overs["balls"] >= 6) & (overs["runs"] == 0)
+        card = StateStatistics(overs).aggregate(
+            bowler_keys,
+            {"order": ("order", "min"), **{count: (count, "sum") for count in counts + ["maidens"]}},
+            sort=False
+        )
+        card = card.astype({count: np.int64 for count in counts + ["maidens"]})
+        card["overs"] = card["balls"] // 6 + (card["balls"] % 6) / 10
+        card["economy"] = Scorecard._divide(6 * card["runs"], card["balls"])
+        return Scorecard._number(card, "position", [
+            "match_id", "inn_num", "bowl_team", "bowler_id", "position", "balls", "overs", "maidens", "runs", "wickets",
+            *RUN_COUNTS, "wides", "noballs", "economy"
+        ])
+
+    def get_match(self, match_id: int) -> tuple:
+        """
+        Returns the cards of a single match, building the cards first if needed.
+        :param match_id: The ID of the match.
+        :return: A tuple of the batting and bowling cards of the match, empty if it is not found.
+        """
+        if self.batting is None:
+            self.build()
+        return self._find("batting", match_id), self._find("bowling", match_id)
+
+    def get_innings(self, match_id: int, inn_num: int) -> tuple:
+        """
+        Returns the cards of a single innings, building the cards first if needed.
+        :param match_id: The ID of the match.
+        :param inn_num: The number of the innings, from 1.
+        :return: A tuple of the batting and bowling cards of the innings, empty if it is not found.
+        """
+        batting, bowling = self.get_match(match_id)
+        return (
+            batting[batting["inn_num"].to_numpy() == inn_num].reset_index(drop=True),
+            bowling[bowling["inn_num"].to_numpy() == inn_num].reset_index(drop=True)
+        )
+
+    def _find(self, card: str, match_id: int) -> pd.DataFrame:
+        """
+        Finds the rows of a match in a card.
+        :param card: Either batting or bowling.
+        :param match_id: The ID of the match.
+        :return: The rows of the match.
+        """
+        match_ids = self._match_ids[card]
+        start = np.searchsorted(match_ids, match_id, side="left")
+        end = np.searchsorted(match_ids, match_id, side="right")
+        return getattr(self, card).iloc[start:end].reset_index(drop=True)
+
+    @staticmethod
+    def _number(card: pd.DataFrame, name: str, columns: list) -> pd.DataFrame:
+        """
+        Orders a card by innings then by the order column, and numbers the rows of each innings from 1.
+        :param card: The card, holding INNINGS_KEYS and an order column.
+        :param name: The name of the column holding the numbers.
+        :param columns: The columns of the card to return, in order.
+        :return: The ordered card.
+        """
+        card = card.sort_values(INNINGS_KEYS + ["order"], ignore_index=True)
+        innings = card[INNINGS_KEYS].to_numpy(dtype=np.int64)
+        starts = np.flatnonzero(np.r_[True, (innings[1:] != innings[:-1]).any(axis=1)]) if len(card) > 0 else np.zeros(0, dtype=np.int64)
+        card[name] = np.arange(len(card)) - np.repeat(starts, np.diff(np.r_[starts, len(card)])) + 1
+        return card[columns]
+
+    @staticmethod
+    def _has_player(players: pd.Series) -> np.ndarray:
+        """
+        :param players: A player column, holding player keys or player IDs.
+        :return: A boolean array, True where there is a player.
+        """
+        if pd.api.types.is_integer_dtype(players.dtype):
+            return players.to_numpy() >= 0
+        return players.notna().to_numpy()
+
+    @staticmethod
+    def _players_where(players: pd.Series, keep: np.ndarray) -> pd.Series:
+        """
+        Removes players from the rows that are not kept.
+        :param players: A player column, holding player keys or player IDs.
+        :param keep: A boolean array, True for the rows to keep.
+        :return: The column, with -1 (for player keys) or a missing value (for player IDs) in rows that are not kept.
+        """
+        if pd.api.types.is_integer_dtype(players.dtype):
+            return players.where(keep, -1)
+        return players.where(keep)
+
+    @staticmethod
+    def _divide(numerator: pd.Series, denominator: pd.Series) -> np.ndarray:
+        """
+        Divides counts, giving NaN rather than infinity where the denominator is 0.
+        :param numerator: The numerator counts.
+        :param denominator: The denominator counts.
+        :return: The ratios.
+        """
+        numerator, denominator = numerator.to_numpy(dtype=np.float64), denominator.to_numpy(dtype=np.float64)
+        return np.divide(numerator, denominator, out=np.full(len(numerator), np.nan), where=denominator != 0)
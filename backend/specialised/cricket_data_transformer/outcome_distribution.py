@@ -1,23 +1,48 @@
 import pandas as pd
+import numpy as np
 from src.config import BALL_BY_BALL_FILE_PATH
+from src.interactors.feather_interactor import FeatherInteractor
+from src.result_cache import ResultCache
 
 
 class OutcomeDistribution:
     """
     Class to calculate outcome distributions from ball-by-ball data.
     It provides methods to calculate distributions based on key-value pairs and to compute conditional probabilities.
+    Filters on the data given at initialization are answered from an index of the rows holding each value of a column,
+    built the first time the column is filtered on, so the data is never copied or scanned again.
+    If a ResultCache is given, results for that data are kept on disk between sessions.
 
     Author: Jonathan Farrand
     Date: 2025-07-14
     """
-    def __init__(self, ball_by_ball_data: pd.DataFrame):
+    def __init__(self, ball_by_ball_data: pd.DataFrame, cache: ResultCache = None):
         """
         Initializes the OutcomeDistribution class with ball-by-ball data.
         :param ball_by_ball_data: A DataFrame containing ball-by-ball data.
+        :param cache: The cache to keep results in, see Setup.get_result_cache. If None, results are not kept.
         """
         self.ball_by_ball = ball_by_ball_data
+        self.cache = cache
+        self._column_indexes = dict()
         pass
 
+    def _cached(self, method: str, params: dict, compute, ball_by_ball: pd.DataFrame, to_frame=None, from_frame=None):
+        """
+        Returns the result of a method from the cache, computing and storing it if it is not there.
+        Results for data other than the data given at initialization are never cached.
+        :param method: The name of the method.
+        :param params: The parameters of the method.
+        :param compute: A function taking no arguments that computes the result.
+        :param ball_by_ball: The DataFrame the method was called with.
+        :param to_frame: A function converting the result to a DataFrame, see ResultCache.get_or_compute.
+        :param from_frame: A function converting a DataFrame back to a result, see ResultCache.get_or_compute.
+        :return: The result of the method.
+        """
+        if self.cache is None or (ball_by_ball is not None and ball_by_ball is not self.ball_by_ball):
+            return compute()
+        return self.cache.get_or_compute(f"OutcomeDistribution.{method}", params, compute, to_frame, from_frame)
+
     def distribution(self, key_value_pairs: dict, distribution_key, ball_by_ball: pd.DataFrame = None):
         """
         Calculates the distribution of a specified key in the ball-by-ball data,
@@ -25,14 +50,21 @@ class OutcomeDistribution:
         :param key_value_pairs: A dictionary of key-value pairs to filter the DataFrame.
         :param distribution_key: The key for which the distribution is calculated.
         """
-        if ball_by_ball == None:
+        return self._cached(
+            "distribution",
+            {"key_value_pairs": key_value_pairs, "distribution_key": distribution_key},
+            lambda: self._distribution(key_value_pairs, distribution_key, ball_by_ball),
+            ball_by_ball,
+            to_frame=lambda result: pd.DataFrame({"value": list(result.keys()), "count": list(result.values())}),
+            from_frame=lambda frame: dict(zip(frame["value"].tolist(), frame["count"].tolist()))
+        )
+
+    def _distribution(self, key_value_pairs: dict, distribution_key, ball_by_ball: pd.DataFrame = None):
+        if ball_by_ball is None:
             ball_by_ball = self.ball_by_ball
-        
-        adj_df = ball_by_ball.copy()
-        for key, value in key_value_pairs.items():
-            adj_df: pd.DataFrame = adj_df[(adj_df[key] == value)]
-        
-        return adj_df[distribution_key].value_counts().to_dict()
+
+        rows = self.select_rows(key_value_pairs, ball_by_ball)
+        return ball_by_ball[distribution_key].iloc[rows].value_counts().to_dict()
     
     def conditional_distribution_probability(
         self,
@@ -52,13 +84,34 @@ class OutcomeDistribution:
         The keys are tuples of the group_by_key and the value of the distribution_key,
         and the values are the probabilities of the distribution_key given the group_by_key.
         """
+        return self._cached(
+            "conditional_distribution_probability",
+            {"key_value_pairs": key_value_pairs, "distribution_key": distribution_key, "group_by_key": group_by_key},
+            lambda: self._conditional_distribution_probability(key_value_pairs, distribution_key, group_by_key, ball_by_ball),
+            ball_by_ball,
+            to_frame=lambda result: pd.DataFrame({
+                "group": [key[0] for key in result.keys()],
+                "value": [key[1] for key in result.keys()],
+                "probability": list(result.values())
+            }),
+            from_frame=lambda frame: dict(zip(
+                zip(frame["group"].tolist(), frame["value"].tolist()), frame["probability"].tolist()
+            ))
+        )
+
+    def _conditional_distribution_probability(
+        self,
+        key_value_pairs: dict,
+        distribution_key: str,
+        group_by_key: str,
+        ball_by_ball: pd.DataFrame = None
+    ):
         if ball_by_ball is None:
             ball_by_ball = self.ball_by_ball
 
-        # Apply filters first
-        adj_df = ball_by_ball.copy()
-        for key, value in key_value_pairs.items():
-            adj_df = adj_df[adj_df[key] == value]
+        # Apply filters first, only taking the two columns needed for the selected rows
+        rows = self.select_rows(key_value_pairs, ball_by_ball)
+        adj_df = ball_by_ball[list(dict.fromkeys([group_by_key, distribution_key]))].iloc[rows]
 
         if adj_df.empty:
             return {}
@@ -72,9 +125,157 @@ class OutcomeDistribution:
 
         return probs
     
+    def select_rows(self, key_value_pairs: dict, ball_by_ball: pd.DataFrame = None) -> np.ndarray:
+        """
+        Finds the rows where every key equals its value.
+        For the data given at initialization, the filter with the fewest rows is looked up in its column index,
+        then only those rows are checked against the other filters, so the work done is roughly the size of the result.
+        :param key_value_pairs: A dictionary of key-value pairs to filter by.
+        :param ball_by_ball: The DataFrame to filter. If None, the data given at initialization is used.
+        :return: The positions of the matching rows, in ascending order.
+        """
+        if ball_by_ball is None:
+            ball_by_ball = self.ball_by_ball
+
+        if ball_by_ball is not self.ball_by_ball:
+            mask = np.ones(len(ball_by_ball), dtype=bool)
+            for key, value in key_value_pairs.items():
+                mask &= (ball_by_ball[key] == value).to_numpy(dtype=bool, na_value=False)
+            return np.flatnonzero(mask)
+
+        if len(key_value_pairs) == 0:
+            return np.arange(len(ball_by_ball))
+
+        filters = []
+        for key, value in key_value_pairs.items():
+            codes, value_codes, order, starts, counts = self._get_column_index(key)
+            code = value_codes.get(value, -1)
+            size = counts[code] if code >= 0 else 0
+            filters.append((size, codes, code, order, starts))
+
+        filters.sort(key=lambda column_filter: column_filter[0])
+        size, _, code, order, starts = filters[0]
+        if size == 0:
+            return np.zeros(0, dtype=np.int64)
+        rows = order[starts[code]:starts[code] + size]
+        for _, codes, code, _, _ in filters[1:]:
+            rows = rows[codes[rows] == code]
+        return rows
+
+    def _get_column_index(self, key: str) -> tuple:
+        """
+        Returns the index of a column of the data given at initialization, building it on first use.
+        :param key: The column to index.
+        :return: A tuple of the code of each row's value (-1 if missing), a dictionary mapping values to codes,
+        the rows sorted by code, and the start and count of each code's rows in that order.
+        """
+        if key not in self._column_indexes:
+            codes, values = pd.factorize(self.ball_by_ball[key])
+            counts = np.bincount(codes[codes >= 0], minlength=len(values))
+            # Rows with missing values sort first and are never selected
+            starts = np.cumsum(counts) - counts + np.count_nonzero(codes < 0)
+            order = np.argsort(codes, kind="stable")
+            value_codes = {value: code for code, value in enumerate(values)}
+            self._column_indexes[key] = (codes, value_codes, order, starts, counts)
+        return self._column_indexes[key]
+
+    def batch_conditional_distribution(self, specs: list, ball_by_ball: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Calculates many conditional distribution probabilities at once, such as the dismissal, boundary and dot ball
+        probabilities for every over of every event.
+        Specs with the same filters share one row selection, and specs that also share their distribution and
+        group by keys share one grouped count, so each distinct query only scans its selected rows once.
+        :param specs: A list of (key_value_pairs, distribution_key, target_values, group_by_key) tuples.
+        key_value_pairs filter the DataFrame as in distribution, and target_values is a list of the values of the
+        distribution_key to return, or None to return every value seen.
+        :param ball_by_ball: The DataFrame containing ball-by-ball data. If None, the data given at initialization is used.
+        :return: A DataFrame with one row per spec, group and value, holding the spec's position in specs,
+        the group_by_key and group, the distribution_key and value, the count of the value in the group,
+        the number of rows in the group and the probability of the value given the group.
+        Rows are ordered by spec, group and value. Every target value is returned for every group, with a count of 0
+        if it never occurs there, while groups with a missing group_by_key value are left out.
+        """
+        return self._cached(
+            "batch_conditional_distribution",
+            {"specs": specs},
+            lambda: self._batch_conditional_distribution(specs, ball_by_ball),
+            ball_by_ball
+        )
+
+    def _batch_conditional_distribution(self, specs: list, ball_by_ball: pd.DataFrame = None) -> pd.DataFrame:
+        if ball_by_ball is None:
+            ball_by_ball = self.ball_by_ball
+
+        selections = dict()
+        counts = dict()
+        results = []
+        for spec_num, (key_value_pairs, distribution_key, target_values, group_by_key) in enumerate(specs):
+            filter_key = tuple(sorted(key_value_pairs.items(), key=lambda pair: pair[0]))
+            if filter_key not in selections:
+                selections[filter_key] = self.select_rows(key_value_pairs, ball_by_ball)
+            rows = selections[filter_key]
+
+            count_key = (filter_key, distribution_key, group_by_key)
+            if count_key not in counts:
+                counts[count_key] = OutcomeDistribution._count_pairs(ball_by_ball, rows, distribution_key, group_by_key)
+            groups, values, pair_counts = counts[count_key]
+
+            if target_values is None:
+                group_codes, value_codes = np.nonzero(pair_counts[:, :-1])
+                targets = values[value_codes]
+            else:
+                value_lookup = {value: code for code, value in enumerate(values)}
+                # Targets that never occur point at a column of zeros after the missing value column
+                target_codes = np.array([value_lookup.get(value, len(values) + 1) for value in target_values], dtype=np.int64)
+                group_codes = np.repeat(np.arange(len(groups)), len(target_codes))
+                value_codes = np.tile(target_codes, len(groups))
+                targets = np.tile(np.array(target_values, dtype=object), len(groups))
+
+            # The count table's column after the values holds rows with a missing distribution value, and is never a target
+            group_totals = pair_counts.sum(axis=1)
+            value_counts = np.hstack([pair_counts, np.zeros((len(groups), 1), dtype=np.int64)])[group_codes, value_codes]
+            results.append(pd.DataFrame({
+                "spec": spec_num,
+                "group_by_key": group_by_key,
+                "group": groups[group_codes],
+                "distribution_key": distribution_key,
+                "value": targets,
+                "count": value_counts,
+                "group_count": group_totals[group_codes],
+                "probability": value_counts / group_totals[group_codes]
+            }))
+
+        if len(results) == 0:
+            return pd.DataFrame(columns=[
+                "spec", "group_by_key", "group", "distribution_key", "value", "count", "group_count", "probability"
+            ])
+        return pd.concat(results, ignore_index=True)
+
+    @staticmethod
+    def _count_pairs(ball_by_ball: pd.DataFrame, rows: np.ndarray, distribution_key: str, group_by_key: str) -> tuple:
+        """
+        Counts every (group, value) pair of the selected rows in one pass.
+        :param ball_by_ball: The DataFrame containing ball-by-ball data.
+        :param rows: The positions of the selected rows.
+        :param distribution_key: The key whose values are counted.
+        :param group_by_key: The key by which the rows are grouped.
+        :return: A tuple of the sorted groups, the sorted values, and a table of counts with a row per group and a
+        column per value, plus a last column counting rows where the value is missing.
+        """
+        group_codes, groups = pd.factorize(ball_by_ball[group_by_key].iloc[rows], sort=True)
+        value_codes, values = pd.factorize(ball_by_ball[distribution_key].iloc[rows], sort=True)
+        grouped = group_codes >= 0
+        value_codes = np.where(value_codes >= 0, value_codes, len(values))[grouped]
+        pair_counts = np.bincount(
+            group_codes[grouped] * (len(values) + 1) + value_codes,
+            minlength=len(groups) * (len(values) + 1)
+        ).reshape(len(groups), len(values) + 1)
+        return np.asarray(groups, dtype=object), np.asarray(values, dtype=object), pair_counts
+
     def tidied_conditional_distribution_probability(self, key_value_pairs: dict, distribution_key: dict, group_by_key: str, ball_by_ball: pd.DataFrame = None):
         """
         Tidies the conditional distribution probability results by filtering based on a single key-value pair.
+        Only the target value is counted, see batch_conditional_distribution.
         :param key_value_pairs: A dictionary of key-value pairs to filter the DataFrame.
         :param distribution_key: A dictionary with a single key-value pair to filter the results.
         :param group_by_key: The key by which the DataFrame is grouped.
@@ -85,19 +286,17 @@ class OutcomeDistribution:
         if len(distribution_key.keys()) > 1:
             return None
         temp_key = list(distribution_key.keys())[0]
-        results = self.conditional_distribution_probability(key_value_pairs, temp_key, group_by_key, ball_by_ball)
-
-        tidied_results = dict()
         tar_val = list(distribution_key.values())[0]
-        for k, v in results.items():
-            if (k[1] == tar_val):
-                tidied_results[k[0]] = v
-        return tidied_results
+        results = self.batch_conditional_distribution(
+            [(key_value_pairs, temp_key, [tar_val], group_by_key)], ball_by_ball
+        )
 
+        results = results[results["count"] > 0]
+        return dict(zip(results["group"], results["probability"]))
 
 
 if __name__ == "__main__":
-    ball_by_ball_data = pd.read_feather(f"{BALL_BY_BALL_FILE_PATH}t20.feather")
+    ball_by_ball_data = FeatherInteractor.get_feather(f"{BALL_BY_BALL_FILE_PATH}t20", memory_map=True)
     outcome_distribution = OutcomeDistribution(ball_by_ball_data)
     pairs = dict()
     pairs["inn_num"] = 1
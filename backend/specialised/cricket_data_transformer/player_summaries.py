@@ -0,0 +1,245 @@
+import numpy as np
+import pandas as pd
+import os
+from src.config import PLAYER_SUMMARIES_PATH
+from src.interactors.parquet_interactor import ParquetInteractor
+from .state_statistics import StateStatistics
+
+# Columns every summary is split by, alongside the player and their team
+SUMMARY_KEYS = ["season", "event", "match_type", "gender", "team_type"]
+# Ball-by-ball columns needed to summarise players
+SUMMARY_COLUMNS = [
+    "batter_id", "bowler_id", "player_out_id", "bat_team", "bowl_team", "bat_runs", "wides", "noballs",
+    "dismissal", "dismissal_type"
+] + SUMMARY_KEYS
+# Dismissals credited to the bowler
+BOWLER_DISMISSALS = ["bowled", "caught", "caught and bowled", "lbw", "stumped", "hit wicket"]
+
+BATTING_COUNTS = ["balls_faced", "runs_scored", "dismissals", "dots", "fours", "sixes"]
+BOWLING_COUNTS = ["balls_bowled", "runs_conceded", "wickets", "dots", "fours", "sixes"]
+
+
+class PlayerSummaries:
+    """
+    Class to keep batting and bowling summaries of every player, team, season and event as Parquet tables,
+    so queries read a table of players rather than every ball.
+    Only counts are stored (such as balls faced, runs and dismissals), which add up across matches, so new matches
+    are added and removed matches taken away without summarising every ball again.
+    Rates such as strike rate and dismissals per 100 balls are calculated from the counts when a table is read.
+
+    Author: Jonathan Farrand
+    Date: 2026-10-18
+    """
+    def __init__(self, location: str = PLAYER_SUMMARIES_PATH):
+        """
+        Initializes the PlayerSummaries class.
+        :param location: The folder holding the batting and bowling tables.
+        """
+        self.location = location
+
+    def exists(self) -> bool:
+        """
+        Checks whether both tables have been built.
+        :return: True if the batting and bowling tables exist.
+        """
+        return all(os.path.exists(self._table_location(table)) for table in ["batting", "bowling"])
+
+    def build(self, ball_by_ball_frames) -> None:
+        """
+        Builds both tables from scratch, replacing any existing tables.
+        :param ball_by_ball_frames: An iterable of DataFrames of ball-by-ball data holding at least SUMMARY_COLUMNS,
+        such as one per format file, with no match split between them.
+        """
+        summaries = [PlayerSummaries.summarise(ball_by_ball) for ball_by_ball in ball_by_ball_frames]
+        self._save(
+            PlayerSummaries._combine([batting for batting, _ in summaries], BATTING_COUNTS),
+            PlayerSummaries._combine([bowling for _, bowling in summaries], BOWLING_COUNTS)
+        )
+
+    def update(self, removed: pd.DataFrame, added: pd.DataFrame) -> None:
+        """
+        Updates both tables, taking away the balls of removed matches and adding the balls of new matches.
+        A changed match is both removed (with its old balls) and added (with its new balls).
+        :param removed: A DataFrame of the balls of removed or changed matches, as they were summarised.
+        :param added: A DataFrame of the balls of new or changed matches.
+        :raises FileNotFoundError: If the tables have not been built.
+        """
+        removed_batting, removed_bowling = PlayerSummaries.summarise(removed)
+        added_batting, added_bowling = PlayerSummaries.summarise(added)
+        removed_batting[BATTING_COUNTS] *= -1
+        removed_bowling[BOWLING_COUNTS] *= -1
+
+        self._save(
+            PlayerSummaries._combine([self._read("batting"), added_batting, removed_batting], BATTING_COUNTS),
+            PlayerSummaries._combine([self._read("bowling"), added_bowling, removed_bowling], BOWLING_COUNTS)
+        )
+
+    @staticmethod
+    def summarise(ball_by_ball: pd.DataFrame) -> tuple:
+        """
+        Counts what every player did in ball-by-ball data, in one grouped pass for batting and one for bowling.
+        :param ball_by_ball: A DataFrame of ball-by-ball data holding at least SUMMARY_COLUMNS.
+        :return: A tuple of the batting counts, with a row per batter_id, bat_team and SUMMARY_KEYS,
+        and the bowling counts, with a row per bowler_id, bowl_team and SUMMARY_KEYS.
+        """
+        bat_runs = ball_by_ball["bat_runs"].to_numpy(dtype=np.int64)
+        wides = ball_by_ball["wides"].to_numpy(dtype=np.int64) > 0
+        legal = ~wides & (ball_by_ball["noballs"].to_numpy(dtype=np.int64) == 0)
+        dismissal = ball_by_ball["dismissal"].to_numpy(dtype=np.int64) > 0
+        player_out = ball_by_ball["player_out_id"].to_numpy(dtype=np.int64)
+        keys = {key: ball_by_ball[key] for key in SUMMARY_KEYS}
+
+        # Batters are out on the ball they faced, except when the non-striker is run out, so dismissals
+        # are counted from rows of their own for whoever was out
+        faced = pd.DataFrame({"batter_id": ball_by_ball["batter_id"], "bat_team": ball_by_ball["bat_team"], **keys})
+        faced["balls_faced"] = ~wides
+        faced["runs_scored"] = bat_runs
+        faced["dismissals"] = 0
+        faced["dots"] = ~wides & (bat_runs == 0)
+        faced["fours"] = bat_runs == 4
+        faced["sixes"] = bat_runs == 6
+        outs = faced.iloc[np.flatnonzero(dismissal & (player_out >= 0))].copy()
+        outs["batter_id"] = player_out[dismissal & (player_out >= 0)].astype(np.int32)
+        outs[["balls_faced", "runs_scored", "dots", "fours", "sixes"]] = 0
+        outs["dismissals"] = 1
+        batting = pd.concat([faced, outs], ignore_index=True)
+
+        runs_conceded = bat_runs + ball_by_ball["wides"].to_numpy(dtype=np.int64) + ball_by_ball["noballs"].to_numpy(dtype=np.int64)
+        bowling = pd.DataFrame({"bowler_id": ball_by_ball["bowler_id"], "bowl_team": ball_by_ball["bowl_team"], **keys})
+        bowling["balls_bowled"] = legal
+        bowling["runs_conceded"] = runs_conceded
+        bowling["wickets"] = dismissal & ball_by_ball["dismissal_type"].isin(BOWLER_DISMISSALS).to_numpy(dtype=bool, na_value=False)
+        bowling["dots"] = legal & (runs_conceded == 0)
+        bowling["fours"] = bat_runs == 4
+        bowling["sixes"] = bat_runs == 6
+
+        return (
+            PlayerSummaries._sum(batting, ["batter_id", "bat_team"] + SUMMARY_KEYS, BATTING_COUNTS),
+            PlayerSummaries._sum(bowling, ["bowler_id", "bowl_team"] + SUMMARY_KEYS, BOWLING_COUNTS)
+        )
+
+    @staticmethod
+    def _sum(counts: pd.DataFrame, group_keys: list, count_columns: list) -> pd.DataFrame:
+        """
+        Sums counts by group.
+        :param counts: A DataFrame holding the group keys and count columns.
+        :param group_keys: The columns to group by.
+        :param count_columns: The columns to sum.
+        :return: A DataFrame with one row per group, sorted by the group keys, holding the group keys and summed counts.
+        """
+        summed = StateStatistics(counts).aggregate(group_keys, {column: (column, "sum") for column in count_columns})
+        return summed.astype({column: np.int64 for column in count_columns})
+
+    @staticmethod
+    def _combine(summaries: list, count_columns: list) -> pd.DataFrame:
+        """
+        Adds summaries together, dropping players left with nothing, such as those whose only match was removed.
+        :param summaries: The summaries to add together, with the same columns.
+        :param count_columns: The count columns of the summaries.
+        :return: The combined summary.
+        """
+        non_empty = [summary for summary in summaries if len(summary) > 0]
+        if len(non_empty) == 0:
+            return summaries[0].iloc[:0] if len(summaries) > 0 else pd.DataFrame()
+        summaries = non_empty
+        group_keys = [column for column in summaries[0].columns if column not in count_columns]
+        for key in group_keys:
+            # Categories are unioned so the summaries stay categorical when they are joined
+            if any(isinstance(summary[key].dtype, pd.CategoricalDtype) for summary in summaries):
+                categories = pd.Index(pd.unique(pd.concat([summary[key].astype(object) for summary in summaries]).dropna()))
+                summaries = [summary.assign(**{key: pd.Categorical(summary[key].astype(object), categories)}) for summary in summaries]
+
+        combined = PlayerSummaries._sum(pd.concat(summaries, ignore_index=True), group_keys, count_columns)
+        return combined[(combined[count_columns] != 0).any(axis=1)].reset_index(drop=True)
+
+    def get_batting(self, filters=None, columns: list = None) -> pd.DataFrame:
+        """
+        Reads the batting table, with the rates of every row.
+        :param filters: The rows to read, in any form accepted by ParquetInteractor.to_expression,
+        such as {"event": "big bash league"}. If None, every row is read.
+        :param columns: The stored columns to read. If None, every column is read.
+        :return: A DataFrame of the batting counts, plus strike_rate (runs per 100 balls), dp100 (dismissals per 100 balls),
+        average, boundary_pct (share of runs from fours and sixes) and dot_pct, where their counts were read.
+        :raises FileNotFoundError: If the table has not been built.
+        """
+        batting = self._read("batting", filters, columns)
+        rates = {
+            "strike_rate": ("runs_scored", "balls_faced", 100),
+            "dp100": ("dismissals", "balls_faced", 100),
+            "average": ("runs_scored", "dismissals", 1),
+            "dot_pct": ("dots", "balls_faced", 1)
+        }
+        batting = PlayerSummaries._add_rates(batting, rates)
+        if {"fours", "sixes", "runs_scored"}.issubset(batting.columns):
+            batting["boundary_pct"] = PlayerSummaries._divide(4 * batting["fours"] + 6 * batting["sixes"], batting["runs_scored"])
+        return batting
+
+    def get_bowling(self, filters=None, columns: list = None) -> pd.DataFrame:
+        """
+        Reads the bowling table, with the rates of every row.
+        :param filters: The rows to read, see get_batting.
+        :param columns: The stored columns to read. If None, every column is read.
+        :return: A DataFrame of the bowling counts, plus economy (runs per 6 balls), average, strike_rate
+        (balls per wicket) and dot_pct, where their counts were read.
+        :raises FileNotFoundError: If the table has not been built.
+        """
+        rates = {
+            "economy": ("runs_conceded", "balls_bowled", 6),
+            "average": ("runs_conceded", "wickets", 1),
+            "strike_rate": ("balls_bowled", "wickets", 1),
+            "dot_pct": ("dots", "balls_bowled", 1)
+        }
+        return PlayerSummaries._add_rates(self._read("bowling", filters, columns), rates)
+
+    @staticmethod
+    def _add_rates(summary: pd.DataFrame, rates: dict) -> pd.DataFrame:
+        """
+        Adds rate columns to a summary.
+        :param summary: The summary.
+        :param rates: A dictionary mapping rate names to a tuple of the numerator column, denominator column and scale.
+        Rates whose columns were not read are skipped.
+        :return: The summary with the rates added.
+        """
+        for name, (numerator, denominator, scale) in rates.items():
+            if numerator in summary.columns and denominator in summary.columns:
+                summary[name] = scale * PlayerSummaries._divide(summary[numerator], summary[denominator])
+        return summary
+
+    @staticmethod
+    def _divide(numerator: pd.Series, denominator: pd.Series) -> np.ndarray:
+        """
+        Divides counts, giving NaN rather than infinity where the denominator is 0.
+        :param numerator: The numerator counts.
+        :param denominator: The denominator counts.
+        :return: The ratios.
+        """
+        numerator, denominator = numerator.to_numpy(dtype=np.float64), denominator.to_numpy(dtype=np.float64)
+        return np.divide(numerator, denominator, out=np.full(len(numerator), np.nan), where=denominator != 0)
+
+    def _table_location(self, table: str) -> str:
+        """
+        :param table: Either batting or bowling.
+        :return: The location of the table's Parquet file.
+        """
+        return os.path.join(self.location, f"{table}.parquet")
+
+    def _read(self, table: str, filters=None, columns: list = None) -> pd.DataFrame:
+        """
+        Reads a table.
+        :param table: Either batting or bowling.
+        :param filters: The rows to read. If None, every row is read.
+        :param columns: The columns to read. If None, every column is read.
+        :return: The table.
+        :raises FileNotFoundError: If the table has not been built.
+        """
+        return ParquetInteractor.get_parquet(self._table_location(table), filters, columns)
+
+    def _save(self, batting: pd.DataFrame, bowling: pd.DataFrame) -> None:
+        """
+        Saves both tables.
+        :param batting: The batting table.
+        :param bowling: The bowling table.
+        """
+        os.makedirs(self.location, exist_ok=True)
+        ParquetInteractor.save_parquet(batting, self._table_location("batting"))
+        ParquetInteractor.save_parquet(bowling, self._table_location("bowling"))
@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+
+
+# Aggregates accepted by StateStatistics.aggregate. quantile also takes the quantile to calculate
+AGGREGATES = ["count", "sum", "mean", "var", "min", "max", "first", "last", "quantile"]
+
+
+class StateStatistics:
+    """
+    Class to calculate statistics of values grouped by match state, such as the expected final score
+    for each combination of current score, balls remaining and wickets remaining.
+    The rows are grouped once by factorizing the state keys, then every statistic is calculated
+    for all states at once with NumPy rather than one row at a time.
+
+    Author: Jonathan Farrand
+    Date: 2026-10-18
+    """
+    def __init__(self, ball_by_ball_data: pd.DataFrame):
+        """
+        Initializes the StateStatistics class with ball-by-ball data.
+        :param ball_by_ball_data: A DataFrame containing ball-by-ball data.
+        """
+        self.ball_by_ball = ball_by_ball_data
+
+    def calculate(self, state_keys: list, value_key: str, quantiles: list = None) -> pd.DataFrame:
+        """
+        Calculates the mean, count, sample variance and quantiles of a value for every state.
+        :param state_keys: The columns that make up a state, such as ["current_score", "balls_remaining", "wickets_remaining"].
+        :param value_key: The column whose statistics are calculated, such as "total_score".
+        :param quantiles: The quantiles to calculate, between 0 and 1, using linear interpolation. If None, none are calculated.
+        :return: A DataFrame with one row per state, holding the state keys followed by the mean, count and var columns
+        and a quantile_{q} column for each quantile. The variance of states with one observation is NaN.
+        States are ordered the same way nested dictionaries built one row at a time would be, see group_states.
+        """
+        aggregates = {
+            "mean": (value_key, "mean"),
+            "count": (value_key, "count"),
+            "var": (value_key, "var")
+        }
+        for quantile in quantiles or []:
+            aggregates[f"quantile_{quantile}"] = (value_key, "quantile", quantile)
+        return self.aggregate(state_keys, aggregates, sort=False)
+
+    def aggregate(self, group_keys: list, aggregates: dict, sort: bool = True) -> pd.DataFrame:
+        """
+        Calculates any number of aggregates of any columns for every group in one pass.
+        Missing values are left out of every aggregate except first and last.
+        :param group_keys: The columns to group by.
+        :param aggregates: A dictionary mapping output column names to a tuple of the column to aggregate and one of
+        AGGREGATES, such as {"avg_runs": ("bat_runs", "mean"), "median_runs": ("bat_runs", "quantile", 0.5)}.
+        :param sort: If True, groups are sorted by their keys. Otherwise they are in nested first-appearance order, see group_states.
+        :return: A DataFrame with one row per group, holding the group keys followed by a column for each aggregate.
+        :raises ValueError: If an aggregate is not one of AGGREGATES.
+        """
+        groups, first_rows = StateStatistics.group_states(self.ball_by_ball, group_keys)
+        num_groups = len(first_rows)
+        result = {key: self.ball_by_ball[key].iloc[first_rows].reset_index(drop=True) for key in group_keys}
+
+        # Values of each column split by group, shared by every aggregate of that column
+        columns = dict()
+        for name, (column, function, *args) in aggregates.items():
+            if function not in AGGREGATES:
+                raise ValueError(f"Unknown aggregate '{function}' for '{name}', expected one of {AGGREGATES}")
+
+            if function in ["first", "last"]:
+                if "row_order" not in columns:
+                    row_order = np.argsort(groups, kind="stable")
+                    row_counts = np.bincount(groups, minlength=num_groups)
+                    columns["row_order"] = (row_order, np.cumsum(row_counts) - row_counts, row_counts)
+                row_order, starts, row_counts = columns["row_order"]
+                rows = row_order[starts] if function == "first" else row_order[starts + row_counts - 1]
+                result[name] = self.ball_by_ball[column].iloc[rows].reset_index(drop=True)
+                continue
+
+            if column not in columns:
+                columns[column] = StateStatistics._group_values(self.ball_by_ball[column], groups, num_groups)
+            split = columns[column]
+            counts = split["counts"]
+
+            if function == "count":
+                result[name] = counts
+            elif function == "sum":
+                result[name] = split["sums"]
+            elif function == "mean":
+                result[name] = np.divide(split["sums"], counts, out=np.full(num_groups, np.nan), where=counts > 0)
+            elif function == "var":
+                means = np.divide(split["sums"], counts, out=np.full(num_groups, np.nan), where=counts > 0)
+                deviations = split["values"] - means[split["groups"]]
+                squares = np.bincount(split["groups"], weights=deviations * deviations, minlength=num_groups)
+                result[name] = np.divide(squares, counts - 1, out=np.full(num_groups, np.nan), where=counts > 1)
+            else:
+                quantile = {"min": 0, "max": 1}.get(function, args[0] if args else None)
+                result[name] = StateStatistics._quantile(split, quantile)
+
+        result = pd.DataFrame(result)
+        if sort and len(group_keys) > 0:
+            result = result.sort_values(group_keys, ignore_index=True)
+        return result
+
+    @staticmethod
+    def _group_values(column: pd.Series, groups: np.ndarray, num_groups: int) -> dict:
+        """
+        Splits the values of a column by group, leaving out missing values.
+        :param column: The column to split.
+        :param groups: The group code of each row.
+        :param num_groups: The number of groups.
+        :return: A dictionary of the values and their groups, and the count and sum of each group.
+        """
+        values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        if not present.all():
+            values = values[present]
+            groups = groups[present]
+        return {
+            "values": values,
+            "groups": groups,
+            "counts": np.bincount(groups, minlength=num_groups),
+            "sums": np.bincount(groups, weights=values, minlength=num_groups)
+        }
+
+    @staticmethod
+    def _quantile(split: dict, quantile: float) -> np.ndarray:
+        """
+        Calculates a quantile of every group using linear interpolation, sorting the values by group on first use.
+        :param split: The values split by group, from _group_values.
+        :param quantile: The quantile to calculate, between 0 and 1.
+        :return: The quantile of each group, NaN for groups without values.
+        """
+        if quantile is None or not 0 <= quantile <= 1:
+            raise ValueError(f"Quantile must be between 0 and 1, not {quantile}")
+        if "sorted_values" not in split:
+            split["sorted_values"] = split["values"][np.lexsort((split["values"], split["groups"]))]
+        sorted_values = split["sorted_values"]
+        counts = split["counts"]
+        starts = np.cumsum(counts) - counts
+
+        present = counts > 0
+        quantiles = np.full(len(counts), np.nan)
+        position = quantile * (counts[present] - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, counts[present] - 1)
+        low_values = sorted_values[starts[present] + lower]
+        quantiles[present] = low_values + (sorted_values[starts[present] + upper] - low_values) * (position - lower)
+        return quantiles
+
+    @staticmethod
+    def group_states(ball_by_ball: pd.DataFrame, state_keys: list) -> tuple:
+        """
+        Gives every row the code of its state.
+        Codes follow nested first-appearance order: states are ordered by where the value of their first key
+        first appears, then within that by where the value of their second key first appears alongside it, and so on.
+        :param ball_by_ball: A DataFrame containing ball-by-ball data.
+        :param state_keys: The columns that make up a state.
+        :return: A tuple of an array holding the state code of each row, and an array holding the first row of each state.
+        """
+        groups = np.zeros(len(ball_by_ball), dtype=np.int64)
+        first_rows = np.zeros(min(len(ball_by_ball), 1), dtype=np.int64)
+        for key in state_keys:
+            key_codes, key_values = pd.factorize(ball_by_ball[key], use_na_sentinel=False)
+            # Codes of each (state so far, value) pair in the order the pairs first appear
+            pair_codes, pairs = pd.factorize(groups * len(key_values) + key_codes)
+            # Pairs sharing a state so far keep their first-appearance order, behind the states before them
+            order = np.lexsort((np.arange(len(pairs)), pairs // len(key_values)))
+            nested_codes = np.empty(len(pairs), dtype=np.int64)
+            nested_codes[order] = np.arange(len(pairs))
+            groups = nested_codes[pair_codes]
+
+            # A pair first appears on the rows where its code is higher than every code before it
+            is_first = np.ones(len(pair_codes), dtype=bool)
+            is_first[1:] = pair_codes[1:] > np.maximum.accumulate(pair_codes)[:-1]
+            first_rows = np.flatnonzero(is_first)[order]
+
+        return groups, first_rows
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+from src.config import WIN_PROBABILITY_FILE_PATH
+from src.interactors.numpy_interactor import NumpyInteractor
+from .markov_solver import MarkovSolver, SMOOTHING
+
+
+class WinProbability:
+    """
+    Class to calculate the probability of the chasing team winning from every (runs required, balls left, wickets left)
+    state of a second innings, and to look it up for any number of states at once.
+    Each state's observed results (1 for a win, 0.5 for a tie or no result and 0 for a loss, from the result column)
+    are shrunk towards the chance a MarkovSolver fitted to second innings gives of scoring the runs required,
+    so sparse and unobserved states still get a sensible probability.
+    The grid can be saved and loaded as a .npy file, so it only has to be built once.
+
+    Author: Jonathan Farrand
+    Date: 2026-10-18
+    """
+    def __init__(self, ball_by_ball_data: pd.DataFrame = None, max_balls: int = 120, max_wickets: int = 10, smoothing: float = SMOOTHING):
+        """
+        Initializes the WinProbability class with ball-by-ball data.
+        :param ball_by_ball_data: A DataFrame containing ball-by-ball data of both innings of matches of one format, in ball order.
+        Only needed to build the grid, not to use a loaded one.
+        :param max_balls: The number of legal balls in an innings, such as 120 for T20s or 300 for one day matches.
+        :param max_wickets: The number of wickets in an innings.
+        :param smoothing: The weight, in balls, of the MarkovSolver probability each state's results are shrunk towards.
+        """
+        self.ball_by_ball = ball_by_ball_data
+        self.max_balls = max_balls
+        self.max_wickets = max_wickets
+        self.smoothing = smoothing
+        self.grid = None
+        self.observations = None
+
+    def build(self) -> "WinProbability":
+        """
+        Builds the grid of win probabilities from the second innings of the ball-by-ball data.
+        Called by every lookup the first time one is made if the grid has not been built or loaded.
+        :return: The WinProbability, for chaining.
+        """
+        chases = self._chase_states(self.ball_by_ball)
+        chase_balls = self.ball_by_ball.iloc[np.flatnonzero(self.ball_by_ball["inn_num"].to_numpy(dtype=np.int64) == 2)]
+        distribution = MarkovSolver(chase_balls, self.max_balls, self.max_wickets, self.smoothing).solve().run_distribution
+
+        # Chance of scoring at least the runs required, plus half the chance of scoring one fewer and tying
+        survival = np.zeros(distribution.shape[:2] + (distribution.shape[2] + 1,))
+        survival[:, :, :-1] = np.cumsum(distribution[:, :, ::-1], axis=2)[:, :, ::-1]
+        prior = survival.copy()
+        prior[:, :, 1:] += 0.5 * distribution
+        prior[:, :, 0] = 1
+        prior = np.clip(prior, 0, 1).transpose(2, 0, 1)
+
+        cells = np.ravel_multi_index((
+            np.minimum(chases["runs_required"], prior.shape[0] - 1), chases["balls_left"], chases["wickets_left"]
+        ), prior.shape)
+        counts = np.bincount(cells, minlength=prior.size).reshape(prior.shape)
+        wins = np.bincount(cells, weights=chases["result"], minlength=prior.size).reshape(prior.shape)
+
+        self.observations = counts
+        self.grid = ((wins + self.smoothing * prior) / (counts + self.smoothing)).astype(np.float32)
+        return self
+
+    def _chase_states(self, ball_by_ball: pd.DataFrame) -> dict:
+        """
+        Finds the state each second innings ball was bowled in.
+        The target is one more than the final score of the match's first innings, so revised targets are not used.
+        :param ball_by_ball: A DataFrame containing ball-by-ball data, in ball order.
+        :return: A dictionary of arrays holding the position of each second innings ball with a target that was
+        bowled before the innings ended (rows), and its runs_required, balls_left, wickets_left and result.
+        """
+        innings_nums = ball_by_ball["inn_num"].to_numpy(dtype=np.int64)
+        first_innings = np.flatnonzero(innings_nums == 1)
+        chase_rows = np.flatnonzero(innings_nums == 2)
+        targets = ball_by_ball["total_score"].iloc[first_innings].groupby(
+            ball_by_ball["match_id"].iloc[first_innings].to_numpy(dtype=np.int64)
+        ).first() + 1
+
+        chase_balls = ball_by_ball.iloc[chase_rows]
+        balls = MarkovSolver.get_ball_outcomes(chase_balls, self.max_balls, self.max_wickets)
+        match_targets = targets.reindex(chase_balls["match_id"].to_numpy(dtype=np.int64)).to_numpy(dtype=np.float64, na_value=np.nan)
+        score_before = chase_balls["current_score"].to_numpy(dtype=np.int64) - balls["runs"]
+        runs_required = match_targets - score_before
+
+        valid = balls["in_innings"] & (runs_required >= 1)
+        return {
+            "rows": chase_rows[valid],
+            "runs_required": runs_required[valid].astype(np.int64),
+            "balls_left": self.max_balls - balls["balls_bowled"][valid],
+            "wickets_left": self.max_wickets - balls["wickets_lost"][valid],
+            "result": chase_balls["result"].to_numpy(dtype=np.float64, na_value=np.nan)[valid]
+        }
+
+    def save(self, location: str = WIN_PROBABILITY_FILE_PATH) -> None:
+        """
+        Saves the grid, building it first if needed.
+        :param location: The location of the .npy file (without extension).
+        """
+        if self.grid is None:
+            self.build()
+        NumpyInteractor.save_array(self.grid, location)
+
+    @staticmethod
+    def load(location: str = WIN_PROBABILITY_FILE_PATH, memory_map: bool = False) -> "WinProbability":
+        """
+        Loads a saved grid.
+        :param location: The location of the .npy file (without extension).
+        :param memory_map: If True, the grid is memory-mapped rather than read.
+        :return: A WinProbability holding the grid, with max_balls and max_wickets taken from its shape.
+        :raises FileNotFoundError: If the file is not found.
+        """
+        grid = NumpyInteractor.get_array(location, memory_map)
+        win_probability = WinProbability(max_balls=grid.shape[1] - 1, max_wickets=grid.shape[2] - 1)
+        win_probability.grid = grid
+        return win_probability
+
+    def get_win_probability(self, runs_required, balls_left, wickets_left):
+        """
+        Looks up the probability of the chasing team winning, with a tie or no result counted as half a win.
+        :param runs_required: The runs the chasing team still needs, as an int or an array (or Series).
+        Teams needing 0 or fewer runs have won, and runs required beyond the grid are treated as its last row.
+        :param balls_left: The legal balls left, as an int or an array of the same shape.
+        :param wickets_left: The wickets left, as an int or an array of the same shape.
+        :return: The win probability of each state, as a float or an array.
+        """
+        if self.grid is None:
+            self.build()
+        runs_required = np.clip(np.asarray(runs_required, dtype=np.int64), 0, self.grid.shape[0] - 1)
+        balls_left = np.clip(np.asarray(balls_left, dtype=np.int64), 0, self.max_balls)
+        wickets_left = np.clip(np.asarray(wickets_left, dtype=np.int64), 0, self.max_wickets)
+        return self.grid[runs_required, balls_left, wickets_left]
+
+    def annotate(self, ball_by_ball: pd.DataFrame = None) -> pd.Series:
+        """
+        Looks up the win probability of the chasing team before every second innings ball in one gather.
+        :param ball_by_ball: A DataFrame containing ball-by-ball data, in ball order. If None, the data given at initialization is used.
+        :return: A Series with the same index as the data, holding the win probability of second innings balls
+        bowled with a target before the innings ended, and NaN for every other ball.
+        """
+        if ball_by_ball is None:
+            ball_by_ball = self.ball_by_ball
+        chases = self._chase_states(ball_by_ball)
+
+        win_probabilities = np.full(len(ball_by_ball), np.nan)
+        win_probabilities[chases["rows"]] = self.get_win_probability(
+            chases["runs_required"], chases["balls_left"], chases["wickets_left"]
+        )
+        return pd.Series(win_probabilities, index=ball_by_ball.index, name="win_probability")
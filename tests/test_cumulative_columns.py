@@ -0,0 +1,53 @@
+import unittest
+from src.specialised.cricket_data_transformer.cumulative_columns import CumulativeColumns, CUMULATIVE_COLUMNS
+import pandas as pd
+
+
+class TestCumulativeColumns(unittest.TestCase):
+    def setUp(self):
+        # Batter 1 hits a four, faces a wide and takes a single, then batter 2 is out first ball to a new bowler.
+        # Batter 1 bats again in the second innings, whose ball is stored among the first innings' balls
+        self.data = pd.DataFrame({
+            'match_id': [1, 1, 1, 1, 1],
+            'inn_num': [1, 1, 2, 1, 1],
+            'batter_id': [1, 1, 1, 1, 2],
+            'non_striker_id': [2, 2, 3, 2, 1],
+            'bowler_id': [10, 10, 2, 10, 11],
+            'dismissal': [0, 0, 0, 0, 1],
+            'bat_runs': [4, 0, 2, 1, 0],
+            'ball_runs': [4, 1, 2, 1, 0],
+            'wides': [0, 1, 0, 0, 0],
+            'noballs': [0] * 5,
+            'byes': [0] * 5,
+            'legbyes': [0] * 5,
+            'penalties': [0] * 5,
+            'powerplay': [True] * 5
+        })
+        pass
+
+    def test_innings_totals(self):
+        totals = CumulativeColumns(self.data).calculate(['current_score', 'wickets_lost', 'total_score', 'total_wides'])
+
+        self.assertEqual(totals['current_score'].tolist(), [4, 5, 2, 6, 6])
+        self.assertEqual(totals['wickets_lost'].tolist(), [0, 0, 0, 0, 1])
+        self.assertEqual(totals['total_score'].tolist(), [6, 6, 2, 6, 6])
+        self.assertEqual(totals['total_wides'].tolist(), [0, 1, 0, 1, 1])
+
+    def test_player_totals(self):
+        totals = CumulativeColumns(self.data).calculate()
+
+        self.assertEqual(totals['batter_runs'].tolist(), [4, 4, 2, 5, 0])
+        self.assertEqual(totals['batter_balls'].tolist(), [1, 1, 1, 2, 1])
+        self.assertEqual(totals['non_striker_runs'].tolist(), [0, 0, 0, 0, 5])
+        self.assertEqual(totals['non_striker_balls'].tolist(), [0, 0, 0, 0, 2])
+        self.assertEqual(totals['bowler_legal_balls'].tolist(), [1, 1, 1, 2, 1])
+        self.assertEqual(totals['bowler_wides'].tolist(), [0, 1, 0, 1, 0])
+        self.assertEqual(list(totals.columns), list(CUMULATIVE_COLUMNS))
+
+    def test_get_requested(self):
+        self.assertEqual(CumulativeColumns.get_requested(['match_id', 'current_score']), ['current_score'])
+        self.assertEqual(len(CumulativeColumns.get_requested()), len(CUMULATIVE_COLUMNS))
+
+
+if __name__ == '__main__':
+    unittest.main()
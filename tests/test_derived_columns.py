@@ -0,0 +1,47 @@
+import unittest
+from src.specialised.cricket_data_transformer.derived_columns import DerivedColumns
+import pandas as pd
+import numpy as np
+
+
+class TestDerivedColumns(unittest.TestCase):
+    def setUp(self):
+        # A T20 where the first innings scores 5 off a wide and a four then loses a wicket, and the chase
+        # hits a six off the first ball of the 16th over. The last ball is from a test match
+        self.data = pd.DataFrame({
+            'match_id': [1, 1, 1, 1, 2],
+            'inn_num': [1, 1, 1, 2, 1],
+            'match_type': ['t20', 't20', 't20', 't20', 'test'],
+            'over_num': [0, 0, 0, 15, 0],
+            'wides': [1, 0, 0, 0, 0],
+            'noballs': [0] * 5,
+            'current_score': [1, 5, 5, 6, 0],
+            'wickets_lost': [0, 0, 1, 0, 0],
+            'total_score': [5, 5, 5, 6, 0]
+        })
+        pass
+
+    def test_ball_counts(self):
+        columns = DerivedColumns(self.data)
+
+        self.assertEqual(columns.get('legal_ball').tolist(), [False, True, True, True, True])
+        self.assertEqual(columns.get('legal_balls_bowled').tolist(), [0, 1, 2, 1, 1])
+        self.assertEqual(columns.get('balls_remaining').tolist(), [120, 119, 118, 119, -1])
+        self.assertEqual(columns.get('wickets_remaining').tolist(), [10, 10, 9, 10, 10])
+
+    def test_target_and_phase(self):
+        ball_data = DerivedColumns(self.data).add(['runs_to_target', 'phase'])
+
+        self.assertTrue(np.isnan(ball_data['runs_to_target'].iloc[:3]).all())
+        self.assertEqual(ball_data['runs_to_target'].iloc[3], 0)
+        self.assertEqual(ball_data['phase'].tolist()[:4], ['powerplay'] * 3 + ['death'])
+        self.assertTrue(pd.isna(ball_data['phase'].iloc[4]))
+
+    def test_get_dependencies(self):
+        self.assertEqual(DerivedColumns.get_dependencies(['balls_remaining']), ['match_type', 'match_id', 'inn_num', 'wides', 'noballs'])
+        self.assertEqual(DerivedColumns.get_requested(['match_id', 'phase']), ['phase'])
+        self.assertEqual(DerivedColumns.get_requested(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from src.setup import Setup
+from src.config import BALL_BY_BALL_FILE_PATH, BALL_BY_BALL_MANIFEST_FILE_PATH, MATCH_FORMATS
+from src.interactors.match_source import FolderMatchSource
+from src.interactors.json_interactor import JSONInteractor
+import pandas as pd
+import contextlib
+import tempfile
+import json
+import io
+import os
+
+
+def make_match(teams: list, date: str, runs: list) -> dict:
+    """
+    Makes a T20 match where each team faces one over, the batter scoring runs[i] off ball i and the last ball taking a wicket.
+    """
+    people = {f"{team} {player}": f"{team[:2]}{player}".lower() for team in teams for player in range(3)}
+    innings = []
+    for i, team in enumerate(teams):
+        bowler = f"{teams[1 - i]} 2"
+        deliveries = [
+            {"batter": f"{team} 0", "bowler": bowler, "non_striker": f"{team} 1", "runs": {"batter": run, "extras": 0, "total": run}}
+            for run in runs
+        ]
+        deliveries[-1]["wickets"] = [{"player_out": f"{team} 0", "kind": "bowled"}]
+        innings.append({"team": team, "overs": [{"over": 0, "deliveries": deliveries}]})
+    return {
+        "meta": {"data_version": "1.1.0"},
+        "info": {
+            "dates": [date], "event": {"name": "test league"}, "gender": "male", "match_type": "T20", "overs": 20,
+            "season": date[:4], "team_type": "club", "teams": teams, "venue": "Ground", "outcome": {"winner": teams[0]},
+            "registry": {"people": people}
+        },
+        "innings": innings
+    }
+
+
+class TestIncrementalIngest(unittest.TestCase):
+    def setUp(self):
+        # Setup writes to paths relative to the working directory
+        self.folder = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.folder.name)
+        for directory in ["./data/setup/matches", "./data/setup/created", "./data/setup/other"]:
+            os.makedirs(directory)
+        self.source = FolderMatchSource("./data/setup/matches")
+
+        self.write(1001, make_match(["Alpha", "Beta"], "2024-03-01", [1, 4, 0, 6, 2, 0]))
+        self.write(1002, make_match(["Gamma", "Delta"], "2024-01-01", [0, 0, 1, 1, 4, 0]))
+        self.write(1003, make_match(["Alpha", "Gamma"], "2024-02-01", [6, 6, 0, 1, 0, 0]))
+        pass
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.folder.cleanup()
+
+    def write(self, match_id: int, match: dict):
+        with open(f"./data/setup/matches/{match_id}.json", "w") as file:
+            json.dump(match, file)
+
+    def ingest(self, incremental: bool) -> str:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(io.StringIO()):
+            Setup().json_to_ball_by_ball_method(False, incremental=incremental, decoder="json", source=self.source)
+        return output.getvalue()
+
+    def read_output(self) -> tuple:
+        balls = {
+            match_format: pd.read_feather(f"{BALL_BY_BALL_FILE_PATH}{match_format}.feather")
+            for match_format in MATCH_FORMATS
+        }
+        return balls, JSONInteractor.load_json_file_as_dict(BALL_BY_BALL_MANIFEST_FILE_PATH)
+
+    def test_incremental_matches_full_rebuild(self):
+        self.ingest(False)
+        # Match 1001 changes, 1002 is removed and 1004 is added
+        self.write(1001, make_match(["Alpha", "Beta"], "2024-03-01", [4, 4, 4, 0, 0, 0]))
+        os.remove("./data/setup/matches/1002.json")
+        self.write(1004, make_match(["Epsilon", "Beta"], "2023-12-01", [2, 2, 0, 0, 1, 0]))
+        self.ingest(True)
+        balls, manifest = self.read_output()
+
+        self.assertEqual(balls["t20"]["match_id"].unique().tolist(), [1004, 1003, 1001])
+        self.assertEqual(sorted(manifest["files"]), ["1001.json", "1003.json", "1004.json"])
+
+        self.ingest(False)
+        rebuilt_balls, rebuilt_manifest = self.read_output()
+        for match_format in MATCH_FORMATS:
+            # Dictionaries of updated files can still hold the teams and venues of dropped matches, so only values are compared
+            pd.testing.assert_frame_equal(balls[match_format], rebuilt_balls[match_format], check_categorical=False)
+        self.assertEqual(manifest, rebuilt_manifest)
+
+    def test_unchanged_ingest_is_a_no_op(self):
+        self.ingest(False)
+        self.ingest(True)
+        modified = {match_format: os.path.getmtime(f"{BALL_BY_BALL_FILE_PATH}{match_format}.feather") for match_format in MATCH_FORMATS}
+        balls, manifest = self.read_output()
+
+        output = self.ingest(True)
+        after_balls, after_manifest = self.read_output()
+
+        self.assertIn("up to date", output)
+        for match_format in MATCH_FORMATS:
+            self.assertEqual(os.path.getmtime(f"{BALL_BY_BALL_FILE_PATH}{match_format}.feather"), modified[match_format])
+            pd.testing.assert_frame_equal(balls[match_format], after_balls[match_format])
+        self.assertEqual(manifest, after_manifest)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from src.specialised.cricket_data_transformer.innings_simulator import InningsSimulator
+import pandas as pd
+
+
+class TestInningsSimulator(unittest.TestCase):
+    def setUp(self):
+        # Innings of six legal balls, alternating between dots and fours
+        self.data = pd.DataFrame({
+            'match_id': [1] * 6 + [2] * 6,
+            'inn_num': [1] * 12,
+            'ball_runs': [0, 4] * 6,
+            'wides': [0] * 12,
+            'noballs': [0] * 12,
+            'dismissal': [0] * 12,
+            'wickets_lost': [0] * 12
+        })
+        pass
+
+    def test_scores_follow_outcomes(self):
+        simulator = InningsSimulator(self.data, max_balls=6, max_wickets=2, smoothing=0.0001)
+        scores, wickets = simulator.simulate(20000, seed=1, batch_size=5000)
+
+        self.assertEqual(scores["innings"].sum(), 20000)
+        self.assertEqual(wickets.loc[0, "innings"], 20000)
+        # Every ball is a dot or a four with equal chance, so scores are 4 times a Binomial(6, 0.5)
+        self.assertEqual(set(scores[scores["innings"] > 0]["score"]), {0, 4, 8, 12, 16, 20, 24})
+        self.assertAlmostEqual((scores["score"] * scores["probability"]).sum(), 12, delta=0.2)
+
+    def test_seeded(self):
+        simulator = InningsSimulator(self.data, max_balls=6, max_wickets=2)
+        first = simulator.simulate(1000, seed=5, batch_size=300)
+        second = simulator.simulate(1000, seed=5, batch_size=300)
+
+        pd.testing.assert_frame_equal(first[0], second[0])
+        pd.testing.assert_frame_equal(first[1], second[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from src.specialised.cricket_data_transformer.ladder import Ladder
+import pandas as pd
+
+
+class TestLadder(unittest.TestCase):
+    def setUp(self):
+        # Two balls of each match. A beats B and C, and B and C tie, in one season; A beats B in the next
+        self.data = pd.DataFrame({
+            'match_id': [1, 1, 2, 2, 3, 3, 4, 4],
+            'bat_team': ['A', 'B', 'C', 'A', 'B', 'C', 'B', 'A'],
+            'bowl_team': ['B', 'A', 'A', 'C', 'C', 'B', 'A', 'B'],
+            'winner': ['A', 'A', 'A', 'A', None, None, 'A', 'A'],
+            'event': ['league'] * 8,
+            'season': ['2024'] * 6 + ['2025'] * 2
+        })
+        pass
+
+    def test_build(self):
+        ladders = Ladder(self.data).build()
+        first_season = ladders[ladders['season'] == '2024'].set_index('team')
+
+        self.assertEqual(len(ladders), 5)
+        self.assertEqual(first_season.loc['A', ['position', 'games', 'wins', 'draws', 'losses']].tolist(), [1, 2, 2, 0, 0])
+        self.assertEqual(first_season.loc['B', ['position', 'games', 'wins', 'draws', 'losses']].tolist(), [2, 2, 0, 1, 1])
+        self.assertEqual(first_season.loc['C', 'position'], 3)
+        self.assertAlmostEqual(first_season.loc['B', 'pct'], 0.25)
+        self.assertEqual(ladders[ladders['season'] == '2025']['team'].tolist(), ['A', 'B'])
+
+    def test_rank_joined_ladders(self):
+        ladders = Ladder(self.data).build()
+        joined = Ladder.rank(pd.concat([ladders.iloc[3:], ladders.iloc[:3]], ignore_index=True))
+
+        pd.testing.assert_frame_equal(joined.astype(str), ladders.astype(str))
+
+
+if __name__ == '__main__':
+    unittest.main()
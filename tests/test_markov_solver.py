@@ -0,0 +1,39 @@
+import unittest
+from src.specialised.cricket_data_transformer.markov_solver import MarkovSolver
+import pandas as pd
+import numpy as np
+
+
+class TestMarkovSolver(unittest.TestCase):
+    def setUp(self):
+        # Two innings of six legal singles, the second with a wide first
+        self.data = pd.DataFrame({
+            'match_id': [1] * 6 + [2] * 7,
+            'inn_num': [1] * 13,
+            'ball_runs': [1] * 13,
+            'wides': [0] * 6 + [1] + [0] * 6,
+            'noballs': [0] * 13,
+            'dismissal': [0] * 13,
+            'wickets_lost': [0] * 13
+        })
+        pass
+
+    def test_singles_every_ball(self):
+        solver = MarkovSolver(self.data[self.data['wides'] == 0], max_balls=6, max_wickets=2, smoothing=0.0001).solve()
+
+        np.testing.assert_allclose(solver.get_expected_runs(np.arange(7), 2), np.arange(7), atol=1e-3)
+        self.assertAlmostEqual(solver.get_run_distribution(4, 1)[4], 1.0, places=3)
+        self.assertEqual(solver.get_expected_runs(6, 0), 0)
+
+    def test_extras_bowl_the_state_again(self):
+        solver = MarkovSolver(self.data, max_balls=6, max_wickets=2, smoothing=0.0001).solve()
+
+        # With six balls left one ball in three is a wide, which adds a run without using a ball
+        self.assertAlmostEqual(solver.get_expected_runs(6, 2), 6.5, places=2)
+        self.assertEqual(solver.observations[6, 2], 3)
+        with self.assertRaises(IndexError):
+            solver.get_expected_runs(7, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from src.specialised.cricket_data_transformer.match.match_data import MatchData
+import pandas as pd
+
+
+def make_match(outcome: dict) -> dict:
+    """
+    Makes a T20 match where each team faces two balls, ending with the given outcome.
+    """
+    teams = ["Alpha", "Beta"]
+    people = {f"{team} {player}": f"{team[:2]}{player}".lower() for team in teams for player in range(3)}
+    innings = []
+    for i, team in enumerate(teams):
+        deliveries = [
+            {"batter": f"{team} 0", "bowler": f"{teams[1 - i]} 2", "non_striker": f"{team} 1", "runs": {"batter": run, "extras": 0, "total": run}}
+            for run in [4, 1]
+        ]
+        innings.append({"team": team, "overs": [{"over": 0, "deliveries": deliveries}]})
+    return {
+        "file_name": "1001.json",
+        "meta": {"data_version": "1.1.0"},
+        "info": {
+            "dates": ["2024-03-01"], "event": {"name": "test league"}, "gender": "male", "match_type": "T20", "overs": 20,
+            "season": "2024", "team_type": "club", "teams": teams, "venue": "Ground", "outcome": outcome,
+            "registry": {"people": people}
+        },
+        "innings": innings
+    }
+
+
+class TestMatchData(unittest.TestCase):
+    def test_dataframe_without_winner(self):
+        for outcome in [{"result": "tie"}, {"result": "no result"}]:
+            for lean in [False, True]:
+                df = MatchData(make_match(outcome), lean).get_dataframe()
+                self.assertEqual(len(df), 4)
+                self.assertTrue(df["winner"].isna().all())
+                self.assertEqual(len(df["winner"].cat.categories), 0)
+
+    def test_dataframe_with_winner(self):
+        df = MatchData(make_match({"winner": "Alpha"})).get_dataframe()
+        self.assertEqual(df["winner"].tolist(), ["Alpha"] * 4)
+        self.assertEqual(df["venue"].tolist(), ["ground"] * 4)
+        self.assertIsInstance(df["winner"].dtype, pd.CategoricalDtype)
+
+
+if __name__ == '__main__':
+    unittest.main()
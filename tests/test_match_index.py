@@ -0,0 +1,58 @@
+import unittest
+from src.match_index import MatchIndex
+from src.interactors.feather_interactor import FeatherInteractor
+import pyarrow as pa
+import datetime
+import tempfile
+import os
+
+
+class TestMatchIndex(unittest.TestCase):
+    def setUp(self):
+        # Match 3 is played first but written last, and match 2 has no date
+        self.folder = tempfile.TemporaryDirectory()
+        self.location = os.path.join(self.folder.name, "balls")
+        self.schema = pa.schema([("match_id", pa.int64()), ("date", pa.date32()), ("ball", pa.int64())])
+        self.write(self.location, [1, 1, 2, 3, 3, 3], [datetime.date(2024, 5, 1)] * 2 + [None] + [datetime.date(2024, 1, 1)] * 3)
+        pass
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write(self, location: str, match_ids: list, dates: list):
+        with FeatherInteractor.open_batch_writer(location, self.schema, 100) as writer:
+            writer.add(pa.record_batch([match_ids, dates, list(range(len(match_ids)))], schema=self.schema))
+
+    def read(self, column: str) -> list:
+        return FeatherInteractor.open_table(self.location).column(column).to_pylist()
+
+    def test_sort_groups(self):
+        FeatherInteractor.sort_groups(self.location, "match_id", ["date", "match_id"], 2)
+
+        self.assertEqual(self.read("match_id"), [3, 3, 3, 1, 1, 2])
+        self.assertEqual(self.read("ball"), [3, 4, 5, 0, 1, 2])
+
+    def test_sort_groups_replacing_matches(self):
+        new_location = os.path.join(self.folder.name, "new")
+        self.write(new_location, [3, 4], [datetime.date(2024, 9, 1), datetime.date(2024, 3, 1)])
+        FeatherInteractor.sort_groups(self.location, "match_id", ["date", "match_id"], 100, None, {2, 3}, new_location)
+
+        self.assertEqual(self.read("match_id"), [4, 1, 1, 3])
+
+    def test_lookups(self):
+        FeatherInteractor.sort_groups(self.location, "match_id", ["date", "match_id"], 100)
+        index = MatchIndex.build(self.location)
+        index.save(self.location)
+        index = MatchIndex.load(self.location)
+
+        self.assertEqual(index.get_match_rows(1), (3, 5))
+        self.assertEqual(index.get_match_rows(2), (5, 6))
+        self.assertIsNone(index.get_match_rows(5))
+        self.assertEqual(index.get_date_rows("2024-01-01", datetime.date(2024, 5, 1)), (0, 5))
+        self.assertEqual(index.get_date_rows(start_date="2024-02-01"), (3, 5))
+        self.assertEqual(index.get_date_rows(), (0, 6))
+        self.assertEqual(index.get_date_rows("2025-01-01"), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from src.specialised.cricket_data_transformer.outcome_distribution import OutcomeDistribution
+import pandas as pd
+
+
+class TestOutcomeDistribution(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'inn_num': [1, 1, 1, 2, 2, 1],
+            'over_num': [0, 0, 1, 0, 1, 1],
+            'event': ['ipl', 'bbl', 'ipl', 'ipl', None, 'ipl'],
+            'bat_runs': [4, 1, 0, 6, 1, 0]
+        })
+        pass
+
+    def test_select_rows(self):
+        distribution = OutcomeDistribution(self.data)
+
+        self.assertEqual(distribution.select_rows({'inn_num': 1, 'event': 'ipl'}).tolist(), [0, 2, 5])
+        self.assertEqual(distribution.select_rows({'event': 'wbbl'}).tolist(), [])
+        self.assertEqual(distribution.select_rows({}).tolist(), [0, 1, 2, 3, 4, 5])
+
+    def test_distribution_matches_filtering(self):
+        distribution = OutcomeDistribution(self.data)
+        filtered = self.data[(self.data['inn_num'] == 1) & (self.data['over_num'] == 1)]
+
+        self.assertEqual(
+            distribution.distribution({'inn_num': 1, 'over_num': 1}, 'bat_runs'),
+            filtered['bat_runs'].value_counts().to_dict()
+        )
+        self.assertEqual(
+            distribution.conditional_distribution_probability({'event': 'ipl'}, 'bat_runs', 'over_num'),
+            {(0, 4): 0.5, (0, 6): 0.5, (1, 0): 1.0}
+        )
+
+    def test_batch_conditional_distribution(self):
+        distribution = OutcomeDistribution(self.data)
+        results = distribution.batch_conditional_distribution([
+            ({'inn_num': 1}, 'bat_runs', [0, 5], 'over_num'),
+            ({'inn_num': 1}, 'bat_runs', None, 'over_num')
+        ])
+
+        targets = results[results['spec'] == 0]
+        self.assertEqual(list(zip(targets['group'], targets['value'], targets['count'])),
+                         [(0, 0, 0), (0, 5, 0), (1, 0, 2), (1, 5, 0)])
+        self.assertEqual(targets['probability'].tolist(), [0.0, 0.0, 1.0, 0.0])
+        observed = results[results['spec'] == 1]
+        self.assertEqual(dict(zip(zip(observed['group'], observed['value']), observed['probability'])),
+                         distribution.conditional_distribution_probability({'inn_num': 1}, 'bat_runs', 'over_num'))
+
+
+if __name__ == '__main__':
+    unittest.main()
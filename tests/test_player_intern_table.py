@@ -0,0 +1,47 @@
+import unittest
+from src.player_intern_table import PlayerInternTable
+from src.specialised.cricket_data_transformer.match.ball_schema import MATCH_SCHEMA
+import pyarrow as pa
+import tempfile
+import os
+
+
+class TestPlayerInternTable(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.location = os.path.join(self.folder.name, "player_keys")
+        pass
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_keys_are_stable_across_saves(self):
+        table = PlayerInternTable()
+        self.assertEqual(table.intern(["aa", "bb", None, "aa"]).tolist(), [0, 1, -1, 0])
+        table.save(self.location)
+
+        table = PlayerInternTable.load(self.location)
+        self.assertEqual(table.intern(["cc", "bb", None, "aa", "dd"]).tolist(), [2, 1, -1, 0, 3])
+        self.assertEqual(table.ids, ["aa", "bb", "cc", "dd"])
+        self.assertEqual(table.get_ids([3, -1]), ["dd", None])
+
+    def test_intern_batch(self):
+        table = PlayerInternTable(["bb"])
+        schema = pa.schema([MATCH_SCHEMA.field(name) for name in ["batter_id", "bowler_id", "non_striker_id", "player_out_id"]])
+        batch = pa.record_batch([
+            pa.array(["aa", "bb"]).dictionary_encode(),
+            pa.array(["cc", "cc"]).dictionary_encode(),
+            pa.array(["bb", "aa"]).dictionary_encode(),
+            pa.array([None, "aa"], pa.string()).dictionary_encode()
+        ], schema=schema)
+
+        interned = table.intern_batch(batch)
+        self.assertEqual(interned.column("batter_id").to_pylist(), [1, 0])
+        self.assertEqual(interned.column("bowler_id").to_pylist(), [2, 2])
+        self.assertEqual(interned.column("non_striker_id").to_pylist(), [0, 1])
+        self.assertEqual(interned.column("player_out_id").to_pylist(), [-1, 1])
+        self.assertEqual(interned.schema.field("batter_id").type, pa.int32())
+
+
+if __name__ == '__main__':
+    unittest.main()
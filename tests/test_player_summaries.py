@@ -0,0 +1,52 @@
+import unittest
+from src.specialised.cricket_data_transformer.player_summaries import PlayerSummaries
+import pandas as pd
+import tempfile
+
+
+class TestPlayerSummaries(unittest.TestCase):
+    def setUp(self):
+        keys = {'season': '2024', 'event': 'league', 'match_type': 't20', 'gender': 'male', 'team_type': 'club'}
+        # Batter 1 faces a dot, a four, a wide and is caught; batter 2 is run out at the non-striker's end
+        self.match_one = pd.DataFrame({
+            'batter_id': [1, 1, 1, 1, 3], 'bowler_id': [10] * 5, 'player_out_id': [-1, -1, -1, 1, 2],
+            'bat_team': ['A'] * 5, 'bowl_team': ['B'] * 5, 'bat_runs': [0, 4, 0, 0, 1],
+            'wides': [0, 0, 1, 0, 0], 'noballs': [0] * 5, 'dismissal': [0, 0, 0, 1, 1],
+            'dismissal_type': [None, None, None, 'caught', 'run out'], **keys
+        })
+        self.match_two = pd.DataFrame({
+            'batter_id': [1, 1], 'bowler_id': [11] * 2, 'player_out_id': [-1, -1],
+            'bat_team': ['A'] * 2, 'bowl_team': ['B'] * 2, 'bat_runs': [6, 1],
+            'wides': [0] * 2, 'noballs': [0] * 2, 'dismissal': [0] * 2,
+            'dismissal_type': [None] * 2, **keys
+        })
+        pass
+
+    def test_summarise(self):
+        batting, bowling = PlayerSummaries.summarise(self.match_one)
+        batting = batting.set_index('batter_id')
+        bowling = bowling.set_index('bowler_id')
+
+        self.assertEqual(batting.loc[1, ['balls_faced', 'runs_scored', 'dismissals', 'dots', 'fours']].tolist(), [3, 4, 1, 2, 1])
+        self.assertEqual(batting.loc[2, ['balls_faced', 'dismissals']].tolist(), [0, 1])
+        self.assertEqual(bowling.loc[10, ['balls_bowled', 'runs_conceded', 'wickets']].tolist(), [4, 6, 1])
+
+    def test_update_matches_rebuild(self):
+        with tempfile.TemporaryDirectory() as folder:
+            summaries = PlayerSummaries(folder)
+            summaries.build([self.match_one])
+            summaries.update(self.match_one.iloc[:0], self.match_two)
+            summaries.update(self.match_one, self.match_one.iloc[:0])
+            updated = summaries.get_batting(), summaries.get_bowling()
+
+            summaries.build([self.match_two])
+            rebuilt = summaries.get_batting(), summaries.get_bowling()
+
+        for updated_table, rebuilt_table in zip(updated, rebuilt):
+            pd.testing.assert_frame_equal(updated_table.astype(str), rebuilt_table.astype(str))
+        self.assertEqual(updated[0]['batter_id'].tolist(), [1])
+        self.assertAlmostEqual(updated[0].loc[0, 'strike_rate'], 350)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from src.result_cache import ResultCache
+import pandas as pd
+import tempfile
+import os
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.folder.name, "balls.feather")
+        with open(self.data_file, "w") as file:
+            file.write("balls")
+        self.cache = ResultCache([self.data_file], {"filters": None}, location=os.path.join(self.folder.name, "cache"))
+        self.result = pd.DataFrame({"event": ["ipl", "bbl"], "avg_score": [165.5, 150.0]})
+        pass
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_stores_results(self):
+        calls = []
+        compute = lambda: calls.append(1) or self.result
+
+        first = self.cache.get_or_compute("calc_avg_score", {"keys": ["event"]}, compute)
+        second = self.cache.get_or_compute("calc_avg_score", {"keys": ["event"]}, compute)
+
+        self.assertEqual(len(calls), 1)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_invalidates_when_data_changes(self):
+        key = self.cache.get_key("calc_avg_score", {"keys": ["event"]})
+        with open(self.data_file, "w") as file:
+            file.write("more balls")
+
+        self.assertNotEqual(self.cache.get_key("calc_avg_score", {"keys": ["event"]}), key)
+        self.assertNotEqual(self.cache.get_key("calc_avg_score", {"keys": ["season"]}), key)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("old", self.result)
+        self.cache.put("new", self.result)
+        os.utime(os.path.join(self.cache.location, "old.parquet"), ns=(0, 0))
+        os.utime(os.path.join(self.cache.location, "new.parquet"), ns=(1, 1))
+        self.cache.max_bytes = os.path.getsize(os.path.join(self.cache.location, "new.parquet"))
+
+        self.cache.put("newest", self.result)
+
+        self.assertIsNone(self.cache.get("old"))
+        self.assertIsNone(self.cache.get("new"))
+        self.assertIsNotNone(self.cache.get("newest"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from src.specialised.cricket_data_transformer.match.scorecard import Scorecard
+import pandas as pd
+
+
+class TestScorecard(unittest.TestCase):
+    def setUp(self):
+        # Batter 1 hits a four then is bowled, batter 3 comes in, and batter 2 is run out without facing in a
+        # one ball over. The second match is a single ball of another innings
+        self.data = pd.DataFrame({
+            'match_id': [1, 1, 1, 1, 1, 2],
+            'inn_num': [1, 1, 1, 1, 1, 1],
+            'over_num': [0, 0, 0, 0, 1, 0],
+            'bat_team': ['A'] * 5 + ['C'],
+            'bowl_team': ['B'] * 5 + ['D'],
+            'batter_id': [1, 1, 3, 3, 3, 7],
+            'non_striker_id': [2, 2, 2, 2, 2, 8],
+            'bowler_id': [10, 10, 10, 10, 11, 12],
+            'player_out_id': [-1, 1, -1, -1, 2, -1],
+            'dismissal': [0, 1, 0, 0, 1, 0],
+            'dismissal_type': [None, 'bowled', None, None, 'run out', None],
+            'bat_runs': [4, 0, 0, 1, 0, 6],
+            'wides': [0, 0, 1, 0, 0, 0],
+            'noballs': [0] * 6
+        })
+        pass
+
+    def test_batting_card(self):
+        batting, _ = Scorecard(self.data).get_match(1)
+
+        self.assertEqual(batting['batter_id'].tolist(), [1, 2, 3])
+        self.assertEqual(batting['position'].tolist(), [1, 2, 3])
+        self.assertEqual(batting['runs'].tolist(), [4, 0, 1])
+        self.assertEqual(batting['balls'].tolist(), [2, 0, 2])
+        self.assertEqual(batting['dismissed'].tolist(), [True, True, False])
+        self.assertEqual(batting['dismissal_type'].tolist()[:2], ['bowled', 'run out'])
+        self.assertEqual(batting['bowler_id'].tolist(), [10, -1, -1])
+
+    def test_bowling_card(self):
+        _, bowling = Scorecard(self.data).get_match(1)
+
+        self.assertEqual(bowling['bowler_id'].tolist(), [10, 11])
+        self.assertEqual(bowling['balls'].tolist(), [3, 1])
+        self.assertEqual(bowling['runs'].tolist(), [6, 0])
+        self.assertEqual(bowling['wickets'].tolist(), [1, 0])
+        self.assertEqual(bowling['wides'].tolist(), [1, 0])
+        self.assertEqual(bowling['maidens'].tolist(), [0, 0])
+        self.assertAlmostEqual(bowling.loc[0, 'economy'], 12)
+
+    def test_get_innings(self):
+        scorecard = Scorecard(self.data).build()
+        batting, bowling = scorecard.get_innings(2, 1)
+
+        self.assertEqual(batting['batter_id'].tolist(), [7, 8])
+        self.assertEqual(bowling['runs'].tolist(), [6])
+        self.assertEqual(len(scorecard.get_match(3)[0]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from src.specialised.cricket_data_transformer.state_statistics import StateStatistics
+from src.specialised.cricket_data_transformer.ball_by_ball_transformer import BallByBallTransformer
+import pandas as pd
+import numpy as np
+
+
+class TestStateStatistics(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'current_score': [0, 0, 4, 0, 4, 1, 0],
+            'balls_remaining': [119, 118, 118, 119, 117, 118, 118],
+            'total_score': [150, 160, 170, 140, 180, 120, 130]
+        })
+        pass
+
+    def test_nested_first_appearance_order(self):
+        stats = StateStatistics(self.data).calculate(["current_score", "balls_remaining"], "total_score")
+
+        # Scores in the order they first appear, then balls remaining in the order they first appear for that score
+        self.assertEqual(
+            list(zip(stats["current_score"], stats["balls_remaining"])),
+            [(0, 119), (0, 118), (4, 118), (4, 117), (1, 118)]
+        )
+        self.assertEqual(stats["count"].tolist(), [2, 2, 1, 1, 1])
+        self.assertEqual(stats["mean"].tolist(), [145.0, 145.0, 170.0, 180.0, 120.0])
+
+    def test_matches_groupby(self):
+        stats = StateStatistics(self.data).calculate(["current_score"], "total_score", quantiles=[0.25, 0.5])
+        grouped = self.data.groupby("current_score", sort=False)["total_score"]
+
+        np.testing.assert_allclose(stats["var"], grouped.var().to_numpy())
+        np.testing.assert_allclose(stats["quantile_0.25"], grouped.quantile(0.25).to_numpy())
+        np.testing.assert_allclose(stats["quantile_0.5"], grouped.quantile(0.5).to_numpy())
+
+    def test_aggregate_matches_groupby_agg(self):
+        # Group 'c' only has a missing value
+        data = pd.DataFrame({
+            'event': ['a', 'b', 'a', 'b', 'a', 'c', 'b'],
+            'runs': [1.0, np.nan, 4.0, 6.0, np.nan, np.nan, 2.0]
+        })
+        functions = ["count", "sum", "mean", "var", "min", "max"]
+        stats = StateStatistics(data).aggregate(
+            ["event"],
+            {**{function: ("runs", function) for function in functions}, "median": ("runs", "quantile", 0.5)}
+        )
+        grouped = data.groupby("event")["runs"]
+        expected = grouped.agg(functions).reset_index()
+
+        for function in functions:
+            np.testing.assert_allclose(stats[function].to_numpy(dtype=np.float64), expected[function].to_numpy(dtype=np.float64))
+        np.testing.assert_allclose(stats["median"], grouped.quantile(0.5).to_numpy())
+        self.assertEqual(stats["event"].tolist(), ["a", "b", "c"])
+
+    def test_first_and_last_keep_missing_values(self):
+        data = pd.DataFrame({'event': ['a', 'a', 'a'], 'runs': [np.nan, 1.0, np.nan]})
+        stats = StateStatistics(data).aggregate(["event"], {"first": ("runs", "first"), "last": ("runs", "last")})
+
+        self.assertTrue(np.isnan(stats["first"].iloc[0]))
+        self.assertTrue(np.isnan(stats["last"].iloc[0]))
+
+    def test_unknown_aggregate(self):
+        with self.assertRaises(ValueError):
+            StateStatistics(self.data).aggregate(["current_score"], {"mode": ("total_score", "mode")})
+
+    def test_per_innings_aggregates(self):
+        # The first innings lasts three balls and the second one, so each innings total is averaged once
+        data = pd.DataFrame({
+            'event': ['a'] * 4,
+            'match_id': [1, 1, 1, 1],
+            'inn_num': [1, 1, 1, 2],
+            'total_score': [100, 100, 100, 50],
+            'ball_runs': [4, 1, 6, 2],
+            'powerplay': [True, True, False, True]
+        })
+        transformer = BallByBallTransformer(data)
+
+        average = transformer.calc_avg_score(["event"])
+        self.assertEqual(average["avg_score"].tolist(), [75.0])
+        self.assertEqual(average["innings"].tolist(), [2])
+
+        powerplay = transformer.calc_avg_powerplay_score(["event"])
+        self.assertEqual(powerplay["avg_powerplay_score"].tolist(), [3.5])
+        self.assertEqual(powerplay["innings"].tolist(), [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
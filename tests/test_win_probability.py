@@ -0,0 +1,54 @@
+import unittest
+from src.specialised.cricket_data_transformer.win_probability import WinProbability
+import pandas as pd
+import numpy as np
+import tempfile
+import os
+
+
+class TestWinProbability(unittest.TestCase):
+    def setUp(self):
+        # Innings of three legal singles: match 1 is chased down, match 2 is not
+        runs = [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0]
+        self.data = pd.DataFrame({
+            'match_id': [1] * 6 + [2] * 6,
+            'inn_num': [1, 1, 1, 2, 2, 2] * 2,
+            'ball_runs': runs,
+            'current_score': [1, 2, 3, 1, 2, 3, 1, 2, 3, 1, 1, 1],
+            'total_score': [3] * 6 + [3, 3, 3, 1, 1, 1],
+            'wides': [0] * 12,
+            'noballs': [0] * 12,
+            'dismissal': [0] * 12,
+            'wickets_lost': [0] * 12,
+            'result': [0, 0, 0, 1, 1, 1, 1, 1, 1, 0, 0, 0]
+        })
+        pass
+
+    def test_lookup(self):
+        win_probability = WinProbability(self.data, max_balls=3, max_wickets=1).build()
+
+        self.assertEqual(win_probability.get_win_probability(0, 2, 1), 1)
+        self.assertEqual(win_probability.get_win_probability(4, 0, 1), 0)
+        chances = win_probability.get_win_probability(pd.Series([1, 2, 3, 4]), np.array([3, 3, 3, 3]), 1)
+        self.assertTrue(np.all(np.diff(chances) <= 0))
+
+    def test_annotate(self):
+        win_probability = WinProbability(self.data, max_balls=3, max_wickets=1)
+        annotated = win_probability.annotate()
+
+        self.assertTrue(annotated[self.data['inn_num'] == 1].isna().all())
+        self.assertTrue(annotated[self.data['inn_num'] == 2].notna().all())
+        self.assertEqual(annotated[3], win_probability.get_win_probability(4, 3, 1))
+
+    def test_save_and_load(self):
+        win_probability = WinProbability(self.data, max_balls=3, max_wickets=1)
+        with tempfile.TemporaryDirectory() as folder:
+            win_probability.save(os.path.join(folder, "win_probability"))
+            loaded = WinProbability.load(os.path.join(folder, "win_probability"))
+
+        np.testing.assert_array_equal(loaded.grid, win_probability.grid)
+        self.assertEqual((loaded.max_balls, loaded.max_wickets), (3, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()